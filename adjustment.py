@@ -0,0 +1,488 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from config import *
+from income import effective_year, get_income_table, rules_directory
+
+# NOTE: this module must not import tkinter, fitz or PIL so that it can run on headless servers
+
+INPUT_COLUMNS = ('yearly_salary', 'withheld_tax', 'social_insurance', 'other_deductions',
+                 'dependents', 'specific_dependents', 'elderly_dependents', 'housing_loan_credit')
+COUNT_COLUMNS = ('dependents', 'specific_dependents', 'elderly_dependents')
+
+def input_limit(name: str) -> int:
+    """
+        Return the largest valid value of an input column; the smallest is 0.
+
+        The limits keep every computed column within int64.
+
+        Args:
+            name (str): Input column name, see `INPUT_COLUMNS`.
+
+        Returns:
+            int: `ADJUSTMENT_CONFIG['MAX_DEPENDENTS']` for the numbers of dependents, otherwise `BATCH_CONFIG['MAX_AMOUNT']`.
+    """
+    return ADJUSTMENT_CONFIG['MAX_DEPENDENTS'] if name in COUNT_COLUMNS else BATCH_CONFIG['MAX_AMOUNT']
+
+def check_inputs(name: str, values: Sequence[int]) -> np.ndarray:
+    """
+        Convert the values of an input column to int64 and check their range.
+
+        Args:
+            name              (str): Input column name, see `INPUT_COLUMNS`.
+            values (Sequence[int]): The values.
+
+        Returns:
+            numpy.ndarray: A copy of the values as int64.
+
+        Raises:
+            ValueError: If a value is negative, above `input_limit(name)` or not an integer.
+    """
+    try:
+        column = np.array(values, dtype=np.int64)
+    except (OverflowError, TypeError, ValueError):
+        raise ValueError(f'{ERROR_MESSAGES["INVALID_ADJUSTMENT_VALUE"]} ({name})') from None
+
+    invalid = np.flatnonzero((column < 0) | (column > input_limit(name)))
+
+    if len(invalid):
+        raise ValueError(f'{ERROR_MESSAGES["INVALID_ADJUSTMENT_VALUE"]} ({name}, {invalid[0] + 1} 件目)')
+
+    return column
+
+class AdjustmentRules:
+    """
+        Deduction and tax tables of a tax year, read from the same rule file as the income rules.
+
+        Each table is a list of inclusive upper limits (the last one unbounded) with the values
+        of the brackets, looked up with `numpy.searchsorted` as in `IncomeTable`.
+
+        Attributes:
+            basic_thresholds       (numpy.ndarray): Upper limits of total income for the basic deduction.
+            basic_amounts          (numpy.ndarray): Basic deduction of each bracket.
+            dependent_deductions (Dict[str, int]): Deduction per dependent: 'general', 'specific' (aged 19-22) and 'elderly' (70 and over).
+            tax_thresholds         (numpy.ndarray): Upper limits of taxable income for the tax rates.
+            tax_rates              (numpy.ndarray): Tax rate of each bracket in percent.
+            tax_subtracts          (numpy.ndarray): Amount subtracted in each bracket (quick calculation table).
+    """
+    def __init__(self, rules: Dict) -> None:
+        """
+            Compile and validate the tables.
+
+            Args:
+                rules (Dict): The `basic_deduction`, `dependent_deductions` and `tax_rates` entries of a rule file.
+
+            Raises:
+                ValueError: If an entry is missing or a table is invalid.
+        """
+        try:
+            basic = rules['basic_deduction']
+            rates = rules['tax_rates']
+            self.dependent_deductions = {kind: int(rules['dependent_deductions'][kind]) for kind in ('general', 'specific', 'elderly')}
+            self.basic_thresholds = self.compile_thresholds(basic)
+            self.basic_amounts = np.array([row['amount'] for row in basic], dtype=np.int64)
+            self.tax_thresholds = self.compile_thresholds(rates)
+            self.tax_rates = np.array([row['rate'] for row in rates], dtype=np.int64)
+            self.tax_subtracts = np.array([row['subtract'] for row in rates], dtype=np.int64)
+        except (KeyError, TypeError):
+            raise ValueError(ERROR_MESSAGES['INVALID_ADJUSTMENT_RULES']) from None
+
+    @staticmethod
+    def compile_thresholds(rows: Sequence[Dict]) -> np.ndarray:
+        """
+            Check that the thresholds of a table increase and only the last one is unbounded.
+
+            Args:
+                rows (Sequence[Dict]): Table rows with a `threshold` entry.
+
+            Returns:
+                numpy.ndarray: Thresholds of every row but the last one.
+
+            Raises:
+                ValueError: If the table is invalid.
+        """
+        thresholds = [row['threshold'] for row in rows]
+
+        if not thresholds or thresholds[-1] is not None or None in thresholds[:-1] or thresholds[:-1] != sorted(set(thresholds[:-1])):
+            raise ValueError(ERROR_MESSAGES['INVALID_ADJUSTMENT_RULES'])
+
+        return np.array(thresholds[:-1], dtype=np.int64)
+
+def get_adjustment_rules(year: Optional[int] = None) -> AdjustmentRules:
+    """
+        Return the deduction and tax tables for a tax year, cached per rule file.
+
+        Args:
+            year (Optional[int], optional): Tax year. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+        Returns:
+            AdjustmentRules: The compiled tables.
+
+        Raises:
+            ValueError: If no rule file covers the year or the rule file is invalid.
+    """
+    return _load_adjustment_rules(effective_year(RULES_CONFIG['DEFAULT_YEAR'] if year is None else year))
+
+@lru_cache(maxsize=None)
+def _load_adjustment_rules(effective: int) -> AdjustmentRules:
+    """
+        Load and compile the tables of the rule file of an effective year, once.
+
+        Args:
+            effective (int): Effective year of the rule file (see `effective_year`).
+
+        Returns:
+            AdjustmentRules: The compiled tables.
+
+        Raises:
+            ValueError: If the rule file is invalid.
+    """
+    path = os.path.join(rules_directory(), f'{effective}.json')
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            return AdjustmentRules(json.load(f))
+    except ValueError:
+        raise ValueError(f'{ERROR_MESSAGES["INVALID_ADJUSTMENT_RULES"]} ({path})') from None
+
+class YearEndAdjustment:
+    """
+        Year-end adjustment (年末調整) of a whole workforce as a pipeline of columnar stages.
+
+        Every column holds one int64 value per employee. The stages run in order, each reading
+        input or earlier output columns and writing its own output columns:
+
+            income     給与所得金額 from the yearly salary (the existing income rules)
+            deductions 基礎控除, 扶養控除 and 所得控除合計 (incl. social insurance and other deductions)
+            tax        課税給与所得金額 (rounded down to 1,000 yen), 算出所得税額 and 年調年税額
+                       (after the housing loan credit, incl. 2.1 % reconstruction tax, rounded down to 100 yen)
+            settlement 過不足額: withheld tax minus annual tax (positive: refund, negative: additional collection)
+
+        Results are memoized. Changing inputs marks only the changed rows of the stages reading
+        them; a stage recomputes only its marked rows, and only rows whose outputs actually changed
+        are passed on to the downstream stages. The total income for the basic deduction is the
+        employment income alone; other income and the income amount adjustment deduction are not covered.
+
+        Attributes:
+            year                  (Optional[int]): Tax year.
+            columns (Dict[str, numpy.ndarray]): Input and computed columns by name.
+            recomputed       (Dict[str, int]): Number of rows each stage recomputed in the last `compute`.
+    """
+    def __init__(self, inputs: Dict[str, Sequence[int]], year: Optional[int] = None) -> None:
+        """
+            Set up the input columns; everything is computed on the first `compute`.
+
+            Args:
+                inputs (Dict[str, Sequence[int]]): Input columns (see `INPUT_COLUMNS`); only `yearly_salary` is required,
+                                                   missing columns are 0.
+                year        (Optional[int], optional): Tax year. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+            Raises:
+                ValueError: If a column is unknown or has another length, a value is out of range (see `check_inputs`),
+                            or no rules cover the year.
+        """
+        unknown = set(inputs) - set(INPUT_COLUMNS)
+
+        if unknown or 'yearly_salary' not in inputs:
+            raise ValueError(f'{ERROR_MESSAGES["INVALID_ADJUSTMENT_COLUMNS"]} ({", ".join(sorted(unknown)) or "yearly_salary"})')
+
+        size = len(inputs['yearly_salary'])
+        self.year = year
+        self.columns: Dict[str, np.ndarray] = {}
+
+        for name in INPUT_COLUMNS:
+            column = check_inputs(name, inputs[name]) if name in inputs else np.zeros(size, dtype=np.int64)
+
+            if column.shape != (size,):
+                raise ValueError(f'{ERROR_MESSAGES["INVALID_ADJUSTMENT_COLUMNS"]} ({name})')
+
+            self.columns[name] = column
+
+        self._income_table = get_income_table(year)
+        self._rules = get_adjustment_rules(year)
+        self._stages: List[Tuple[str, Tuple[str, ...], Tuple[str, ...], Callable]] = [
+            ('income', ('yearly_salary',), ('income',), self.stage_income),
+            ('deductions', ('income', 'social_insurance', 'other_deductions', 'dependents', 'specific_dependents', 'elderly_dependents'),
+             ('basic_deduction', 'dependent_deduction', 'total_deduction'), self.stage_deductions),
+            ('tax', ('income', 'total_deduction', 'housing_loan_credit'), ('taxable_income', 'computed_tax', 'annual_tax'), self.stage_tax),
+            ('settlement', ('withheld_tax', 'annual_tax'), ('settlement',), self.stage_settlement)
+        ]
+        self._dirty: Dict[str, Optional[np.ndarray]] = {name: None for name, *_ in self._stages}    # boolean mask per row, None: every row
+        self.recomputed: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """
+            Return the number of employees.
+        """
+        return len(self.columns['yearly_salary'])
+
+    def set_values(self, rows: Sequence[int], column: str, values: Sequence[int]) -> None:
+        """
+            Change an input column for some employees. Nothing is recomputed until `compute`.
+
+            Args:
+                rows   (Sequence[int]): Row indexes.
+                column           (str): Input column name, see `INPUT_COLUMNS`.
+                values (Sequence[int]): New values, one per row.
+
+            Raises:
+                KeyError: If the column is not an input column.
+                ValueError: If a value is out of range, see `check_inputs`.
+        """
+        if column not in INPUT_COLUMNS:
+            raise KeyError(column)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        values = check_inputs(column, values)
+        changed = self.columns[column][rows] != values
+
+        self.columns[column][rows[changed]] = values[changed]
+        self.mark_dirty(column, rows[changed])
+
+    def set_value(self, row: int, column: str, value: int) -> None:
+        """
+            Change an input of one employee, see `set_values`.
+
+            Args:
+                row    (int): Row index.
+                column (str): Input column name.
+                value  (int): New value.
+        """
+        self.set_values([row], column, [value])
+
+    def mark_dirty(self, column: str, rows: np.ndarray) -> None:
+        """
+            Mark rows for recomputation in every stage reading a column.
+
+            Args:
+                column           (str): The changed column.
+                rows (numpy.ndarray): Indexes of the changed rows.
+        """
+        if not len(rows):
+            return
+
+        for name, inputs, _, _ in self._stages:
+            if column in inputs and self._dirty[name] is not None:
+                self._dirty[name][rows] = True
+
+    def compute(self) -> Dict[str, np.ndarray]:
+        """
+            Bring every output column up to date, recomputing only the marked rows.
+
+            A stage with more than half of its rows marked is recomputed whole, which is cheaper than
+            gathering and scattering the rows; only its changed outputs are propagated.
+
+            Returns:
+                Dict[str, numpy.ndarray]: All input and computed columns by name.
+        """
+        for name, inputs, outputs, stage in self._stages:
+            dirty = self._dirty[name]
+            rows = None if dirty is None else np.flatnonzero(dirty)
+
+            if rows is None or len(rows) > len(self) // 2:
+                results = stage(*(self.columns[column] for column in inputs))
+
+                for column, values in zip(outputs, results):
+                    if rows is not None:
+                        self.mark_dirty(column, np.flatnonzero(self.columns[column] != values))
+
+                    self.columns[column] = values
+
+                self.recomputed[name] = len(self)
+            elif len(rows):
+                results = stage(*(self.columns[column][rows] for column in inputs))
+
+                for column, values in zip(outputs, results):
+                    changed = self.columns[column][rows] != values      # early cutoff: unchanged outputs stop here
+                    self.columns[column][rows[changed]] = values[changed]
+                    self.mark_dirty(column, rows[changed])
+
+                self.recomputed[name] = len(rows)
+            else:
+                self.recomputed[name] = 0
+
+            if dirty is None:
+                self._dirty[name] = np.zeros(len(self), dtype=bool)
+            else:
+                dirty[rows] = False
+
+        return self.columns
+
+    def row(self, index: int) -> Dict[str, int]:
+        """
+            Return all columns of one employee, computing pending changes first.
+
+            Args:
+                index (int): Row index.
+
+            Returns:
+                Dict[str, int]: Value of every column.
+        """
+        return {name: column[index].item() for name, column in self.compute().items()}
+
+    def stage_income(self, yearly_salary: np.ndarray) -> Tuple[np.ndarray]:
+        """
+            Income stage: 給与所得金額.
+
+            Args:
+                yearly_salary (numpy.ndarray): Yearly salaries.
+
+            Returns:
+                Tuple[numpy.ndarray]: (income,)
+        """
+        return (self._income_table.income_array(yearly_salary),)
+
+    def stage_deductions(self, income: np.ndarray, social_insurance: np.ndarray, other_deductions: np.ndarray, dependents: np.ndarray,
+                         specific_dependents: np.ndarray, elderly_dependents: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+            Deduction stage: 基礎控除, 扶養控除 and 所得控除合計.
+
+            Args:
+                income              (numpy.ndarray): Employment income amounts (total income).
+                social_insurance    (numpy.ndarray): Social insurance premiums paid.
+                other_deductions    (numpy.ndarray): Other income deductions (life insurance, spouse, ...), already calculated.
+                dependents          (numpy.ndarray): Numbers of general dependents.
+                specific_dependents (numpy.ndarray): Numbers of specific dependents (aged 19-22).
+                elderly_dependents  (numpy.ndarray): Numbers of elderly dependents (70 and over).
+
+            Returns:
+                Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: (basic deduction, dependent deduction, total deduction)
+        """
+        rules = self._rules
+        basic = rules.basic_amounts[np.searchsorted(rules.basic_thresholds, income, side='left')]
+        amounts = rules.dependent_deductions
+        dependent = dependents * amounts['general'] + specific_dependents * amounts['specific'] + elderly_dependents * amounts['elderly']
+
+        return basic, dependent, basic + dependent + social_insurance + other_deductions
+
+    def stage_tax(self, income: np.ndarray, total_deduction: np.ndarray, housing_loan_credit: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+            Tax stage: 課税給与所得金額, 算出所得税額 and 年調年税額.
+
+            Args:
+                income              (numpy.ndarray): Employment income amounts.
+                total_deduction     (numpy.ndarray): Total income deductions.
+                housing_loan_credit (numpy.ndarray): Housing loan tax credits.
+
+            Returns:
+                Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: (taxable income, computed tax, annual tax)
+        """
+        rules = self._rules
+        taxable = np.maximum(income - total_deduction, 0) // 1000 * 1000
+        i = np.searchsorted(rules.tax_thresholds, taxable, side='left')
+        computed = np.maximum(taxable * rules.tax_rates[i] // 100 - rules.tax_subtracts[i], 0)
+        annual = np.maximum(computed - housing_loan_credit, 0) * 1021 // 1000 // 100 * 100
+
+        return taxable, computed, annual
+
+    def stage_settlement(self, withheld_tax: np.ndarray, annual_tax: np.ndarray) -> Tuple[np.ndarray]:
+        """
+            Settlement stage: 過不足額.
+
+            Args:
+                withheld_tax (numpy.ndarray): Tax withheld during the year.
+                annual_tax   (numpy.ndarray): Annual tax.
+
+            Returns:
+                Tuple[numpy.ndarray]: (settlement,) positive for a refund, negative for an additional collection.
+        """
+        return (withheld_tax - annual_tax,)
+
+def read_csv(input_file: TextIO) -> Tuple[List[List[str]], List[str], Dict[str, List[int]]]:
+    """
+        Read employees from CSV into input columns, by the names of `ADJUSTMENT_CONFIG['INPUT_COLUMNS']`.
+
+        Args:
+            input_file (TextIO): Input CSV with a header row.
+
+        Returns:
+            Tuple[List[List[str]], List[str], Dict[str, List[int]]]: (rows, header, input columns).
+
+        Raises:
+            ValueError: If the yearly salary column is missing or a value is invalid or out of range (with its line number).
+    """
+    from batch import parse_amount
+
+    reader = csv.reader(input_file)
+    header = next(reader, [])
+    rows = list(reader)
+    positions = {name: header.index(title) for name, title in ADJUSTMENT_CONFIG['INPUT_COLUMNS'].items() if title in header}
+
+    if 'yearly_salary' not in positions:
+        raise ValueError(f'{ERROR_MESSAGES["INVALID_ADJUSTMENT_COLUMNS"]} ({ADJUSTMENT_CONFIG["INPUT_COLUMNS"]["yearly_salary"]})')
+
+    columns = {name: [] for name in positions}
+
+    for line, row in enumerate(rows, 2):
+        for name, position in positions.items():
+            try:
+                value = parse_amount(row[position]) if position < len(row) else 0
+
+                if value > input_limit(name):
+                    raise ValueError(value)
+            except ValueError:
+                raise ValueError(f'{ERROR_MESSAGES["CSV_INVALID_VALUE"]} ({line} 行目)') from None
+
+            columns[name].append(value)
+
+    return rows, header, columns
+
+def process_csv(input_file: TextIO, output_file: TextIO, year: Optional[int] = None) -> int:
+    """
+        Calculate the year-end adjustment of every employee in a CSV file.
+
+        The computed columns (`ADJUSTMENT_CONFIG['OUTPUT_COLUMNS']`) are appended to each row.
+
+        Args:
+            input_file  (TextIO): Input CSV with a header row.
+            output_file (TextIO): Output CSV.
+            year (Optional[int], optional): Tax year. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+        Returns:
+            int: The number of employees.
+    """
+    rows, header, inputs = read_csv(input_file)
+    columns = YearEndAdjustment(inputs, year).compute()
+    outputs = ADJUSTMENT_CONFIG['OUTPUT_COLUMNS']
+
+    writer = csv.writer(output_file, lineterminator='\n')
+    writer.writerow(header + list(outputs.values()))
+    writer.writerows(row + list(values) for row, values in zip(rows, zip(*(columns[name].tolist() for name in outputs))))
+
+    return len(rows)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+        Command line entry point for the year-end adjustment.
+
+        Usage:
+            python adjustment.py employees.csv -o output.csv [--year 2024]
+
+        Args:
+            argv (Optional[List[str]], optional): Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(prog='adjust', description='CSV の従業員データから年末調整の年税額と過不足額を一括計算します')
+    parser.add_argument('input', help='入力 CSV ファイル (- で標準入力)')
+    parser.add_argument('-o', '--output', default='-', help='出力 CSV ファイル (省略時は標準出力)')
+    parser.add_argument('--year', type=int, default=RULES_CONFIG['DEFAULT_YEAR'], help='年分')
+    args = parser.parse_args(argv)
+
+    encoding = BATCH_CONFIG['ENCODING']
+
+    try:
+        with (sys.stdin if args.input == '-' else open(args.input, newline='', encoding=encoding)) as input_file, \
+             (sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding=encoding)) as output_file:
+            process_csv(input_file, output_file, args.year)
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
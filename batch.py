@@ -0,0 +1,265 @@
+import argparse
+import csv
+import re
+import sys
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+from config import *
+from income import calculate_income, calculate_income_array
+
+try:
+    import numpy as np
+except ImportError:     # NumPy is optional; fall back to the pure Python path
+    np = None
+
+# NOTE: this module must not import tkinter, fitz or PIL so that it can run on headless servers
+
+AMOUNT_PATTERN = re.compile(r'[\d,\s]*')
+
+def parse_amount(text: str) -> int:
+    """
+        Convert a CSV cell into an integer amount.
+
+        Commas and spaces are accepted as thousands separators and an empty cell is treated as 0.
+
+        Args:
+            text (str): The cell value to convert.
+
+        Returns:
+            int: The parsed amount.
+
+        Raises:
+            ValueError: If the cell contains anything other than digits, commas and spaces
+                        (e.g. a sign), or the amount exceeds `BATCH_CONFIG['MAX_AMOUNT']`.
+    """
+    if not AMOUNT_PATTERN.fullmatch(text):
+        raise ValueError(text)
+
+    amount = int(re.sub(r'[,\s]', '', text) or 0)
+
+    if amount > BATCH_CONFIG['MAX_AMOUNT']:
+        raise ValueError(text)
+
+    return amount
+
+def resolve_columns(header: List[str]) -> Tuple[List[int], bool, List[int], Optional[int]]:
+    """
+        Resolve the indexes of the salary and bonus columns in the CSV header.
+
+        The monthly columns (`1月` - `12月`) take precedence over the single monthly salary column.
+        Missing bonus columns are treated as 0.
+        The optional year column (`年分`) selects the tax year of each row.
+
+        Args:
+            header (List[str]): The header row of the input CSV.
+
+        Returns:
+            Tuple[List[int], bool, List[int], Optional[int]]: (salary column indexes, True if the single monthly salary column is used,
+                                                               bonus column indexes, year column index or None).
+
+        Raises:
+            ValueError: If no salary column is found.
+    """
+    columns = {name.strip(): index for index, name in enumerate(header)}
+
+    if all(name in columns for name in BATCH_CONFIG['MONTHLY_COLUMNS']):
+        salary_indexes = [columns[name] for name in BATCH_CONFIG['MONTHLY_COLUMNS']]
+        single = False
+    elif BATCH_CONFIG['SINGLE_COLUMN'] in columns:
+        salary_indexes = [columns[BATCH_CONFIG['SINGLE_COLUMN']]]
+        single = True
+    else:
+        raise ValueError(ERROR_MESSAGES['CSV_NO_SALARY_COLUMNS'])
+
+    bonus_indexes = [columns[name] for name in (BATCH_CONFIG['BONUS1_COLUMN'], BATCH_CONFIG['BONUS2_COLUMN']) if name in columns]
+
+    year_index = columns.get(BATCH_CONFIG['YEAR_COLUMN'])
+
+    return salary_indexes, single, bonus_indexes, year_index
+
+def read_amounts(rows: List[List[str]], indexes: List[int], first_line: int = 2) -> List[List[int]]:
+    """
+        Read the amounts in the given columns of each row.
+
+        Args:
+            rows (List[List[str]]): Data rows of the input CSV.
+            indexes    (List[int]): Indexes of the columns to read.
+            first_line (int, optional): Line number of the first row, used in error messages. Defaults to 2.
+
+        Returns:
+            List[List[int]]: The amounts of each row, in the order of `indexes`.
+
+        Raises:
+            ValueError: If a row contains an invalid amount or lacks a column.
+    """
+    get_amounts = itemgetter(*indexes) if len(indexes) > 1 else lambda row: (row[indexes[0]],)
+    amounts = []
+
+    for line, row in enumerate(rows, first_line):
+        try:
+            cells = get_amounts(row)
+
+            try:
+                if not ''.join(cells).isdecimal():
+                    raise ValueError
+
+                values = list(map(int, cells))              # fast path for plain integers
+            except ValueError:
+                values = list(map(parse_amount, cells))     # slow path for "250,000", empty cells etc.
+
+            if max(values) > BATCH_CONFIG['MAX_AMOUNT']:
+                raise ValueError
+
+            amounts.append(values)
+        except (ValueError, IndexError):
+            raise ValueError(f'{ERROR_MESSAGES["CSV_INVALID_VALUE"]} ({line} 行目)') from None
+
+    return amounts
+
+def calculate_rows(rows: List[List[str]], header: List[str], first_line: int = 2, year: Optional[int] = None) -> List[List[str]]:
+    """
+        Calculate yearly salary and income amount for a chunk of CSV rows.
+
+        The whole chunk is calculated at once with `calculate_income_array` when NumPy is installed,
+        otherwise each row goes through `calculate_income`.
+        Rows with a year column are calculated with the rules of that year, so one chunk may mix years.
+
+        Args:
+            rows (List[List[str]]): Data rows of the input CSV.
+            header     (List[str]): The header row of the input CSV.
+            first_line (int, optional): Line number of the first row, used in error messages. Defaults to 2.
+            year (Optional[int], optional): Tax year of rows without a year column. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+        Returns:
+            List[List[str]]: The input rows with yearly salary and income amount appended.
+
+        Raises:
+            ValueError: If a row contains an invalid amount, lacks a column or has a year without rules.
+    """
+    salary_indexes, single, bonus_indexes, year_index = resolve_columns(header)
+    indexes = salary_indexes + bonus_indexes + ([] if year_index is None else [year_index])
+    salary_count = len(salary_indexes)
+    bonus_end = salary_count + len(bonus_indexes)
+
+    if np is None:
+        results = []
+
+        for row, amounts in zip(rows, read_amounts(rows, indexes, first_line)):
+            monthly = amounts[0] if single else amounts[:salary_count]
+            row_year = year if year_index is None else amounts[-1]
+            total, income = calculate_income(monthly, sum(amounts[salary_count:bonus_end]), year=row_year)
+            row += (str(total), str(income))
+            results.append(row)
+
+        return results
+
+    get_amounts = itemgetter(*indexes) if len(indexes) > 1 else lambda row: (row[indexes[0]],)
+
+    try:
+        # fast path for plain integers; signs, separators and out-of-range amounts take the slow path
+        cells = list(chain.from_iterable(map(get_amounts, rows)))
+
+        if not ''.join(cells).isdecimal():
+            raise ValueError
+
+        amounts = np.fromiter(map(int, cells), dtype=np.int64, count=len(cells))
+
+        if amounts.size and amounts.max() > BATCH_CONFIG['MAX_AMOUNT']:
+            raise ValueError
+    except (ValueError, IndexError, OverflowError):
+        amounts = np.array(read_amounts(rows, indexes, first_line), dtype=np.int64)             # slow path, reports the invalid line
+
+    amounts = amounts.reshape(len(rows), len(indexes))
+
+    monthly = amounts[:, 0] if single else amounts[:, :salary_count]
+    years = year if year_index is None else amounts[:, -1]
+    totals, incomes = calculate_income_array(monthly, amounts[:, salary_count:bonus_end].sum(axis=1), year=years)
+
+    for row, total, income in zip(rows, totals.tolist(), incomes.tolist()):
+        row += (str(total), str(income))
+
+    return rows
+
+def iter_chunks(rows: Iterator[List[str]], chunk_size: int) -> Iterator[List[List[str]]]:
+    """
+        Split a row iterator into lists of at most `chunk_size` rows.
+
+        Args:
+            rows (Iterator[List[str]]): The rows to split.
+            chunk_size          (int): Maximum number of rows per chunk.
+
+        Yields:
+            List[List[str]]: The next chunk of rows.
+    """
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+def process_csv(input_file: TextIO, output_file: TextIO, chunk_size: int = BATCH_CONFIG['CHUNK_SIZE'], year: Optional[int] = None) -> int:
+    """
+        Stream an employee CSV through `calculate_income` and write the results.
+
+        Rows are read and written chunk by chunk, so memory usage is bounded by `chunk_size`
+        regardless of the size of the input.
+
+        Args:
+            input_file  (TextIO): Input CSV with a header row.
+            output_file (TextIO): Output CSV; input columns followed by the result columns.
+            chunk_size (int, optional): Number of rows processed at once. Defaults to `BATCH_CONFIG['CHUNK_SIZE']`.
+            year (Optional[int], optional): Tax year of rows without a year column. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+        Returns:
+            int: The number of processed rows.
+
+        Raises:
+            ValueError: If the CSV has no salary column, contains an invalid amount or a year without rules.
+    """
+    reader = csv.reader(input_file)
+    writer = csv.writer(output_file, lineterminator='\n')
+
+    header = next(reader, None)
+
+    if header is None:
+        return 0
+
+    resolve_columns(header)     # fail fast before writing anything
+    writer.writerow(header + [BATCH_CONFIG['TOTAL_YEARLY_SALARY_COLUMN'], BATCH_CONFIG['INCOME_AMOUNT_COLUMN']])
+
+    count = 0
+
+    for chunk in iter_chunks(reader, chunk_size):
+        writer.writerows(calculate_rows(chunk, header, count + 2, year))
+        count += len(chunk)
+
+    return count
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+        Command line entry point for the batch calculation.
+
+        Usage:
+            python batch.py input.csv -o output.csv [--year 2024]
+
+        Args:
+            argv (Optional[List[str]], optional): Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(prog='batch', description='CSV の従業員データから年間給与金額と給与所得金額を一括計算します')
+    parser.add_argument('input', help='入力 CSV ファイル (- で標準入力)')
+    parser.add_argument('-o', '--output', default='-', help='出力 CSV ファイル (省略時は標準出力)')
+    parser.add_argument('--year', type=int, default=RULES_CONFIG['DEFAULT_YEAR'], help='年分 (年分の列がない行に適用)')
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CONFIG['CHUNK_SIZE'], help='一度に処理する行数')
+    args = parser.parse_args(argv)
+
+    encoding = BATCH_CONFIG['ENCODING']
+
+    try:
+        with (sys.stdin if args.input == '-' else open(args.input, newline='', encoding=encoding)) as input_file, \
+             (sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding=encoding)) as output_file:
+            process_csv(input_file, output_file, args.chunk_size, args.year)
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,659 @@
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from config import BATCH_CONFIG, BENCH_CONFIG, INCOME_RULES, RULES_CONFIG, UI_CONFIG
+from income import get_income_table
+
+def legacy_income(yearly_salary: int) -> float:
+    """
+        Calculate the income amount with the original linear scan over `INCOME_RULES`.
+
+        Args:
+            yearly_salary (int): Yearly salary amount.
+
+        Returns:
+            float: Income amount as returned by the rule lambdas.
+    """
+    for threshold, calculation in INCOME_RULES:
+        if yearly_salary <= threshold:
+            return calculation(yearly_salary)
+
+def check_income_parity(limit: Optional[int] = None) -> int:
+    """
+        Verify that the compiled table of the default year agrees with the `INCOME_RULES` lambdas for every yen.
+
+        The lambdas return floats (e.g. `* 2.4`, `* 0.9`), so their results are rounded to
+        remove binary floating point noise and then truncated to whole yen before comparison.
+
+        Args:
+            limit (Optional[int], optional): Largest salary to check. Defaults to 10,000 yen above the last threshold.
+
+        Returns:
+            int: The number of checked salaries.
+
+        Raises:
+            AssertionError: If a salary gives a different result.
+    """
+    import numpy as np
+
+    table = get_income_table(RULES_CONFIG['DEFAULT_YEAR'])
+
+    if limit is None:
+        limit = table.thresholds[-1] + 10_000
+
+    salaries = range(limit + 1)
+    expected = [math.floor(round(legacy_income(s), 6)) for s in salaries]
+    scalar = [table.income(s) for s in salaries]
+    vector = table.income_array(np.arange(limit + 1)).tolist()
+
+    for s in salaries:
+        assert expected[s] == scalar[s] == vector[s], f'{s}: expected {expected[s]}, scalar {scalar[s]}, vector {vector[s]}'
+
+    return len(salaries)
+
+def measure(function: Callable[[], object]) -> float:
+    """
+        Measure the wall-clock time of a single call.
+
+        Args:
+            function (Callable[[], object]): The function to call.
+
+        Returns:
+            float: Elapsed time in seconds.
+    """
+    start = time.perf_counter()
+    function()
+
+    return time.perf_counter() - start
+
+def bench_income(size: int) -> None:
+    """
+        Compare the linear scan, the bisect lookup and the NumPy path on random yearly salaries.
+
+        Args:
+            size (int): Number of salaries.
+    """
+    import numpy as np
+
+    table = get_income_table(RULES_CONFIG['DEFAULT_YEAR'])
+    salaries = np.random.default_rng(0).integers(0, 20_000_000, size=size)
+    salary_list = salaries.tolist()
+
+    legacy = measure(lambda: [legacy_income(s) for s in salary_list])
+    scalar = measure(lambda: [table.income(s) for s in salary_list])
+    vector = measure(lambda: table.income_array(salaries))
+
+    print(f'income x {size:,}')
+    print(f'  linear scan : {legacy:8.3f} s')
+    print(f'  bisect      : {scalar:8.3f} s  ({legacy / scalar:6.1f}x)')
+    print(f'  numpy       : {vector:8.3f} s  ({legacy / vector:6.1f}x)')
+
+def peak_rss_mb() -> Optional[float]:
+    """
+        Return the peak resident set size of this process.
+
+        Returns:
+            Optional[float]: Peak RSS in MiB, or None where the `resource` module is unavailable (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024     # bytes on macOS, KiB on Linux
+
+def make_sample_pdf(path: str, pages: int = 3) -> None:
+    """
+        Write a synthetic A4 PDF resembling a withholding slip (text, ruled boxes and amounts).
+
+        Args:
+            path           (str): Output path.
+            pages (int, optional): Number of pages. Defaults to 3.
+    """
+    import fitz
+
+    document = fitz.open()
+
+    for number in range(pages):
+        page = document.new_page(width=595, height=842)    # A4 in points
+
+        for row in range(40):
+            y = 60 + row * 18
+            page.draw_rect(fitz.Rect(40, y, 555, y + 18), color=(0, 0, 0), width=0.5)
+            page.insert_text((48, y + 13), f'employee {number:04d}-{row:02d}  salary {(row + 1) * 123_456:>12,}', fontsize=10)
+
+    document.save(path)
+    document.close()
+
+def bench_render_frames(pdf: str, pipeline: str, zoom: float, frames: int) -> Dict[str, Optional[float]]:
+    """
+        Measure the per-frame time of blitting uncached pages onto a Tk canvas.
+
+        `legacy` is the original pixmap -> PIL image -> ImageTk.PhotoImage -> new canvas item path;
+        `ppm` renders PPM data into a single reused photo image and canvas item.
+        Requires a display (e.g. Xvfb on a headless Linux box).
+
+        Args:
+            pdf      (str): PDF to render.
+            pipeline (str): 'legacy' or 'ppm'.
+            zoom   (float): Zoom level.
+            frames   (int): Number of frames.
+
+        Returns:
+            Dict[str, Optional[float]]: Mean and worst frame time in milliseconds and peak RSS in MiB.
+    """
+    import tkinter as tk
+
+    import fitz
+
+    from pdf_render import render_ppm
+
+    root = tk.Tk()
+    root.withdraw()
+    canvas = tk.Canvas(root, width=600, height=800)
+    document = fitz.open(pdf)
+    photo = tk.PhotoImage()
+    item = canvas.create_image(0, 0, anchor=tk.NW, image=photo)
+    times = []
+
+    for frame in range(frames):
+        page = document[frame % len(document)]
+        start = time.perf_counter()
+
+        if pipeline == 'legacy':
+            from PIL import Image, ImageTk
+
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            img = Image.frombytes('RGB', [pix.width, pix.height], pix.samples)
+            legacy_photo = ImageTk.PhotoImage(img)
+            canvas.delete('all')
+            canvas.create_image(0, 0, anchor=tk.NW, image=legacy_photo)
+            canvas.image = legacy_photo
+        else:
+            width, height, data = render_ppm(page, zoom)
+            photo.configure(width=width, height=height, data=data, format='ppm')
+            canvas.coords(item, 0, 0)
+
+        root.update_idletasks()
+        times.append(time.perf_counter() - start)
+
+    document.close()
+    root.destroy()
+
+    return {'mean_ms': sum(times) / len(times) * 1000, 'max_ms': max(times) * 1000, 'peak_rss_mb': peak_rss_mb()}
+
+def bench_render(frames: int) -> None:
+    """
+        Compare the blit pipelines for A4 pages at 100 % and 300 %.
+
+        Each combination runs in its own process so that the peak RSS values are independent.
+
+        Args:
+            frames (int): Number of frames per combination.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        pdf = os.path.join(directory, 'sample.pdf')
+        make_sample_pdf(pdf)
+
+        print(f'render x {frames} frames (A4)')
+
+        for zoom in (1.0, 3.0):
+            for pipeline in ('legacy', 'ppm'):
+                command = [sys.executable, os.path.abspath(__file__), 'render-frames', pdf, pipeline, str(zoom), str(frames)]
+                completed = subprocess.run(command, capture_output=True, text=True)
+
+                if completed.returncode != 0:
+                    sys.exit(f'Error: {completed.stderr.strip().splitlines()[-1]}')    # e.g. no display
+
+                result = json.loads(completed.stdout)
+                rss = 'n/a' if result['peak_rss_mb'] is None else f'{result["peak_rss_mb"]:7.1f} MiB'
+                print(f'  {int(zoom * 100):3d} % {pipeline:6s}: {result["mean_ms"]:7.1f} ms/frame (max {result["max_ms"]:7.1f} ms), peak RSS {rss}')
+
+def measure_startup(command: List[str], runs: int) -> Dict[str, object]:
+    """
+        Measure the time from process launch until the first window is visible.
+
+        The application records the time the window became visible in the file named by
+        the `UI_CONFIG['STARTUP_PROBE_ENV']` environment variable and quits.
+
+        Args:
+            command (List[str]): Command launching the application.
+            runs          (int): Number of launches.
+
+        Returns:
+            Dict[str, object]: Median and minimum time-to-first-window in seconds, and the heavy modules loaded by then.
+    """
+    times = []
+    modules = []
+
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as directory:
+            probe = os.path.join(directory, 'startup.json')
+            env = dict(os.environ, **{UI_CONFIG['STARTUP_PROBE_ENV']: probe})
+
+            start = time.time()
+            completed = subprocess.run(command, env=env, capture_output=True, text=True, timeout=120)
+
+            if completed.returncode != 0 or not os.path.exists(probe):
+                sys.exit(f'Error: {" ".join(command)} failed\n{completed.stderr.strip()}')
+
+            with open(probe, encoding='utf-8') as f:
+                result = json.load(f)
+
+        times.append(result['shown'] - start)
+        modules = result['modules']
+
+    return {'median_s': statistics.median(times), 'min_s': min(times), 'modules': modules}
+
+def bench_startup(runs: int, executable: Optional[str] = None) -> None:
+    """
+        Report the time-to-first-window of the source build and, if given, the frozen build.
+
+        Args:
+            runs                          (int): Number of launches per build.
+            executable (Optional[str], optional): Path to the PyInstaller executable. Defaults to None.
+    """
+    targets = [('source', [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')])]
+
+    if executable:
+        targets.append(('frozen', [executable]))
+
+    print(f'startup x {runs} runs (time to first window)')
+
+    for name, command in targets:
+        result = measure_startup(command, runs)
+        print(f'  {name:6s}: median {result["median_s"]:6.3f} s, min {result["min_s"]:6.3f} s, loaded {", ".join(result["modules"]) or "-"}')
+
+def measure_repeated(function: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:
+    """
+        Measure a function several times.
+
+        Args:
+            function       (Callable[[], object]): The function to measure.
+            repeat                          (int): Number of measurements.
+            setup (Optional[Callable[[], object]]): Called untimed before each measurement. Defaults to None.
+
+        Returns:
+            Dict[str, float]: Median and minimum time in seconds.
+    """
+    times = []
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        times.append(measure(function))
+
+    return {'median_s': statistics.median(times), 'min_s': min(times)}
+
+def zoom_steps() -> List[float]:
+    """
+        List the zoom levels reachable with the zoom buttons, from `MIN_ZOOM` to `MAX_ZOOM`.
+
+        Returns:
+            List[float]: Ascending zoom levels, including 1.0.
+    """
+    factor = UI_CONFIG['ZOOM_FACTOR']
+    steps = [1.0]
+
+    while steps[-1] * factor <= UI_CONFIG['MAX_ZOOM']:
+        steps.append(steps[-1] * factor)
+
+    while steps[0] / factor >= UI_CONFIG['MIN_ZOOM']:
+        steps.insert(0, steps[0] / factor)
+
+    return steps
+
+def make_salary_csv(rows: int) -> str:
+    """
+        Generate a synthetic employee CSV with monthly salaries and bonuses.
+
+        Args:
+            rows (int): Number of employees.
+
+        Returns:
+            str: CSV text with a header row.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    amounts = np.column_stack([rng.integers(100_000, 800_000, size=(rows, 12)), rng.integers(0, 1_500_000, size=(rows, 2))])
+    header = ','.join(BATCH_CONFIG['MONTHLY_COLUMNS'] + [BATCH_CONFIG['BONUS1_COLUMN'], BATCH_CONFIG['BONUS2_COLUMN']])
+
+    return header + '\n' + '\n'.join(','.join(map(str, row)) for row in amounts.tolist()) + '\n'
+
+def bench_suite_headless(repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+        Run the suite cases that do not need a display: income calculation and page rendering.
+
+        `render_<zoom %>` renders all `BENCH_CONFIG['PAGES']` pages of the sample PDF once.
+
+        Args:
+            repeat (int): Measurements per case.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Median and minimum time of each case.
+    """
+    import io
+
+    import fitz
+    import numpy as np
+
+    from batch import process_csv
+    from pdf_render import render_ppm
+
+    results = {}
+    table = get_income_table(RULES_CONFIG['DEFAULT_YEAR'])
+    salaries = np.random.default_rng(0).integers(0, 20_000_000, size=BENCH_CONFIG['SALARIES'])
+    salary_list = salaries.tolist()
+
+    results['income_scalar'] = measure_repeated(lambda: [table.income(s) for s in salary_list], repeat)
+    results['income_vector'] = measure_repeated(lambda: table.income_array(salaries), repeat)
+
+    text = make_salary_csv(BENCH_CONFIG['ROWS'])
+    results['batch_csv'] = measure_repeated(lambda: process_csv(io.StringIO(text), io.StringIO()), repeat)
+
+    # every page of the sample per measurement, so that short renders are not lost in timer noise
+    with tempfile.TemporaryDirectory() as directory:
+        pdf = os.path.join(directory, 'sample.pdf')
+        make_sample_pdf(pdf, BENCH_CONFIG['PAGES'])
+
+        with fitz.open(pdf) as document:
+            pages = list(document)
+
+            for zoom in zoom_steps():
+                results[f'render_{round(zoom * 100)}'] = measure_repeated(lambda: [render_ppm(page, zoom) for page in pages], repeat)
+
+    return results
+
+def bench_suite_gui(pdf: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """
+        Run the suite cases that drive the application window: load, page flip and zoom latency.
+
+        Each case includes `update_idletasks`, so the time covers drawing the canvas.
+        "Cold" cases start with empty memory and disk render caches; `page_flip` waits for the
+        background prefetch between flips, as a user reading a page would.
+        Requires a display (e.g. Xvfb on a headless Linux box).
+
+        Args:
+            pdf    (str): PDF to load.
+            repeat (int): Measurements per case.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Median and minimum time of each case.
+    """
+    import tkinter as tk
+
+    from calculator import TaxCalculator
+
+    root = tk.Tk()
+    app = TaxCalculator(root)
+    root.update()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app.disk_cache.directory = directory    # never read renders of earlier runs
+        results = {}
+
+        def cold() -> None:
+            if app.prefetcher is not None:
+                app.prefetcher.reset()
+
+            app.render_cache.clear()
+            app.disk_cache.directory = tempfile.mkdtemp(dir=directory)
+
+        def settle() -> None:
+            while app.prefetcher is not None and not app.prefetcher.idle:
+                root.update()
+                time.sleep(0.001)
+
+            root.update()
+
+        def load() -> None:
+            app.load_pdf(pdf)
+
+            while app.current_pdf is None:      # the file is hashed in background first
+                root.update()
+                time.sleep(0.001)
+
+            root.update_idletasks()
+
+        def unload() -> None:
+            settle()
+            app.close_document()
+            root.update()
+
+        results['load_pdf'] = measure_repeated(load, repeat, lambda: (unload() if app.current_pdf else None, cold()))
+
+        def flip() -> None:
+            app.next_page()
+            root.update_idletasks()
+
+        def rewind() -> None:
+            if app.current_page == len(app.current_pdf) - 1:
+                app.go_to_page(0)
+
+        results['page_flip'] = measure_repeated(flip, repeat, lambda: (rewind(), settle()))
+        results['page_flip_cold'] = measure_repeated(flip, repeat, lambda: (rewind(), settle(), cold()))
+
+        def zoom_start() -> None:
+            settle()
+            app.pdf_zoom = 1.0
+            app.display_page()
+            cold()
+
+        def zoom_preview() -> None:
+            app.zoom_in()
+            root.update_idletasks()
+
+        def zoom_sharp() -> None:
+            app.display_page()
+            root.update_idletasks()
+
+        results['zoom_preview'] = measure_repeated(zoom_preview, repeat, zoom_start)
+        results['zoom_sharp'] = measure_repeated(zoom_sharp, repeat, lambda: (zoom_start(), app.zoom_in()))
+
+        unload()
+
+    root.destroy()
+
+    return results
+
+def bench_suite(repeat: int, skip_gui: bool = False) -> Dict[str, Dict[str, float]]:
+    """
+        Run the whole benchmark suite.
+
+        The GUI cases run in a fresh process and are skipped with a note if no display is available.
+
+        Args:
+            repeat             (int): Measurements per case.
+            skip_gui (bool, optional): Skip the cases that need a display. Defaults to False.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Median and minimum time of each case.
+    """
+    results = bench_suite_headless(repeat)
+
+    if skip_gui:
+        return results
+
+    with tempfile.TemporaryDirectory() as directory:
+        pdf = os.path.join(directory, 'sample.pdf')
+        make_sample_pdf(pdf, BENCH_CONFIG['PAGES'])
+
+        command = [sys.executable, os.path.abspath(__file__), 'suite-gui', pdf, str(repeat)]
+        completed = subprocess.run(command, capture_output=True, text=True)
+
+        if completed.returncode != 0:
+            reason = (completed.stderr.strip().splitlines() or ['unknown error'])[-1]
+            print(f'GUI cases skipped: {reason}', file=sys.stderr)     # e.g. no display
+
+            return results
+
+        results.update(json.loads(completed.stdout))
+
+    startup = measure_startup([sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')], repeat)
+    results['startup'] = {'median_s': startup['median_s'], 'min_s': startup['min_s']}
+
+    return results
+
+def compare_results(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> List[str]:
+    """
+        Print the results next to the baseline and find the regressions.
+
+        Args:
+            results  (Dict[str, Dict[str, float]]): Results of this run.
+            baseline (Dict[str, Dict[str, float]]): Results of the baseline run.
+            threshold                      (float): Allowed slowdown of the fastest run (0.2 = 20 %).
+
+        Returns:
+            List[str]: Names of the cases slower than the baseline by more than the threshold.
+    """
+    regressions = []
+
+    # the fastest run is compared; it is the least affected by other load on the machine
+    for name, result in results.items():
+        current = result['min_s'] * 1000
+
+        if name not in baseline:
+            print(f'  {name:16s}: {current:10.2f} ms (new)')
+
+            continue
+
+        base = baseline[name]['min_s'] * 1000
+        change = current / base - 1 if base else 0.0
+        regressed = change > threshold
+
+        if regressed:
+            regressions.append(name)
+
+        print(f'  {name:16s}: {base:10.2f} ms -> {current:10.2f} ms ({change:+7.1%}){"  REGRESSION" if regressed else ""}')
+
+    return regressions
+
+def write_results(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    """
+        Write suite results with the environment they were measured in.
+
+        Args:
+            path                          (str): Output JSON file.
+            results (Dict[str, Dict[str, float]]): Median and minimum time of each case.
+    """
+    import platform
+
+    meta = {'python': platform.python_version(), 'platform': platform.platform(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta, 'results': results}, f, ensure_ascii=False, indent=2)
+
+def run_suite(args: argparse.Namespace) -> None:
+    """
+        Run the suite, write the results and compare them with the baseline.
+
+        Exits with status 1 if a case regressed by more than the threshold, or if the baseline
+        is missing; a missing baseline is only created with `--update-baseline`, so a CI job
+        with a wrong path or a lost baseline file cannot pass without comparing anything.
+
+        Args:
+            args (argparse.Namespace): Parsed `suite` arguments.
+    """
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        sys.exit(f'Error: baseline {args.baseline} not found; run with --update-baseline to create it')
+
+    results = bench_suite(args.repeat, args.skip_gui)
+    write_results(args.output, results)
+    print(f'suite x {args.repeat} runs -> {args.output}')
+
+    if args.update_baseline:
+        for name, result in results.items():
+            print(f'  {name:16s}: {result["min_s"] * 1000:10.2f} ms')
+
+        write_results(args.baseline, results)
+        print(f'baseline written: {args.baseline}')
+
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    regressions = compare_results(results, baseline, args.threshold)
+
+    if regressions:
+        sys.exit(f'Error: slower than {args.baseline} by more than {args.threshold:.0%}: {", ".join(regressions)}')
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+        Command line entry point for the benchmarks.
+
+        Usage:
+            python bench.py income [--size 10000000] [--skip-check]
+            python bench.py render [--frames 30]
+            python bench.py startup [--runs 5] [--exe dist/年末調整計算ツール.exe]
+            python bench.py suite [--repeat 5] [--baseline bench_baseline.json] [--threshold 0.2] [--update-baseline] [--skip-gui]
+
+        Args:
+            argv (Optional[List[str]], optional): Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(prog='bench', description='性能測定')
+    subparsers = parser.add_subparsers(dest='target', required=True)
+
+    income_parser = subparsers.add_parser('income', help='給与所得金額の計算')
+    income_parser.add_argument('--size', type=int, default=10_000_000, help='計算する年間給与金額の件数')
+    income_parser.add_argument('--skip-check', action='store_true', help='旧ルールとの一致確認を省略する')
+
+    render_parser = subparsers.add_parser('render', help='PDF ページの描画 (ディスプレイが必要)')
+    render_parser.add_argument('--frames', type=int, default=30, help='描画するフレーム数')
+
+    startup_parser = subparsers.add_parser('startup', help='起動からウィンドウ表示までの時間 (ディスプレイが必要)')
+    startup_parser.add_argument('--runs', type=int, default=5, help='起動回数')
+    startup_parser.add_argument('--exe', help='PyInstaller でビルドした実行ファイル')
+
+    suite_parser = subparsers.add_parser('suite', help='計算・描画・起動の性能測定とベースラインとの比較')
+    suite_parser.add_argument('--repeat', type=int, default=BENCH_CONFIG['REPEAT'], help='各項目の測定回数 (最速値で比較)')
+    suite_parser.add_argument('--output', default=BENCH_CONFIG['OUTPUT'], help='結果の JSON ファイル')
+    suite_parser.add_argument('--baseline', default=BENCH_CONFIG['BASELINE'], help='比較するベースラインの JSON ファイル')
+    suite_parser.add_argument('--threshold', type=float, default=BENCH_CONFIG['THRESHOLD'], help='許容する低下率 (0.2 = 20 %%)')
+    suite_parser.add_argument('--update-baseline', action='store_true', help='結果をベースラインとして保存する')
+    suite_parser.add_argument('--skip-gui', action='store_true', help='ディスプレイが必要な項目を省略する')
+
+    # internal: the GUI cases of the suite in a fresh process
+    gui_parser = subparsers.add_parser('suite-gui')
+    gui_parser.add_argument('pdf')
+    gui_parser.add_argument('repeat', type=int)
+
+    # internal: one render measurement in a fresh process
+    frames_parser = subparsers.add_parser('render-frames')
+    frames_parser.add_argument('pdf')
+    frames_parser.add_argument('pipeline', choices=('legacy', 'ppm'))
+    frames_parser.add_argument('zoom', type=float)
+    frames_parser.add_argument('frames', type=int)
+
+    args = parser.parse_args(argv)
+
+    if args.target == 'income':
+        if not args.skip_check:
+            print(f'parity: {check_income_parity():,} salaries OK')
+
+        bench_income(args.size)
+    elif args.target == 'render':
+        bench_render(args.frames)
+    elif args.target == 'startup':
+        bench_startup(args.runs, args.exe)
+    elif args.target == 'suite':
+        run_suite(args)
+    elif args.target == 'suite-gui':
+        print(json.dumps(bench_suite_gui(args.pdf, args.repeat)))
+    elif args.target == 'render-frames':
+        print(json.dumps(bench_render_frames(args.pdf, args.pipeline, args.zoom, args.frames)))
+
+if __name__ == '__main__':
+    main()
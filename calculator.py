@@ -0,0 +1,1681 @@
+import json
+import locale
+import os
+import queue
+import re
+import sys
+import threading
+import time
+import tkinter as tk
+from bisect import bisect_right
+from tkinter import filedialog, messagebox, ttk
+from typing import Callable, Hashable, List, Optional, Tuple, Union
+
+from config import *
+from income import calculate_income, get_income_table
+from pdf_cache import DiskRenderCache, RenderCache, default_cache_directory
+from pdf_search import SearchIndexer, find_hit_rects
+from pdf_thumbnails import ThumbnailSidebar
+from pdf_workspace import DocumentPool, WorkspaceDocument, find_document
+from profiling import PROFILER, profiled
+
+class TaxCalculator:
+    """
+        A tax calculation application with PDF viewing capabilities.
+
+        This class provides a Tkinter-based GUI for calculating employment income deductions
+        and viewing PDF documents. It supports two salary input modes:
+        single monthly salary and monthly variations.
+        The PDF libraries (fitz, PIL, tkinterdnd2) are imported on first use, so the window appears quickly.
+
+        Attributes:
+            root                          (tk.Tk): The main application window.
+            salary_mode            (tk.StringVar): Tracks the current salary input mode.
+            monthly_salaries (List[tk.StringVar]): List of monthly salary input variables.
+            yearly_var             (tk.StringVar): Yearly payment input variable (yearly mode).
+            current_pdf (Optional[fitz.Document]): Currently displayed PDF document.
+            current_pdf_key       (Optional[str]): SHA-256 hash of the displayed PDF, used in render cache keys.
+            documents   (List[WorkspaceDocument]): PDF files of the workspace, in the order of the document list.
+            current_document (Optional[WorkspaceDocument]): The displayed workspace document.
+            document_pool          (DocumentPool): Open PDF documents; least recently used ones are closed.
+            current_page                    (int): Current page number in the PDF viewer.
+            pdf_zoom                      (float): Current zoom level for PDF viewing.
+            render_cache            (RenderCache): Rendered pages (width, height, PPM data) keyed by (document, page, zoom).
+            disk_cache          (DiskRenderCache): Rendered pages kept across sessions.
+            prefetcher (Optional[PagePrefetcher]): Renders neighbouring pages in background, created with the first PDF.
+            drawn_tiles                    (Dict): Canvas items and photo images of the tiles on the canvas, keyed by (column, row).
+            spare_tiles                    (List): Hidden tile canvas items and photo images kept for reuse.
+            thumbnail_sidebar  (ThumbnailSidebar): Page thumbnails next to the PDF canvas.
+            continuous_var           (tk.BooleanVar): True while pages are shown end-to-end in continuous mode.
+            page_layout (Optional[Tuple[List[int], List[int], List[int]]]): Top, width and height of every page in continuous mode, in pixels.
+            drawn_pages                    (Dict): Placeholder, canvas item and photo image of the pages laid out in continuous mode, keyed by page index.
+            pending_document (Optional[WorkspaceDocument]): Document being hashed before `switch_document` displays it.
+            search_indexer (Optional[SearchIndexer]): Builds the full-text search indexes in background, created with the first PDF.
+            search_query                    (str): The last search text; its hits are highlighted.
+            search_results (List[Tuple[WorkspaceDocument, int]]): Document and page index of each entry in the result list.
+            profile_overlay    (Optional[tk.Label]): Timings of the profiled operations over the window, shown with F12.
+            planning_window (Optional[PlanningWindow]): Inverse calculation and salary / bonus sweep, created on first use.
+            roster_window     (Optional[RosterWindow]): Employee roster grid, created on first use.
+    """
+    def __init__(self, root: tk.Tk) -> None:
+        """
+            Initialize the tax calculator application.
+
+            Args:
+                root (tk.Tk): The main Tkinter window for the application.
+        """
+        self.root = root
+        self.root.title(UI_CONFIG['APP_TITLE'])
+        root.grid_columnconfigure(2, weight=3)
+
+        # create and set up the main window
+        self.main_frame = ttk.Frame(root, padding=10)
+        self.main_frame.grid_columnconfigure(2, weight=3)
+        self.main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+
+        self.salary_mode = tk.StringVar(value='single')
+        self.monthly_salaries = [tk.StringVar() for _ in range(12)]
+
+        self.create_salary_mode_selection()
+        self.create_input_fields()          # create input fields
+        self.create_buttons()               # create buttons
+        self.create_result_labels()         # create result labels
+        self.create_recalculation_traces()  # auto calculation on input
+
+        self.monthly_salary_frame.grid_remove()
+        self.yearly_salary_frame.grid_remove()
+
+        self.render_cache = RenderCache(UI_CONFIG['RENDER_CACHE_BYTES'])
+        self.disk_cache = DiskRenderCache(UI_CONFIG['DISK_CACHE_DIRECTORY'] or default_cache_directory(), UI_CONFIG['DISK_CACHE_BYTES'])
+
+        self.create_pdf_viewer()    # frame for pdf viewer
+
+        # variables for pdf viewer
+        self.current_pdf = None
+        self.current_pdf_key = None
+        self.documents = []
+        self.current_document = None
+        self.document_pool = DocumentPool(UI_CONFIG['DOCUMENT_POOL_SIZE'])
+        self.current_page = 0
+        self.pdf_zoom = 1.0
+        self.prefetcher = None
+        self.drawn_tiles = {}
+        self.spare_tiles = []
+        self.tile_update_pending = False
+        self.zoom_job = None
+        self.page_layout = None
+        self.layout_zoom = None
+        self.drawn_pages = {}
+        self.rendered_pages = set()
+        self.spare_pages = []
+        self.pending_document = None
+        self.search_indexer = None
+        self.search_query = ''
+        self.search_results = []
+        self.highlight_rects = {}
+
+        # profiler overlay (F12) and export of the timings (Shift+F12)
+        self.profile_overlay = None
+        self.profile_job = None
+        self.root.bind('<F12>', lambda event: self.toggle_profile_overlay())
+        self.root.bind('<Shift-F12>', lambda event: self.export_profile())
+
+        if PROFILER.enabled:
+            self.toggle_profile_overlay()
+
+        self.planning_window = None
+        self.roster_window = None
+
+    def create_salary_mode_selection(self) -> None:
+        """
+            Create radio buttons for selecting salary input mode.
+
+            Allows switching between single monthly salary and monthly detailed salary inputs.
+        """
+        mode_frame = ttk.Frame(self.main_frame)
+        mode_frame.grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=5)
+
+        ttk.Radiobutton(mode_frame, text=RADIO_BUTTON_TEXTS['SINGLE'], variable=self.salary_mode, value='single', command=self.toggle_salary_mode_input).grid(row=0, column=0, padx=5)
+        ttk.Radiobutton(mode_frame, text=RADIO_BUTTON_TEXTS['MONTHLY'], variable=self.salary_mode, value='monthly', command=self.toggle_salary_mode_input).grid(row=0, column=1, padx=5)
+        ttk.Radiobutton(mode_frame, text=RADIO_BUTTON_TEXTS['YEARLY'], variable=self.salary_mode, value='yearly', command=self.toggle_salary_mode_input).grid(row=0, column=2, padx=5)
+
+    def create_input_fields(self) -> None:
+        """
+            Create and arrange input fields for salary and bonus information.
+
+            Sets up entry fields for:
+                - Single monthly salary or monthly salary varioations.
+                - First bonus amount
+                - Second bonus amount
+        """
+        vcmd = (self.root.register(self.validate_entry), '%P')      # register validate command
+
+        # single monthly salary
+        self.single_salary_frame = ttk.Frame(self.main_frame)
+        self.single_salary_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+
+        ttk.Label(self.single_salary_frame, text=LABEL_TEXTS['MONTHLY_SALARY']).grid(row=0, column=0, sticky=tk.W, pady=5)
+        self.monthly_var = tk.StringVar()
+        self.month_entry = ttk.Entry(self.single_salary_frame, textvariable=self.monthly_var, validate='key', validatecommand=vcmd)
+        self.month_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=5)
+
+        # month salary inputs
+        self.monthly_salary_frame = ttk.Frame(self.main_frame)
+        self.monthly_salary_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+
+        for i in range(12):
+            ttk.Label(self.monthly_salary_frame, text=f'{i + 1}月', anchor=tk.E).grid(row=i//2, column=(i%2)*2, sticky=(tk.E, tk.W), pady=2)
+            entry = ttk.Entry(self.monthly_salary_frame, textvariable=self.monthly_salaries[i], width=10, validate='key', validatecommand=vcmd)
+            entry.grid(row=i//2, column=(i%2)*2+1, sticky=(tk.W ,tk.E), pady=2)
+
+        # yearly payment (e.g. read from a withholding slip)
+        self.yearly_salary_frame = ttk.Frame(self.main_frame)
+        self.yearly_salary_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+
+        ttk.Label(self.yearly_salary_frame, text=LABEL_TEXTS['YEARLY_SALARY']).grid(row=0, column=0, sticky=tk.W, pady=5)
+        self.yearly_var = tk.StringVar()
+        self.yearly_entry = ttk.Entry(self.yearly_salary_frame, textvariable=self.yearly_var, validate='key', validatecommand=vcmd)
+        self.yearly_entry.grid(row=0, column=1, sticky=(tk.W, tk.E), pady=5)
+
+        # bonus 1
+        ttk.Label(self.main_frame, text=LABEL_TEXTS['BONUS1']).grid(row=2, column=0 ,sticky=tk.W, pady=5)
+        self.bonus1_var = tk.StringVar()
+        self.bonus1_entry = ttk.Entry(self.main_frame, textvariable=self.bonus1_var, validate='key', validatecommand=vcmd)
+        self.bonus1_entry.grid(row=2, column=1, sticky=(tk.W, tk.E), pady=5)
+
+        # bonus 2
+        ttk.Label(self.main_frame, text=LABEL_TEXTS['BONUS2']).grid(row=3, column=0 ,sticky=tk.W, pady=5)
+        self.bonus2_var = tk.StringVar()
+        self.bonus2_entry = ttk.Entry(self.main_frame, textvariable=self.bonus2_var, validate='key', validatecommand=vcmd)
+        self.bonus2_entry.grid(row=3, column=1, sticky=(tk.W, tk.E), pady=5)
+
+    def toggle_salary_mode_input(self) -> None:
+        """
+            Toggle between salary input modes.
+
+            Switches the visibility of the input frame between `single monthly salary`,
+            `monthly detailed salary` and `yearly payment` modes based on the selected radio button.
+        """
+        frames = {'single': self.single_salary_frame, 'monthly': self.monthly_salary_frame, 'yearly': self.yearly_salary_frame}
+
+        for mode, frame in frames.items():
+            if mode == self.salary_mode.get():
+                frame.grid(row=1, column=0, columnspan=2)
+            else:
+                frame.grid_remove()
+
+    def create_buttons(self) -> None:
+        """
+            Create and place calculation and clear buttons.
+
+            Buttons are created using predefined constant texts and
+            bound to corresponding command methods.
+        """
+        button_frame = ttk.Frame(self.main_frame)
+        button_frame.grid(row=4, column=0, columnspan=2, pady=10)
+
+        ttk.Button(button_frame, text=BUTTON_TEXTS['CALCULATE'], command=self.calculate).grid(row=0, column=0, padx=5)
+        ttk.Button(button_frame, text=BUTTON_TEXTS['CLEAR'], command=self.clear).grid(row=0, column=1, padx=5)
+        ttk.Button(button_frame, text=BUTTON_TEXTS['PLANNING'], command=self.open_planning_window).grid(row=0, column=2, padx=5)
+        ttk.Button(button_frame, text=BUTTON_TEXTS['ROSTER'], command=self.open_roster_window).grid(row=0, column=3, padx=5)
+
+    def create_result_labels(self) -> None:
+        """
+            Create and place labels for yearly salary and income amount results.
+
+            Adds a separator and initializes labels to display calculation results.
+        """
+        # separator
+        ttk.Separator(self.main_frame, orient='horizontal').grid(row=5, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=10)
+
+        # total yearly salary
+        ttk.Label(self.main_frame, text=LABEL_TEXTS['TOTAL_YEARLY_SALARY']).grid(row=6, column=0, sticky=tk.W)
+        self.total_label = ttk.Label(self.main_frame, text='')
+        self.total_label.grid(row=6, column=1, sticky=tk.W)
+
+        # income amount
+        ttk.Label(self.main_frame, text=LABEL_TEXTS['INCOME_AMOUNT']).grid(row=7, column=0, sticky=tk.W)
+        self.income_label = ttk.Label(self.main_frame, text='')
+        self.income_label.grid(row=7, column=1, sticky=tk.W)
+
+    def create_recalculation_traces(self) -> None:
+        """
+            Set up automatic recalculation driven by variable traces.
+
+            Traces fire after the Entry widgets have updated their variables, including on paste.
+            Only the changed inputs are parsed again, the 12-month total is kept incrementally,
+            and bursts of changes are coalesced into a single recalculation per idle cycle.
+        """
+        self.input_vars = {str(var): var for var in (self.monthly_var, *self.monthly_salaries, self.yearly_var, self.bonus1_var, self.bonus2_var)}
+        self.monthly_names = {str(var) for var in self.monthly_salaries}
+        self.input_values = dict.fromkeys(self.input_vars)      # var name -> parsed amount, None if empty
+        self.monthly_total = 0
+        self.dirty_inputs = set()
+        self.recalculation_pending = False
+        self.displayed_results = None
+
+        for var in self.input_vars.values():
+            var.trace_add('write', self.mark_input_dirty)
+
+        self.salary_mode.trace_add('write', lambda *args: self.schedule_recalculation())
+
+    def mark_input_dirty(self, name: str, index: str, mode: str) -> None:
+        """
+            Record a changed input variable and schedule a recalculation.
+
+            Args:
+                name  (str): Tcl name of the changed variable.
+                index (str): Unused (array index).
+                mode  (str): Unused (trace operation).
+        """
+        self.dirty_inputs.add(name)
+        self.schedule_recalculation()
+
+    def schedule_recalculation(self) -> None:
+        """
+            Recalculate once the pending events have been processed.
+        """
+        if not self.recalculation_pending:
+            self.recalculation_pending = True
+            self.root.after_idle(self.recalculate)
+
+    @profiled('recalculate')
+    def recalculate(self) -> None:
+        """
+            Recalculate the results from the changed inputs only.
+
+            Labels are cleared while all inputs of the current mode are empty,
+            and are only reformatted when the results change.
+        """
+        self.recalculation_pending = False
+
+        for name in self.dirty_inputs:
+            text = self.input_vars[name].get()
+            value = self.clean_input(text) if text.strip() else None
+
+            if name in self.monthly_names:
+                self.monthly_total += (value or 0) - (self.input_values[name] or 0)
+
+            self.input_values[name] = value
+
+        self.dirty_inputs.clear()
+
+        bonus1 = self.input_values[str(self.bonus1_var)]
+        bonus2 = self.input_values[str(self.bonus2_var)]
+
+        if self.salary_mode.get() == 'single':
+            monthly = self.input_values[str(self.monthly_var)]
+            empty = monthly is None and bonus1 is None and bonus2 is None
+            yearly_salary = (monthly or 0) * 12 + (bonus1 or 0) + (bonus2 or 0)
+        elif self.salary_mode.get() == 'yearly':
+            yearly = self.input_values[str(self.yearly_var)]
+            empty = yearly is None and bonus1 is None and bonus2 is None
+            yearly_salary = (yearly or 0) + (bonus1 or 0) + (bonus2 or 0)
+        else:
+            empty = bonus1 is None and bonus2 is None and all(self.input_values[name] is None for name in self.monthly_names)
+            yearly_salary = self.monthly_total + (bonus1 or 0) + (bonus2 or 0)
+
+        results = None if empty else (yearly_salary, get_income_table().income(yearly_salary))
+
+        if results != self.displayed_results:
+            self.show_results(results)
+
+    def show_results(self, results: Optional[Tuple[int, int]]) -> None:
+        """
+            Display the calculation results in the labels.
+
+            Args:
+                results (Optional[Tuple[int, int]]): (yearly salary, income amount), or None to clear the labels.
+        """
+        self.displayed_results = results
+
+        if results is None:
+            self.total_label['text'] = ''
+            self.income_label['text'] = ''
+        else:
+            total, income = results
+            self.total_label['text'] = f'¥ {self.format_currency(total)}'
+            self.income_label['text'] = f'¥ {self.format_currency(income)}'
+
+    def create_pdf_viewer(self) -> None:
+        """
+            Create PDF viewer frame and control elements.
+
+            Sets up UI elements for PDF file selection, page navigation, and zoom functionality.
+            Enables drag and drop capability.
+        """
+        # frame for pdf viewer
+        self.pdf_frame = ttk.LabelFrame(self.main_frame, text=UI_CONFIG['PDF_VIEWER_TITLE'])
+        self.pdf_frame.grid(row=0, column=2, rowspan=8, padx=10, sticky=(tk.N, tk.S, tk.E, tk.W))
+
+        # button frame
+        button_frame = ttk.Frame(self.pdf_frame)
+        button_frame.pack(side=tk.TOP, fill=tk.X)
+
+        # select pdf button
+        self.select_pdf_button = ttk.Button(button_frame, text=BUTTON_TEXTS['SELECT_PDF'], command=self.open_pdf_file)
+        self.select_pdf_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+        # button for moving to previous page
+        self.prev_page_button = ttk.Button(button_frame, text=BUTTON_TEXTS['PREV_PAGE'], command=self.prev_page, state=tk.DISABLED)
+        self.prev_page_button.pack(side=tk.LEFT, padx=2)
+
+        # label for display page
+        self.page_label = ttk.Label(button_frame, text='0 / 0 ページ', width=20, anchor=tk.CENTER)
+        self.page_label.pack(side=tk.LEFT, padx=5)
+
+        # button for moving to next page
+        self.next_page_button = ttk.Button(button_frame, text=BUTTON_TEXTS['NEXT_PAGE'], command=self.next_page, state=tk.DISABLED)
+        self.next_page_button.pack(side=tk.LEFT, padx=2)
+
+        # button for zoom in
+        self.zoom_in_button = ttk.Button(button_frame, text=BUTTON_TEXTS['ZOOM_IN'], command=self.zoom_in)
+        self.zoom_in_button.pack(side=tk.LEFT, padx=2)
+
+        # label for display zoom level
+        self.zoom_label = ttk.Label(button_frame, text='100 %', width=6)
+        self.zoom_label.pack(side=tk.LEFT, padx=2)
+
+        # button for zoom out
+        self.zoom_out_button = ttk.Button(button_frame, text=BUTTON_TEXTS['ZOOM_OUT'], command=self.zoom_out)
+        self.zoom_out_button.pack(side=tk.LEFT, padx=2)
+
+        # check button for continuous scroll mode
+        self.continuous_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(button_frame, text=BUTTON_TEXTS['CONTINUOUS'], variable=self.continuous_var, command=self.toggle_continuous).pack(side=tk.LEFT, padx=5)
+
+        # list of the open documents
+        document_frame = ttk.Frame(self.pdf_frame)
+        document_frame.pack(side=tk.TOP, fill=tk.X)
+
+        self.document_list = ttk.Combobox(document_frame, state='readonly')
+        self.document_list.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5, pady=(0, 5))
+        self.document_list.bind('<<ComboboxSelected>>', lambda event: self.switch_document(self.document_list.current()))
+
+        # button for closing the displayed document
+        self.close_pdf_button = ttk.Button(document_frame, text=BUTTON_TEXTS['CLOSE_PDF'], command=self.close_document, state=tk.DISABLED)
+        self.close_pdf_button.pack(side=tk.LEFT, padx=5, pady=(0, 5))
+
+        # full-text search
+        search_frame = ttk.Frame(self.pdf_frame)
+        search_frame.pack(side=tk.TOP, fill=tk.X)
+        search_frame.grid_columnconfigure(0, weight=1)
+
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var)
+        search_entry.grid(row=0, column=0, sticky=(tk.W, tk.E), padx=5)
+        search_entry.bind('<Return>', lambda event: self.search())
+
+        ttk.Button(search_frame, text=BUTTON_TEXTS['SEARCH'], command=self.search).grid(row=0, column=1, padx=5)
+        self.search_status = ttk.Label(search_frame, text='')
+        self.search_status.grid(row=0, column=2, padx=5)
+
+        self.search_result_list = tk.Listbox(search_frame, height=UI_CONFIG['SEARCH_RESULT_ROWS'])
+        self.search_result_list.grid(row=1, column=0, columnspan=3, sticky=(tk.W, tk.E), padx=5, pady=(2, 5))
+        self.search_result_list.bind('<<ListboxSelect>>', lambda event: self.show_search_result())
+
+        # page thumbnails
+        self.thumbnail_sidebar = ThumbnailSidebar(self.pdf_frame, self.render_cache, self.disk_cache, self.go_to_page)
+        self.thumbnail_sidebar.frame.pack(side=tk.LEFT, fill=tk.Y)
+
+        # canvas with scrollbars
+        canvas_frame = ttk.Frame(self.pdf_frame)
+        canvas_frame.pack(fill=tk.BOTH, expand=True)
+        canvas_frame.grid_rowconfigure(0, weight=1)
+        canvas_frame.grid_columnconfigure(0, weight=1)
+
+        scroll_step = UI_CONFIG['SCROLL_STEP']
+        self.pdf_canvas = tk.Canvas(canvas_frame, background='gray', width=600, height=800, xscrollincrement=scroll_step, yscrollincrement=scroll_step)
+        self.pdf_canvas.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.E, tk.W))
+
+        y_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.VERTICAL, command=lambda *args: self.scroll_pdf(tk.VERTICAL, *args))
+        y_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        x_scrollbar = ttk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, command=lambda *args: self.scroll_pdf(tk.HORIZONTAL, *args))
+        x_scrollbar.grid(row=1, column=0, sticky=(tk.W, tk.E))
+        self.pdf_canvas.config(xscrollcommand=x_scrollbar.set, yscrollcommand=y_scrollbar.set)
+
+        # binding for mouse wheel panning (Button-4/5 on Linux, Shift for horizontal)
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.pdf_canvas.bind(sequence, self.handle_mouse_wheel)
+
+        # binding for mouse wheel zoom
+        for sequence in ('<Control-MouseWheel>', '<Control-Button-4>', '<Control-Button-5>'):
+            self.pdf_canvas.bind(sequence, self.handle_mouse_wheel_zoom)
+        self.pdf_canvas.bind('<Configure>', lambda event: self.schedule_tile_update())
+
+        # a single photo image and canvas item reused for every page
+        self.page_photo = tk.PhotoImage()
+        self.page_item = self.pdf_canvas.create_image(0, 0, anchor=tk.NW, image=self.page_photo, state=tk.HIDDEN)
+
+        # drag & drop is enabled once the window has been drawn
+        self.root.after_idle(self.enable_drop_target)
+
+    def enable_drop_target(self) -> None:
+        """
+            Load tkdnd and register the PDF viewer as a drop target.
+
+            Deferred until the window has been drawn because loading tkinterdnd2 delays startup.
+            If tkdnd is unavailable, PDF files can still be opened with the select button.
+        """
+        from tkinterdnd2 import DND_FILES, TkinterDnD
+
+        try:
+            TkinterDnD._require(self.root)  # what TkinterDnD.Tk does on creation
+        except RuntimeError:
+            return
+
+        self.pdf_frame.drop_target_register(DND_FILES)
+        self.pdf_frame.dnd_bind('<<Drop>>', self.handle_drop)
+
+    def open_pdf_file(self) -> None:
+        """
+            Open file dialog to select and load a PDF file.
+
+            Launches a file selection dialog and calls load_pdf method
+            when a PDF file is selected by user.
+        """
+        filetypes = [('PDF ファイル', '*.pdf')]
+        filename = filedialog.askopenfilename(title='PDF ファイルを選択', filetypes=filetypes)
+
+        if filename:
+            self.load_pdf(filename)
+
+    def handle_drop(self, event: tk.Event) -> None:
+        """
+            Handle PDF file drag and drop event.
+
+            Verified that the dropped files are PDF files, adds all of them to the workspace
+            and displays the first one.
+            If a single withholding slip is dropped, its amounts are filled into the form.
+            Displays an error message if non-PDF files are dropped.
+
+            Args:
+                event (tk.Event): Drag and drop event
+        """
+        filenames = re.findall(r'{([^}]*)}', event.data)
+
+        if not filenames:
+            filenames = event.data.split()
+
+        pdf_files = [f.strip('\'\"') for f in filenames if f.lower().strip('\'\"').endswith('.pdf')]
+
+        if pdf_files:
+            self.add_documents(pdf_files, lambda indexes: self.show_added_documents(indexes, fill_form=len(pdf_files) == 1))
+        else:
+            messagebox.showerror('Error', ERROR_MESSAGES['PDF_DROP_ERROR'])
+
+    def load_pdf(self, filename: str) -> None:
+        """
+            Load and display a PDF file.
+
+            Files already in the workspace are only switched to.
+            The file is hashed in background, so it is displayed after this method returns.
+
+            Args:
+                filename (str): Path to the PDF file to be loaded.
+        """
+        self.add_documents([filename], self.show_added_documents)
+
+    @profiled('load_pdf')
+    def show_added_documents(self, indexes: List[int], fill_form: bool = False) -> None:
+        """
+            Display the first document added by `add_documents`.
+
+            Args:
+                indexes          (List[int]): Workspace indexes of the added documents.
+                fill_form (bool, optional): Also fill the form from the displayed PDF. Defaults to False.
+        """
+        if indexes:
+            self.switch_document(indexes[0])
+
+            if fill_form and self.current_document is self.documents[indexes[0]]:     # not yet if it is being rehashed
+                self.fill_form_from_pdf()
+
+    def fill_form_from_pdf(self) -> None:
+        """
+            Fill the form with the amounts of the first withholding slip in the displayed PDF.
+
+            Fields are read with the templates of `EXTRACT_CONFIG['TEMPLATES']`. Only the first
+            `EXTRACT_CONFIG['FORM_FILL_PAGES']` pages are searched, so dropping a long PDF that is
+            not a slip does not block the window.
+            A yearly payment switches the form to the yearly payment mode.
+            The form is left unchanged if none of these pages matches a template.
+        """
+        from extract import extract_page
+
+        for index in range(min(len(self.current_pdf), EXTRACT_CONFIG['FORM_FILL_PAGES'])):
+            result = extract_page(self.current_pdf[index], EXTRACT_CONFIG['TEMPLATES'])
+
+            if result is not None and result[1]:
+                fields = result[1]
+                break
+        else:
+            return
+
+        self.clear()
+
+        if 'YEARLY_SALARY' in fields:
+            self.salary_mode.set('yearly')
+            self.yearly_var.set(str(fields['YEARLY_SALARY']))
+        elif 'MONTHLY_SALARY' in fields:
+            self.salary_mode.set('single')
+            self.monthly_var.set(str(fields['MONTHLY_SALARY']))
+
+        self.toggle_salary_mode_input()
+        self.bonus1_var.set(str(fields.get('BONUS1', '')))
+        self.bonus2_var.set(str(fields.get('BONUS2', '')))
+
+    def hash_files(self, filenames: List[str], on_hashed: Callable[[List[Union[str, OSError]]], None]) -> None:
+        """
+            Compute the content hashes of files on a worker thread, since reading a large PDF would block the window.
+
+            Args:
+                filenames                                   (List[str]): Paths of the files.
+                on_hashed (Callable[[List[Union[str, OSError]]], None]): Called on the main thread with the hash of each file,
+                                                                          or the error raised while reading it.
+        """
+        results = queue.Queue()
+
+        def run() -> None:
+            hashes = []
+
+            for filename in filenames:
+                try:
+                    hashes.append(self.disk_cache.file_hash(filename))
+                except OSError as e:
+                    hashes.append(e)
+
+            results.put(hashes)
+
+        def poll() -> None:
+            try:
+                on_hashed(results.get_nowait())
+            except queue.Empty:
+                self.root.after(UI_CONFIG['PREFETCH_POLL_MS'], poll)
+
+        threading.Thread(target=run, name='FileHasher', daemon=True).start()
+        self.root.after(UI_CONFIG['PREFETCH_POLL_MS'], poll)
+
+    def add_documents(self, filenames: List[str], on_added: Callable[[List[int]], None]) -> None:
+        """
+            Add PDF files to the workspace without displaying them.
+
+            The files are hashed in background first and opened afterwards, so the render cache keys
+            describe the contents that were opened.
+
+            Args:
+                filenames                    (List[str]): Paths to the PDF files.
+                on_added (Callable[[List[int]], None]): Called on the main thread with the workspace index of every file that could be opened.
+        """
+        self.hash_files(filenames, lambda hashes: on_added([index for index in map(self.add_document, filenames, hashes) if index is not None]))
+
+    def add_document(self, filename: str, key: Union[str, OSError]) -> Optional[int]:
+        """
+            Add a hashed PDF file to the workspace, see `add_documents`.
+
+            Displays an error message if the file cannot be opened.
+
+            Args:
+                filename              (str): Path to the PDF file.
+                key (Union[str, OSError]): Content hash of the file, or the error raised while hashing it.
+
+            Returns:
+                Optional[int]: Index of the document in the workspace, or None if it could not be opened.
+        """
+        index = find_document(self.documents, filename)
+
+        if index is not None:
+            return index
+
+        try:
+            if isinstance(key, OSError):
+                raise key
+
+            self.document_pool.get(filename)    # check that the file is a readable PDF
+            document = WorkspaceDocument(filename, key)
+            self.documents.append(document)
+        except PermissionError:
+            messagebox.showerror('Error', ERROR_MESSAGES['PERMISSION_DENIED'])
+
+            return None
+        except FileNotFoundError:
+            messagebox.showerror('Error', ERROR_MESSAGES['FILE_NOT_FOUND'])
+
+            return None
+        except Exception as e:
+            messagebox.showerror('Error', f'{ERROR_MESSAGES["UNEXPECTED_ERROR"]}\n{e}')
+
+            return None
+
+        # index the text for full-text search in background
+        if self.search_indexer is None:
+            self.search_indexer = SearchIndexer(UI_CONFIG['SEARCH_INDEX_DIRECTORY'] or default_cache_directory('search_index'), self.disk_cache.file_hash)
+
+        self.search_indexer.build(document.filename, document.key)
+        self.update_document_list()
+
+        return len(self.documents) - 1
+
+    def switch_document(self, index: int) -> None:
+        """
+            Display a document of the workspace.
+
+            The page and zoom level of the previous document are kept for when it is displayed again.
+            Rendered pages stay in the render caches, so switching back does not render again.
+            A document that was closed by the document pool is hashed again in background before
+            it is reopened, since the file may have been replaced meanwhile.
+
+            Args:
+                index (int): Index of the document in the workspace.
+        """
+        if not 0 <= index < len(self.documents):
+            return
+
+        document = self.documents[index]
+        self.pending_document = None
+
+        if document.filename in self.document_pool:
+            self.show_document(document, document.key)
+        else:
+            self.pending_document = document
+            self.hash_files([document.filename], lambda hashes: self.show_document(document, hashes[0]) if self.pending_document is document else None)
+
+    def show_document(self, document: WorkspaceDocument, key: Union[str, OSError]) -> None:
+        """
+            Open and display a workspace document, see `switch_document`.
+
+            Args:
+                document (WorkspaceDocument): The document.
+                key       (Union[str, OSError]): Current content hash of the file, or the error raised while hashing it.
+        """
+        from pdf_prefetch import PagePrefetcher
+
+        self.pending_document = None
+
+        if document not in self.documents:
+            return      # closed while being hashed
+
+        if self.prefetcher is None:
+            self.prefetcher = PagePrefetcher(self.root, self.on_page_prefetched, self.disk_cache)
+
+        self.prefetcher.reset()
+
+        if self.current_document is not None:
+            self.current_document.page = self.current_page
+            self.current_document.zoom = self.pdf_zoom
+
+        try:
+            if isinstance(key, OSError):
+                raise key
+
+            # a closed document is reopened by name; if the file was replaced meanwhile, its pages must not be cached under the old hash
+            if key != document.key:
+                document.rekey(key)
+                self.search_indexer.build(document.filename, key)
+
+            self.current_pdf = self.document_pool.get(document.filename, activate=True)
+        except PermissionError:
+            messagebox.showerror('Error', ERROR_MESSAGES['PERMISSION_DENIED'])
+            self.remove_document(self.documents.index(document))
+
+            return
+        except Exception:
+            # the file has been moved or deleted since it was added
+            messagebox.showerror('Error', ERROR_MESSAGES['FILE_NOT_FOUND'])
+            self.remove_document(self.documents.index(document))
+
+            return
+
+        self.current_document = document
+        self.current_pdf_key = document.key
+        self.page_layout = None
+        self.current_page = min(document.page, len(self.current_pdf) - 1)
+        self.pdf_zoom = document.zoom
+        self.update_zoom_display()
+        self.update_document_list()
+        self.update_page_controls()
+        self.thumbnail_sidebar.show_document(self.current_pdf, self.current_pdf_key)
+
+        self.display_page()
+
+    def close_document(self) -> None:
+        """
+            Close the displayed document and display its neighbour in the document list.
+        """
+        if self.current_document is not None:
+            self.remove_document(self.documents.index(self.current_document))
+
+    def remove_document(self, index: int) -> None:
+        """
+            Remove a document from the workspace and close it.
+
+            If it was displayed, its neighbour in the document list is displayed instead.
+
+            Args:
+                index (int): Index of the document in the workspace.
+        """
+        document = self.documents.pop(index)
+        self.document_pool.close(document.filename)
+
+        if document is not self.current_document:
+            self.update_document_list()
+
+            return
+
+        self.current_document = None
+        self.current_pdf = None
+        self.current_pdf_key = None
+
+        if self.documents:
+            self.switch_document(min(index, len(self.documents) - 1))
+
+            return
+
+        # the workspace is empty
+        if self.zoom_job is not None:
+            self.root.after_cancel(self.zoom_job)
+            self.zoom_job = None
+
+        self.prefetcher.reset()
+        self.release_tiles()
+        self.release_pages()
+        self.page_layout = None
+        self.pdf_canvas.itemconfigure(self.page_item, state=tk.HIDDEN)
+        self.pdf_canvas.delete('highlight')
+        self.pdf_canvas.config(scrollregion=(0, 0, 0, 0))
+        self.current_page = 0
+        self.update_document_list()
+        self.update_page_controls()
+        self.thumbnail_sidebar.show_document(None, None)
+
+    def update_document_list(self) -> None:
+        """
+            Update the document list and the close button.
+        """
+        self.document_list['values'] = [document.title for document in self.documents]
+
+        if self.current_document is None:
+            self.document_list.set('')
+        else:
+            self.document_list.current(self.documents.index(self.current_document))
+
+        self.close_pdf_button['state'] = tk.NORMAL if self.current_document else tk.DISABLED
+
+    def update_page_controls(self) -> None:
+        """
+            Update the page label and the page navigation buttons.
+        """
+        page_count = len(self.current_pdf) if self.current_pdf else 0
+
+        self.page_label['text'] = f'{min(self.current_page + 1, page_count)} / {page_count} ページ'
+        self.prev_page_button['state'] = tk.NORMAL if self.current_page > 0 else tk.DISABLED
+        self.next_page_button['state'] = tk.NORMAL if self.current_page < page_count - 1 else tk.DISABLED
+
+    @profiled('display_page')
+    def display_page(self) -> None:
+        """
+            Display the current PDF page on the canvas.
+
+            Renders the page according to the current zoom level and places it on the canvas.
+            Pages already rendered at the same zoom level are taken from the render cache,
+            and the neighbouring pages are prefetched in background.
+            From `UI_CONFIG['TILE_MIN_ZOOM']` only the tiles covering the visible region are rendered.
+            Does nothing if no PDF is loaded.
+        """
+        if not self.current_pdf:
+            return
+
+        from pdf_render import render_ppm
+
+        if self.zoom_job is not None:
+            self.root.after_cancel(self.zoom_job)   # this render supersedes the pending sharp render
+            self.zoom_job = None
+
+        self.thumbnail_sidebar.set_current_page(self.current_page)
+
+        if self.continuous_var.get():
+            self.display_continuous()
+
+            return
+
+        if self.pdf_zoom >= UI_CONFIG['TILE_MIN_ZOOM']:
+            self.prefetcher.reset()     # whole pages are not needed at this zoom level
+            self.release_tiles()
+            self.pdf_canvas.itemconfigure(self.page_item, state=tk.HIDDEN)
+
+            rect = self.current_pdf[self.current_page].rect
+            self.pdf_canvas.config(scrollregion=(0, 0, int(rect.width * self.pdf_zoom), int(rect.height * self.pdf_zoom)))
+            self.update_visible_tiles()
+            self.draw_highlights()
+
+            return
+
+        key = RenderCache.make_key(self.current_pdf_key, self.current_page, self.pdf_zoom)
+        page = self.current_pdf[self.current_page]
+
+        with PROFILER.section('display_page.render'):
+            width, height, data = self.get_render(key, lambda: render_ppm(page, self.pdf_zoom))
+
+        with PROFILER.section('display_page.blit'):
+            self.pdf_canvas.config(scrollregion=(0, 0, width, height))
+            self.show_page_image(0, 0, width, height, data)
+
+        self.draw_highlights()
+
+        self.prefetcher.schedule(self.current_pdf.name, self.current_pdf_key, self.current_page, len(self.current_pdf), self.pdf_zoom, self.render_cache.__contains__)
+
+    def toggle_continuous(self) -> None:
+        """
+            Switch between the single page view and continuous scroll mode.
+        """
+        if not self.current_pdf:
+            return
+
+        self.prefetcher.reset()
+        self.release_tiles()
+        self.release_pages()
+        self.page_layout = None
+        self.pdf_canvas.itemconfigure(self.page_item, state=tk.HIDDEN)
+        self.pdf_canvas.xview_moveto(0)
+        self.pdf_canvas.yview_moveto(0)
+        self.display_page()
+
+    def compute_page_layout(self) -> Tuple[List[int], List[int], List[int]]:
+        """
+            Lay out all pages end-to-end from their sizes at the current zoom level, without rendering.
+
+            Returns:
+                Tuple[List[int], List[int], List[int]]: Top, width and height of every page in pixels.
+        """
+        gap = UI_CONFIG['PAGE_GAP']
+        tops, widths, heights = [], [], []
+        top = gap
+
+        for width, height in self.current_document.get_page_sizes(self.current_pdf):
+            tops.append(top)
+            widths.append(int(width * self.pdf_zoom))
+            heights.append(int(height * self.pdf_zoom))
+            top += heights[-1] + gap
+
+        return tops, widths, heights
+
+    def display_continuous(self) -> None:
+        """
+            Lay out the document for continuous scroll mode and show the current page at the top.
+
+            If the current page is already in view (e.g. after zooming), the relative position
+            within the page is kept.
+        """
+        position = 0.0
+
+        if self.page_layout is not None:
+            tops, _, heights = self.page_layout
+            position = (self.pdf_canvas.canvasy(0) - tops[self.current_page]) / heights[self.current_page]
+
+            if not 0 <= position < 1:
+                position = 0.0      # another page was selected; show it from the top
+
+        self.release_pages()
+        self.page_layout = tops, widths, heights = self.compute_page_layout()
+        self.layout_zoom = self.pdf_zoom
+        total_width = max(widths) + UI_CONFIG['PAGE_GAP'] * 2
+        total_height = tops[-1] + heights[-1] + UI_CONFIG['PAGE_GAP']
+
+        self.pdf_canvas.config(scrollregion=(0, 0, total_width, total_height))
+        self.pdf_canvas.yview_moveto((tops[self.current_page] + position * heights[self.current_page]) / total_height)
+        self.update_visible_pages()
+
+    def release_pages(self) -> None:
+        """
+            Hide all pages laid out in continuous mode and keep their items and photo images for reuse.
+        """
+        for page_index in list(self.drawn_pages):
+            self.release_page(page_index)
+
+    def release_page(self, page_index: int) -> None:
+        """
+            Hide a page laid out in continuous mode and keep its items and photo image for reuse.
+
+            Args:
+                page_index (int): Zero-based page index.
+        """
+        placeholder, item, photo = self.drawn_pages.pop(page_index)
+        self.rendered_pages.discard(page_index)
+        self.pdf_canvas.itemconfigure(placeholder, state=tk.HIDDEN)
+        self.pdf_canvas.itemconfigure(item, state=tk.HIDDEN)
+        photo.configure(width=1, height=1)     # release the pixel data of off-screen pages
+        self.spare_pages.append((placeholder, item, photo))
+
+    def update_visible_pages(self) -> None:
+        """
+            Show the pages intersecting the view (plus `UI_CONFIG['CONTINUOUS_MARGIN']`) in continuous mode.
+
+            Cached pages are drawn immediately; the others get a white placeholder and are rendered
+            on the prefetch worker. Pages outside the range are released, so memory usage does not
+            grow with the number of pages. The page at the center of the view becomes the current page.
+        """
+        if not self.current_pdf or self.page_layout is None or self.layout_zoom != self.pdf_zoom:
+            return      # the layout is updated by the pending sharp render after zooming
+
+        tops, widths, heights = self.page_layout
+        margin = UI_CONFIG['CONTINUOUS_MARGIN']
+        view_top = self.pdf_canvas.canvasy(0)
+        view_bottom = view_top + self.pdf_canvas.winfo_height()
+
+        first = max(0, bisect_right(tops, view_top - margin) - 1)
+        last = max(0, bisect_right(tops, view_bottom + margin) - 1)
+        visible = range(first, last + 1)
+
+        for page_index in [page_index for page_index in self.drawn_pages if page_index not in visible]:
+            self.release_page(page_index)
+
+        total_width = max(widths) + UI_CONFIG['PAGE_GAP'] * 2
+        missing = []
+
+        for page_index in visible:
+            if page_index not in self.drawn_pages:
+                if self.spare_pages:
+                    placeholder, item, photo = self.spare_pages.pop()
+                else:
+                    photo = tk.PhotoImage()
+                    placeholder = self.pdf_canvas.create_rectangle(0, 0, 0, 0, fill='white', outline='')
+                    item = self.pdf_canvas.create_image(0, 0, anchor=tk.NW, image=photo, state=tk.HIDDEN)
+
+                x = (total_width - widths[page_index]) // 2
+                self.pdf_canvas.coords(placeholder, x, tops[page_index], x + widths[page_index], tops[page_index] + heights[page_index])
+                self.pdf_canvas.coords(item, x, tops[page_index])
+                self.pdf_canvas.itemconfigure(placeholder, state=tk.NORMAL)
+                self.drawn_pages[page_index] = (placeholder, item, photo)
+
+            if page_index not in self.rendered_pages:
+                key = RenderCache.make_key(self.current_pdf_key, page_index, self.pdf_zoom)
+                image = self.render_cache.get(key)
+
+                if image is None:
+                    missing.append((page_index, self.pdf_zoom))
+                else:
+                    self.draw_continuous_page(page_index, *image)
+
+        self.prefetcher.request(self.current_pdf.name, self.current_pdf_key, missing, self.render_cache.__contains__)
+        self.draw_highlights()
+
+        # the page at the center of the view is the current page
+        current_page = max(0, bisect_right(tops, (view_top + view_bottom) / 2) - 1)
+
+        if current_page != self.current_page:
+            self.current_page = current_page
+            self.update_page_controls()
+            self.thumbnail_sidebar.set_current_page(current_page)
+
+    def draw_continuous_page(self, page_index: int, width: int, height: int, data: bytes) -> None:
+        """
+            Show a rendered page in continuous mode, replacing its placeholder.
+
+            Args:
+                page_index (int): Zero-based page index.
+                width      (int): Image width in pixels.
+                height     (int): Image height in pixels.
+                data     (bytes): PPM data.
+        """
+        placeholder, item, photo = self.drawn_pages[page_index]
+        photo.configure(width=width, height=height, data=data, format='ppm')
+        self.pdf_canvas.itemconfigure(item, state=tk.NORMAL)
+        self.pdf_canvas.itemconfigure(placeholder, state=tk.HIDDEN)
+        self.rendered_pages.add(page_index)
+
+    def search(self) -> None:
+        """
+            Search the text of all workspace documents and list the matching pages.
+
+            Documents still being indexed are searched as far as they are indexed,
+            which is shown next to the number of results, as are documents that could not be indexed.
+        """
+        self.search_query = self.search_var.get().strip()
+        self.search_results = []
+        self.highlight_rects = {}
+        self.search_result_list.delete(0, tk.END)
+
+        if not self.search_query or self.search_indexer is None:
+            self.search_status['text'] = ''
+            self.draw_highlights()
+
+            return
+
+        lines = []
+        indexing = False
+        failed = 0
+
+        for document in self.documents:
+            if self.search_indexer.is_failed(document.key):
+                failed += 1
+
+                continue
+
+            index = self.search_indexer.get(document.key)
+            indexing = indexing or not self.search_indexer.is_complete(document.key)
+
+            if index is None:
+                continue
+
+            for page_index, count in index.search(self.search_query):
+                self.search_results.append((document, page_index))
+                lines.append(f'{document.title}  {page_index + 1} ページ ({count} 件)')
+
+        self.search_result_list.insert(tk.END, *lines)
+        self.search_status['text'] = f'{len(lines)} ページ' + (' (索引作成中)' if indexing else '') + (f' ({failed} 件の PDF は検索できません)' if failed else '')
+        self.draw_highlights()
+
+    def show_search_result(self) -> None:
+        """
+            Display the page of the selected search result.
+        """
+        selection = self.search_result_list.curselection()
+
+        if not selection:
+            return
+
+        document, page_index = self.search_results[selection[0]]
+
+        if document not in self.documents:
+            return      # closed since the search
+
+        if document is self.current_document:
+            self.go_to_page(page_index)
+        else:
+            document.page = page_index
+            self.switch_document(self.documents.index(document))
+
+    def draw_highlights(self) -> None:
+        """
+            Outline the hits of the last search on the displayed pages.
+
+            Hit positions are located once per page and query.
+        """
+        self.pdf_canvas.delete('highlight')
+
+        if not self.search_query or not self.current_pdf:
+            return
+
+        zoom = self.pdf_zoom
+
+        if self.continuous_var.get() and self.page_layout is not None:
+            tops, widths, _ = self.page_layout
+            total_width = max(widths) + UI_CONFIG['PAGE_GAP'] * 2
+            pages = [(page_index, (total_width - widths[page_index]) // 2, tops[page_index]) for page_index in self.drawn_pages]
+        else:
+            pages = [(self.current_page, 0, 0)]
+
+        for page_index, x, y in pages:
+            key = (self.current_pdf_key, page_index)
+            rects = self.highlight_rects.get(key)
+
+            if rects is None:
+                rects = self.highlight_rects[key] = find_hit_rects(self.current_pdf[page_index], self.search_query)
+
+            for rect in rects:
+                self.pdf_canvas.create_rectangle(x + rect.x0 * zoom, y + rect.y0 * zoom, x + rect.x1 * zoom, y + rect.y1 * zoom, outline='red', width=2, tags='highlight')
+
+    def get_render(self, key: Hashable, render: Callable[[], Tuple[int, int, bytes]]) -> Tuple[int, int, bytes]:
+        """
+            Return a rendered page or tile from the memory cache, the disk cache, or by rendering it.
+
+            New renders are stored in both caches.
+
+            Args:
+                key                                   (Hashable): Render cache key.
+                render (Callable[[], Tuple[int, int, bytes]]): Renders the page or tile on a cache miss.
+
+            Returns:
+                Tuple[int, int, bytes]: (width, height, PPM data).
+        """
+        image = self.render_cache.get(key)
+
+        if image is None:
+            image = self.disk_cache.get(key)
+
+            if image is None:
+                image = render()
+                self.disk_cache.put(key, image)
+
+            self.render_cache.put(key, image, len(image[2]))
+
+        return image
+
+    def show_page_image(self, x: int, y: int, width: int, height: int, data: bytes) -> None:
+        """
+            Blit PPM data into the reused page photo image.
+
+            The canvas item and photo image are created once and only updated here,
+            so redraws neither go through PIL nor recreate canvas items.
+
+            Args:
+                x       (int): Canvas x coordinate of the top-left corner.
+                y       (int): Canvas y coordinate of the top-left corner.
+                width   (int): Image width in pixels.
+                height  (int): Image height in pixels.
+                data  (bytes): PPM data.
+        """
+        self.release_tiles()
+        self.page_photo.configure(width=width, height=height, data=data, format='ppm')
+        self.pdf_canvas.coords(self.page_item, x, y)
+        self.pdf_canvas.itemconfigure(self.page_item, state=tk.NORMAL)
+
+    def release_tiles(self) -> None:
+        """
+            Hide all tiles on the canvas and keep their items and photo images for reuse.
+        """
+        for item, photo in self.drawn_tiles.values():
+            self.pdf_canvas.itemconfigure(item, state=tk.HIDDEN)
+            self.spare_tiles.append((item, photo))
+
+        self.drawn_tiles = {}
+
+    def schedule_tile_update(self) -> None:
+        """
+            Update the visible tiles (or pages in continuous mode) once the pending events have been processed.
+
+            Coalesces bursts of scroll and resize events into a single update.
+        """
+        if not self.tile_update_pending:
+            self.tile_update_pending = True
+            self.root.after_idle(self.update_visible_tiles)
+
+    def update_visible_tiles(self) -> None:
+        """
+            Render the tiles covering the visible canvas region.
+
+            Each tile is rendered with a MuPDF clip rectangle and cached in the render cache.
+            Tiles scrolled out of view are hidden and their canvas items reused for new tiles.
+        """
+        self.tile_update_pending = False
+
+        if self.continuous_var.get():
+            self.update_visible_pages()
+
+            return
+
+        if not self.current_pdf or self.pdf_zoom < UI_CONFIG['TILE_MIN_ZOOM']:
+            return
+
+        import fitz
+
+        from pdf_render import render_ppm
+
+        page = self.current_pdf[self.current_page]
+        zoom = self.pdf_zoom
+        tile = UI_CONFIG['TILE_SIZE']
+        width, height = int(page.rect.width * zoom), int(page.rect.height * zoom)
+
+        # tile range covering the visible region
+        left = max(0, int(self.pdf_canvas.canvasx(0)) // tile)
+        top = max(0, int(self.pdf_canvas.canvasy(0)) // tile)
+        right = min((width - 1) // tile, int(self.pdf_canvas.canvasx(self.pdf_canvas.winfo_width())) // tile)
+        bottom = min((height - 1) // tile, int(self.pdf_canvas.canvasy(self.pdf_canvas.winfo_height())) // tile)
+        visible = {(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)}
+
+        for position in set(self.drawn_tiles) - visible:
+            item, photo = self.drawn_tiles.pop(position)
+            self.pdf_canvas.itemconfigure(item, state=tk.HIDDEN)
+            self.spare_tiles.append((item, photo))
+
+        for column, row in visible - set(self.drawn_tiles):
+            key = RenderCache.make_key(self.current_pdf_key, self.current_page, zoom) + (column, row)
+            x0, y0 = column * tile, row * tile
+            x1, y1 = min(x0 + tile, width), min(y0 + tile, height)
+            clip = fitz.Rect(x0 / zoom, y0 / zoom, x1 / zoom, y1 / zoom)
+
+            with PROFILER.section('display_page.render'):
+                image = self.get_render(key, lambda: render_ppm(page, zoom, clip))
+
+            if self.spare_tiles:
+                item, photo = self.spare_tiles.pop()
+            else:
+                photo = tk.PhotoImage()
+                item = self.pdf_canvas.create_image(0, 0, anchor=tk.NW, image=photo)
+
+            tile_width, tile_height, data = image
+
+            with PROFILER.section('display_page.blit'):
+                photo.configure(width=tile_width, height=tile_height, data=data, format='ppm')
+
+            self.pdf_canvas.coords(item, column * tile, row * tile)
+            self.pdf_canvas.itemconfigure(item, state=tk.NORMAL)
+            self.drawn_tiles[(column, row)] = (item, photo)
+
+        self.pdf_canvas.tag_raise('highlight')     # keep search hits above newly created tiles
+
+    def scroll_pdf(self, orient: str, *args) -> None:
+        """
+            Scroll the PDF canvas and render the tiles that come into view.
+
+            Args:
+                orient (str): `tk.HORIZONTAL` or `tk.VERTICAL`.
+                *args       : Arguments for `Canvas.xview` / `Canvas.yview` (e.g. 'scroll', 1, 'units').
+        """
+        if orient == tk.HORIZONTAL:
+            self.pdf_canvas.xview(*args)
+        else:
+            self.pdf_canvas.yview(*args)
+
+        self.schedule_tile_update()
+
+    def handle_mouse_wheel(self, event: tk.Event) -> None:
+        """
+            Pan the PDF canvas with the mouse wheel.
+
+            Scrolls vertically, or horizontally while the Shift key is held.
+
+            Args:
+                event (tk.Event): Mouse wheel event (`<MouseWheel>` or `<Button-4>`/`<Button-5>` on Linux)
+        """
+        if event.num == 4 or event.delta > 0:
+            units = -1
+        else:
+            units = 1
+
+        orient = tk.HORIZONTAL if event.state & 0x0001 else tk.VERTICAL     # 0x0001: Shift
+        self.scroll_pdf(orient, 'scroll', units, 'units')
+
+    def handle_mouse_wheel_zoom(self, event: tk.Event) -> None:
+        """
+            Zoom the PDF page with Ctrl + mouse wheel.
+
+            Args:
+                event (tk.Event): Mouse wheel event (`<MouseWheel>` or `<Button-4>`/`<Button-5>` on Linux)
+        """
+        if event.num == 4 or event.delta > 0:
+            self.zoom_in()
+        else:
+            self.zoom_out()
+
+    def on_page_prefetched(self, key: Hashable, width: int, height: int, data: bytes) -> None:
+        """
+            Store a page rendered in background in the render cache.
+
+            In continuous mode the page is also drawn if it is in view.
+            Renders for another document or zoom level are discarded.
+
+            Args:
+                key (Hashable): Cache key of the rendered page.
+                width    (int): Width of the rendered page in pixels.
+                height   (int): Height of the rendered page in pixels.
+                data   (bytes): PPM data of the rendered page.
+        """
+        if not self.current_pdf or key != RenderCache.make_key(self.current_pdf_key, key[1], self.pdf_zoom):
+            return
+
+        if key not in self.render_cache:
+            self.render_cache.put(key, (width, height, data), len(data))
+
+        if key[1] in self.drawn_pages and key[1] not in self.rendered_pages:
+            self.draw_continuous_page(key[1], width, height, data)
+
+    @profiled('go_to_page')
+    def go_to_page(self, page_index: int) -> None:
+        """
+            Jump to a page, e.g. from the thumbnail sidebar, with a single render.
+
+            Args:
+                page_index (int): Zero-based page index.
+        """
+        if not self.current_pdf or page_index == self.current_page:
+            return
+
+        self.current_page = page_index
+        self.update_page_controls()
+        self.display_page()
+
+    @profiled('prev_page')
+    def prev_page(self) -> None:
+        """
+            Navigate to the previous page in the PDF viewer.
+
+            Moves back one page if not on the first page and updates corresponding button states.
+        """
+        if self.current_page > 0:
+            self.current_page -= 1
+            self.display_page()
+
+            self.page_label['text'] = f'{self.current_page + 1} / {len(self.current_pdf)} ページ'
+            self.next_page_button['state'] = tk.NORMAL
+
+            if self.current_page == 0:
+                self.prev_page_button['state'] = tk.DISABLED
+
+    @profiled('next_page')
+    def next_page(self) -> None:
+        """
+            Navigate to the next page in the PDF viewer.
+
+            Moves forward one page if not one the last page and updates corresponding button states.
+        """
+        if self.current_page < len (self.current_pdf) - 1:
+            self.current_page += 1
+            self.display_page()
+
+            self.page_label['text'] = f'{self.current_page + 1} / {len(self.current_pdf)} ページ'
+            self.prev_page_button['state'] = tk.NORMAL
+
+            if self.current_page == len(self.current_pdf) - 1:
+                self.next_page_button['state'] = tk.DISABLED
+
+    @profiled('zoom_in')
+    def zoom_in(self) -> None:
+        """
+            Zoom in one th PDF page.
+
+            Enlarges the page up to the configured maximum zoom level and redraws the page.
+        """
+        if self.pdf_zoom * UI_CONFIG['ZOOM_FACTOR'] <= UI_CONFIG['MAX_ZOOM']:
+            self.request_zoom(self.pdf_zoom * UI_CONFIG['ZOOM_FACTOR'])
+
+    @profiled('zoom_out')
+    def zoom_out(self) -> None:
+        """
+            Zoom out of the PDF page.
+
+            Reduces the page down to the configured minimum zoom level and redraws the page.
+        """
+        if self.pdf_zoom / UI_CONFIG['ZOOM_FACTOR'] >= UI_CONFIG['MIN_ZOOM']:
+            self.request_zoom(self.pdf_zoom / UI_CONFIG['ZOOM_FACTOR'])
+
+    def request_zoom(self, zoom: float) -> None:
+        """
+            Change the zoom level progressively.
+
+            A preview is shown immediately and the sharp render is scheduled after
+            `UI_CONFIG['ZOOM_DEBOUNCE_MS']`; further zoom requests in the meantime cancel it,
+            so only the final zoom level is rendered at full quality.
+
+            Args:
+                zoom (float): New zoom level.
+        """
+        self.pdf_zoom = zoom
+        self.update_zoom_display()
+
+        if not self.current_pdf:
+            return
+
+        self.prefetcher.reset()     # neighbours at the previous zoom level are no longer needed
+        self.pdf_canvas.delete('highlight')
+
+        if self.zoom_job is not None:
+            self.root.after_cancel(self.zoom_job)
+
+        if not self.continuous_var.get():
+            self.show_zoom_preview()    # continuous mode keeps the previous renders until the sharp render
+
+        self.zoom_job = self.root.after(UI_CONFIG['ZOOM_DEBOUNCE_MS'], self.display_page)
+
+    def show_zoom_preview(self) -> None:
+        """
+            Show the current page at the current zoom level without a full render.
+
+            Shows the cached page if it has already been rendered at this zoom level.
+            Otherwise a low-resolution render (`UI_CONFIG['PREVIEW_ZOOM']`, cached) is scaled up,
+            and only for the visible region, so the cost does not grow with the zoom level.
+        """
+        zoom = self.pdf_zoom
+
+        if zoom < UI_CONFIG['TILE_MIN_ZOOM'] and RenderCache.make_key(self.current_pdf_key, self.current_page, zoom) in self.render_cache:
+            self.display_page()
+
+            return
+
+        from PIL import Image
+
+        from pdf_render import ppm_from_rgb, render_ppm
+
+        page = self.current_pdf[self.current_page]
+        preview_zoom = min(zoom, UI_CONFIG['PREVIEW_ZOOM'])
+        key = RenderCache.make_key(self.current_pdf_key, self.current_page, preview_zoom) + ('preview',)
+        preview = self.render_cache.get(key)
+
+        if preview is None:
+            preview_width, preview_height, data = render_ppm(page, preview_zoom)
+            preview = Image.frombytes('RGB', (preview_width, preview_height), data[-preview_width * preview_height * 3:])   # skip the PPM header
+            self.render_cache.put(key, preview, len(data))
+
+        width, height = int(page.rect.width * zoom), int(page.rect.height * zoom)
+
+        self.release_tiles()
+        self.pdf_canvas.config(scrollregion=(0, 0, width, height))
+
+        # visible region in pixels of the target zoom level
+        x0, y0 = max(0, int(self.pdf_canvas.canvasx(0))), max(0, int(self.pdf_canvas.canvasy(0)))
+        x1, y1 = min(width, x0 + self.pdf_canvas.winfo_width()), min(height, y0 + self.pdf_canvas.winfo_height())
+
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        scale = preview.width / width
+        region = preview.resize((x1 - x0, y1 - y0), Image.Resampling.BILINEAR, box=(x0 * scale, y0 * scale, x1 * scale, y1 * scale))
+
+        self.show_page_image(x0, y0, region.width, region.height, ppm_from_rgb(region.width, region.height, region.tobytes()))
+
+    def update_zoom_display(self) -> None:
+        """
+            Update the zoom level display label.
+
+            Updates and displays the zoom percentage in the label.
+        """
+        zoom_percentage = int(self.pdf_zoom * 100)
+        self.zoom_label['text'] = f'{zoom_percentage} %'
+
+    def toggle_profile_overlay(self) -> None:
+        """
+            Show or hide the profiler overlay.
+
+            The profiler records timings only while the overlay is shown; the samples are kept
+            when it is hidden, so they can still be exported.
+        """
+        if self.profile_overlay is not None:
+            self.root.after_cancel(self.profile_job)
+            self.profile_overlay.destroy()
+            self.profile_overlay = None
+            PROFILER.enabled = False
+
+            return
+
+        PROFILER.enabled = True
+        self.profile_overlay = tk.Label(self.root, font='TkFixedFont', justify=tk.LEFT, anchor=tk.NW, background='black', foreground='white', padx=6, pady=4)
+        self.profile_overlay.place(relx=1.0, x=-10, y=10, anchor=tk.NE)
+        self.update_profile_overlay()
+
+    def update_profile_overlay(self) -> None:
+        """
+            Refresh the overlay with the timings of the recent samples, every `UI_CONFIG['PROFILE_OVERLAY_MS']`.
+        """
+        lines = [LABEL_TEXTS['PROFILE_OVERLAY'], f'{"":24s} {"count":>6s} {"p50":>8s} {"p90":>8s} {"p99":>8s} {"max":>8s} (ms)']
+
+        for name, summary in PROFILER.summaries().items():
+            lines.append(f'{name:24s} {summary["count"]:6d} {summary["p50_ms"]:8.1f} {summary["p90_ms"]:8.1f} {summary["p99_ms"]:8.1f} {summary["max_ms"]:8.1f}')
+
+        self.profile_overlay['text'] = '\n'.join(lines)
+        self.profile_overlay.lift()
+        self.profile_job = self.root.after(UI_CONFIG['PROFILE_OVERLAY_MS'], self.update_profile_overlay)
+
+    def export_profile(self) -> None:
+        """
+            Save the profiler timings as JSON or CSV, chosen by the file extension.
+        """
+        path = filedialog.asksaveasfilename(defaultextension='.json', filetypes=[('JSON', '*.json'), ('CSV', '*.csv')])
+
+        if not path:
+            return
+
+        try:
+            PROFILER.export(path)
+        except OSError:
+            messagebox.showerror('Error', ERROR_MESSAGES['PROFILE_EXPORT_ERROR'])
+
+    def format_currency(self, amount: Union[int, float]) -> str:
+        """
+            Format the given amount as currency with thousands separator.
+
+            Args:
+                amount (Union[int, float]): The monetary amount to format.
+
+            Returns:
+                str: Formatted currency string without currency symbol.
+        """
+        try:
+            return locale.currency(amount, grouping=True, symbol=False)
+        except ValueError:
+            return f'{amount:,.0f}'     # no monetary locale (e.g. the Japanese locale is not installed)
+
+    def validate_entry(self, text: str) -> bool:
+        """
+            Validate user input to allow only numeric characters, commas, and spaces.
+
+            Args:
+                text (str): input text to validatetest (str): The input text to validate.
+
+            Returns:
+                bool: True if input is valid, False otherwise.
+        """
+        return re.fullmatch(r'[\d, \s]*', text) is not None
+
+    def clean_input(self, text: str) -> int:
+        """
+            Convert an entry text into an amount, ignoring commas and spaces.
+
+            Args:
+                text (str): The entry text.
+
+            Returns:
+                int: The amount; 0 if the text has no digits.
+        """
+        return int(re.sub(r'[^\d]', '', text) or 0)
+
+    def calculate_income(self, monthly_salaries: Union[int, List[int]], bonus1: int = 0, bonus2: int = 0, year: Optional[int] = None) -> Tuple[int, int]:
+        """
+            Calculate yearly income and employment income deduction.
+
+            Supports both single monthly salary and monthly variations.
+            Delegates to `income.calculate_income`, which uses the income rules of the tax year.
+
+            Args:
+                monthly_salaries (Union[int, List[int]]): Monthly salary amount or list of monthly salaries.
+                bonus1                   (int, optional): First bonus amount. Defaults to 0.
+                bonus2                   (int, optional): Second bonus amount. Defaults to 0.
+                year           (Optional[int], optional): Tax year. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+            Returns:
+                Tuple[int, int]: A tuple containing (yearly salary, income after deduction).
+        """
+        return calculate_income(monthly_salaries, bonus1, bonus2, year)
+
+    @profiled('calculate')
+    def calculate(self) -> None:
+        """
+            Calculate yearly salary and income amount from salary and bonuses.
+
+            Cleans up input values and performs calculation based on the selected input mode.
+            Displays results in labels and shows an error message for invalid inputs.
+        """
+        try:
+            clean_input = self.clean_input
+
+            # get bonus values
+            bonus1 = clean_input(self.bonus1_var.get())
+            bonus2 = clean_input(self.bonus2_var.get())
+
+            # determine salary calcuation mode
+            if self.salary_mode.get() == 'single':
+                monthly = clean_input(self.monthly_var.get())
+                total, income = self.calculate_income(monthly, bonus1, bonus2)
+            elif self.salary_mode.get() == 'yearly':
+                yearly = clean_input(self.yearly_var.get())
+                total, income = self.calculate_income([yearly], bonus1, bonus2)
+            else:
+                monthly_salaries = [clean_input(salary.get()) for salary in self.monthly_salaries]
+                total, income = self.calculate_income(monthly_salaries, bonus1, bonus2)
+
+            # display results
+            self.show_results((total, income))
+        except ValueError:
+            # show error for invalid input
+            messagebox.showerror('Error', ERROR_MESSAGES['INVALID_INPUT'])
+
+    def open_planning_window(self) -> None:
+        """
+            Show the window for the inverse calculation and the salary / bonus sweep.
+        """
+        if self.planning_window is None or not self.planning_window.window.winfo_exists():
+            from planning import PlanningWindow
+            self.planning_window = PlanningWindow(self.root, self.format_currency)
+
+        self.planning_window.window.deiconify()
+        self.planning_window.window.lift()
+
+    def open_roster_window(self) -> None:
+        """
+            Show the employee roster window.
+        """
+        if self.roster_window is None or not self.roster_window.window.winfo_exists():
+            from roster import RosterWindow
+            self.roster_window = RosterWindow(self.root, self.format_currency)
+
+        self.roster_window.window.deiconify()
+        self.roster_window.window.lift()
+
+    def clear(self) -> None:
+        """
+            Clear all input fields and result labels.
+
+            Resets monthly salary, bonus input fields, and result labels to empty state.
+        """
+        self.monthly_var.set('')
+
+        for monthly_var in self.monthly_salaries:
+            monthly_var.set('')
+
+        self.yearly_var.set('')
+        self.bonus1_var.set('')
+        self.bonus2_var.set('')
+        self.show_results(None)
+
+def write_startup_probe(root: tk.Tk, path: str) -> None:
+    """
+        Record the time the first window became visible and quit, for the startup timing harness.
+
+        Writes a JSON object with the wall-clock time (`time.time()`) and the heavy modules already imported.
+
+        Args:
+            root (tk.Tk): The main application window.
+            path   (str): Output JSON file.
+    """
+    root.wait_visibility(root)
+    shown = time.time()
+    modules = sorted(name for name in ('fitz', 'PIL', 'tkinterdnd2', 'numpy') if name in sys.modules)
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'shown': shown, 'modules': modules}, f)
+
+    root.destroy()
+
+def main() -> None:
+    """
+        Initialize and run the tax calculator application.
+
+        Sets the Japanese locale for currency formatting if it is installed, creates the main
+        Tkinter window and starts the application event loop.
+    """
+    try:
+        locale.setlocale(locale.LC_ALL, 'ja_JP.UTF-8')
+    except locale.Error:
+        pass        # amounts are formatted without the locale, see `format_currency`
+
+    root = tk.Tk()
+    app = TaxCalculator(root)
+
+    probe = os.environ.get(UI_CONFIG['STARTUP_PROBE_ENV'])
+
+    if probe:
+        root.after_idle(write_startup_probe, root, probe)
+
+    root.mainloop()
+
+if __name__ == '__main__':
+    main()
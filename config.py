@@ -15,13 +15,143 @@ INCOME_RULES: List[Tuple[float, Callable[[int], int]]] = [
     (float('inf'), lambda s: s - 1_950_000)
 ]
 
+# Year-versioned income rule sets, loaded by `income.get_income_table`
+# rules/<effective year>.json applies from that year until the next file
+RULES_CONFIG: Dict[str, Union[str, int]] = {
+    'DIRECTORY': 'rules',
+    'DEFAULT_YEAR': 2024
+}
+
 # UI configuration constants
-UI_CONFIG: Dict[str, Union[str, float]] = {
+UI_CONFIG: Dict[str, Union[str, int, float]] = {
     'APP_TITLE': '年末調整計算ツール',
     'PDF_VIEWER_TITLE': 'PDF ビューワー',
     'MAX_ZOOM': 3.0,
     'MIN_ZOOM': 0.25,
-    'ZOOM_FACTOR': 1.2
+    'ZOOM_FACTOR': 1.2,
+    'RENDER_CACHE_BYTES': 256 * 1024 * 1024,    # memory budget of rendered pages
+    'PREFETCH_DISTANCE': 2,                     # pages before and after the current page rendered in background
+    'PREFETCH_POLL_MS': 30,                     # interval for collecting background renders
+    'TILE_MIN_ZOOM': 1.5,                       # zoom level from which only visible tiles are rendered
+    'TILE_SIZE': 512,                           # tile edge in pixels
+    'SCROLL_STEP': 60,                          # pixels per scroll unit
+    'PREVIEW_ZOOM': 0.5,                        # zoom level of the low-resolution preview while zooming
+    'ZOOM_DEBOUNCE_MS': 250,                    # delay before the sharp render after the last zoom request
+    'STARTUP_PROBE_ENV': 'TAX_TOOL_STARTUP_PROBE', # environment variable read by the startup timing harness
+    'DISK_CACHE_DIRECTORY': '',                 # on-disk render cache; empty for the per-user cache directory
+    'DISK_CACHE_BYTES': 1024 * 1024 * 1024,     # size cap of the on-disk render cache
+    'DOCUMENT_POOL_SIZE': 4,                    # PDF documents kept open at once; others are reopened on demand
+    'THUMBNAIL_WIDTH': 120,                     # thumbnail box in the page sidebar, in pixels
+    'THUMBNAIL_HEIGHT': 160,
+    'THUMBNAIL_PADDING': 8,
+    'PAGE_GAP': 10,                             # space between pages in continuous mode, in pixels
+    'CONTINUOUS_MARGIN': 400,                   # pixels above and below the view rendered ahead in continuous mode
+    'SEARCH_NGRAM': 2,                          # n-gram length of the full-text search index
+    'SEARCH_INDEX_DIRECTORY': '',               # saved search indexes; empty for the per-user cache directory
+    'SEARCH_RESULT_ROWS': 4,                    # visible rows of the search result list
+    'PROFILE_ENV': 'TAX_TOOL_PROFILE',          # environment variable enabling the profiler from startup
+    'PROFILE_WINDOW': 1000,                     # recent samples kept per profiled operation
+    'PROFILE_OVERLAY_MS': 500,                  # refresh interval of the profiler overlay
+    'PLANNING_TITLE': '逆算・試算',
+    'INVERSE_TITLE': '給与所得金額から年間給与を逆算',
+    'SWEEP_TITLE': '年間給与と賞与の試算',
+    'SWEEP_TABLE_TITLE': '表',
+    'SWEEP_CHART_TITLE': 'グラフ',
+    'SWEEP_SALARY_RANGE': (2_000_000, 10_000_000, 1_000),  # default (start, stop, step) of the salary axis
+    'SWEEP_BONUS_RANGE': (0, 2_000_000, 500_000),          # default (start, stop, step) of the bonus axis
+    'SWEEP_MAX_BONUSES': 12,                    # bonus amounts per sweep (table columns and chart lines)
+    'SWEEP_MAX_POINTS': 10_000_000,             # salary x bonus points per sweep
+    'SWEEP_TABLE_ROWS': 500,                    # rows shown in the sweep table; larger grids are thinned out
+    'SWEEP_COLORS': ['royal blue', 'red', 'forest green', 'dark orange', 'purple', 'brown'],
+    'ROSTER_TITLE': '名簿',
+    'ROSTER_ROW_HEIGHT': 22,                    # pixels per roster row
+    'ROSTER_COLUMN_WIDTH': 100,                 # pixels per roster column
+    'ROSTER_NAME_COLUMN': '氏名'                # CSV column shown next to the row number, if present
+}
+
+# Batch (headless CSV) configuration constants
+BATCH_CONFIG: Dict[str, Union[str, int, List[str]]] = {
+    'CHUNK_SIZE': 10_000,
+    'MAX_AMOUNT': 10 ** 15,                     # largest amount of a cell; the sums of a row stay within int64
+    'ENCODING': 'utf-8-sig',
+    'MONTHLY_COLUMNS': [f'{month}月' for month in range(1, 13)],
+    'SINGLE_COLUMN': '月額給与',
+    'BONUS1_COLUMN': '賞与1',
+    'BONUS2_COLUMN': '賞与2',
+    'TOTAL_YEARLY_SALARY_COLUMN': '年間給与金額',
+    'INCOME_AMOUNT_COLUMN': '給与所得金額',
+    'YEAR_COLUMN': '年分'
+}
+
+# Benchmark suite constants (bench.py suite)
+BENCH_CONFIG: Dict[str, Union[str, int, float]] = {
+    'REPEAT': 5,                                # measurements per case; the fastest one is compared
+    'SALARIES': 1_000_000,                      # yearly salaries for the income cases
+    'ROWS': 100_000,                            # CSV rows for the batch case
+    'PAGES': 20,                                # pages of the synthetic PDF
+    'THRESHOLD': 0.2,                           # allowed slowdown against the baseline (0.2 = 20 %)
+    'OUTPUT': 'bench_results.json',
+    'BASELINE': 'bench_baseline.json'
+}
+
+# Year-end adjustment CSV columns (python main.py adjust), by column of `adjustment.YearEndAdjustment`
+ADJUSTMENT_CONFIG: Dict[str, Union[int, Dict[str, str]]] = {
+    'MAX_DEPENDENTS': 99,                       # largest number of dependents of each kind; amounts are limited by BATCH_CONFIG['MAX_AMOUNT']
+    'INPUT_COLUMNS': {
+        'yearly_salary': '年間給与金額',
+        'withheld_tax': '源泉徴収税額',
+        'social_insurance': '社会保険料等',
+        'other_deductions': 'その他の所得控除',
+        'dependents': '一般扶養親族',
+        'specific_dependents': '特定扶養親族',
+        'elderly_dependents': '老人扶養親族',
+        'housing_loan_credit': '住宅借入金等特別控除'
+    },
+    'OUTPUT_COLUMNS': {
+        'income': '給与所得金額',
+        'basic_deduction': '基礎控除',
+        'dependent_deduction': '扶養控除',
+        'total_deduction': '所得控除合計',
+        'taxable_income': '課税給与所得金額',
+        'computed_tax': '算出所得税額',
+        'annual_tax': '年調年税額',
+        'settlement': '過不足額'
+    }
+}
+
+# HTTP/JSON service constants (python main.py serve)
+SERVER_CONFIG: Dict[str, Union[str, int]] = {
+    'HOST': '127.0.0.1',                        # local only by default
+    'PORT': 8080,
+    'MAX_HEADER_BYTES': 16 * 1024,              # request line and headers
+    'MAX_BODY_BYTES': 16 * 1024 * 1024,         # request body
+    'MAX_BATCH': 100_000,                       # items per batch request
+    'MAX_YEAR': 9999,                           # latest tax year accepted in requests
+    'METRICS_WINDOW': 10_000                    # recent requests per endpoint for the latency percentiles
+}
+
+# Withholding slip extraction constants
+# Fields are located by their label; AREA is (left, top, right, bottom) in points relative to the top-left corner of the label
+EXTRACT_CONFIG: Dict[str, Union[int, str, Dict]] = {
+    'WORKERS': 0,                               # processes for bulk extraction; 0 for the number of CPUs
+    'FORM_FILL_PAGES': 3,                       # leading pages searched for a slip when a single PDF is dropped on the viewer
+    'TEMPLATES': {
+        '源泉徴収票': {
+            'MATCH': '源泉徴収票',
+            'FIELDS': {
+                'YEARLY_SALARY': {'LABEL': '支払金額', 'AREA': (-10, 12, 90, 45)}
+            }
+        }
+    },
+    'FIELD_COLUMNS': {
+        'YEARLY_SALARY': '支払金額',
+        'MONTHLY_SALARY': '月額給与',
+        'BONUS1': '賞与1',
+        'BONUS2': '賞与2'
+    },
+    'FILE_COLUMN': 'ファイル',
+    'PAGE_COLUMN': 'ページ',
+    'TEMPLATE_COLUMN': '様式'
 }
 
 # Error message difinitions
@@ -30,22 +160,51 @@ ERROR_MESSAGES: Dict[str, str] = {
     'PERMISSION_DENIED': 'PDF ファイルにアクセスする権限がありません',
     'INVALID_INPUT': '数値を正しく入力してください (例: 250000)',
     'PDF_DROP_ERROR': 'PDF ファイルをドロップしてください',
-    'UNEXPECTED_EROOR': 'PDF ファイルを読み込むときに予期せぬエラーが発生しました'
+    'UNEXPECTED_ERROR': 'PDF ファイルを読み込むときに予期せぬエラーが発生しました',
+    'CSV_NO_SALARY_COLUMNS': 'CSV に月額給与の列 (1月〜12月 または 月額給与) がありません',
+    'CSV_INVALID_VALUE': 'CSV の数値が正しくありません',
+    'INVALID_INCOME_RULES': '給与所得の計算ルールが正しくありません',
+    'NO_INCOME_RULES': '指定された年分の給与所得の計算ルールがありません',
+    'INVALID_ADJUSTMENT_RULES': '年末調整の控除額・税率の表が正しくありません',
+    'INVALID_ADJUSTMENT_COLUMNS': '年末調整の入力項目が正しくありません',
+    'INVALID_ADJUSTMENT_VALUE': '年末調整の入力値が正しくありません',
+    'PROFILE_EXPORT_ERROR': '性能計測の結果を保存できませんでした',
+    'INVALID_SWEEP_RANGE': '範囲を正しく入力してください (開始 ≦ 終了、刻みは 1 以上)',
+    'SWEEP_TOO_LARGE': '試算する点が多すぎます。範囲を狭くするか刻みを大きくしてください',
+    'INVALID_REQUEST': 'リクエストが正しくありません',
+    'INVALID_REQUEST_FIELD': 'リクエストの項目が正しくありません',
+    'REQUEST_TOO_LARGE': 'リクエストが大きすぎます',
+    'UNKNOWN_ENDPOINT': 'エンドポイントがありません',
+    'INVALID_METHOD': 'このエンドポイントでは使えないメソッドです',
+    'ROSTER_FILE_ERROR': '名簿ファイルを読み書きできませんでした'
 }
 
 # Label text difinitions
 LABEL_TEXTS: Dict[str, str] = {
     'MONTHLY_SALARY': '月額給与 (円)',
+    'YEARLY_SALARY': '年間支払金額 (円)',
     'BONUS1': '賞与1 (円)',
     'BONUS2': '賞与2 (円)',
     'TOTAL_YEARLY_SALARY': '年間給与金額: ',
-    'INCOME_AMOUNT': '給与所得金額: '
+    'INCOME_AMOUNT': '給与所得金額: ',
+    'PROFILE_OVERLAY': '性能計測 (F12: 閉じる / Shift+F12: 保存)',
+    'YEAR': '年分',
+    'TARGET_INCOME': '給与所得金額 (円)',
+    'NO_EXACT_SALARY': 'この金額ちょうどになる年間給与はありません。この金額を超える最低額:',
+    'SWEEP_SALARY': '年間給与 (賞与を除く)',
+    'SWEEP_BONUS': '賞与の合計',
+    'SWEEP_START': '開始',
+    'SWEEP_STOP': '終了',
+    'SWEEP_STEP': '刻み',
+    'ROSTER_NUMBER': 'No.',
+    'ROSTER_TOTAL': '合計'
 }
 
 # Radio button text difinitions
 RADIO_BUTTON_TEXTS: Dict[str, str] = {
     'SINGLE': '1年同一月給',
-    'MONTHLY': '月毎に月給を入力する'
+    'MONTHLY': '月毎に月給を入力する',
+    'YEARLY': '年間支払金額を入力する'
 }
 
 # Button text difinitions
@@ -56,5 +215,14 @@ BUTTON_TEXTS = {
     'PREV_PAGE': '<<',
     'NEXT_PAGE': '>>',
     'ZOOM_IN': '+',
-    'ZOOM_OUT': '-'
+    'ZOOM_OUT': '-',
+    'CLOSE_PDF': '閉じる',
+    'CONTINUOUS': '連続表示',
+    'SEARCH': '検索',
+    'PLANNING': '逆算・試算',
+    'SOLVE': '逆算',
+    'SWEEP': '試算',
+    'ROSTER': '名簿',
+    'LOAD_ROSTER': '読み込み',
+    'SAVE_ROSTER': '保存'
 }
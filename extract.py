@@ -0,0 +1,239 @@
+import argparse
+import csv
+import os
+import re
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+import fitz
+
+from config import *
+from income import calculate_income
+from pdf_search import find_hit_rects, normalize_text
+
+# NOTE: this module must not import tkinter or PIL so that it can run on headless servers
+
+def parse_digits(text: str) -> Optional[int]:
+    """
+        Read an amount from extracted text, ignoring separators, units and spaces.
+
+        Args:
+            text (str): Text of the words in a field area (e.g. '1,234 567 円').
+
+        Returns:
+            Optional[int]: The amount, or None if the text has no digits.
+    """
+    digits = re.sub(r'\D', '', unicodedata.normalize('NFKC', text))
+
+    return int(digits) if digits else None
+
+def match_template(page: fitz.Page, templates: Dict[str, Dict]) -> Optional[str]:
+    """
+        Find the template whose marker text appears on a page.
+
+        Args:
+            page                  (fitz.Page): The page.
+            templates (Dict[str, Dict]): Field templates, see `EXTRACT_CONFIG['TEMPLATES']`.
+
+        Returns:
+            Optional[str]: Name of the first matching template, or None.
+    """
+    text = normalize_text(page.get_text())
+
+    return next((name for name, template in templates.items() if normalize_text(template['MATCH']) in text), None)
+
+def extract_page(page: fitz.Page, templates: Dict[str, Dict]) -> Optional[Tuple[str, Dict[str, int]]]:
+    """
+        Extract the fields of a page with the matching template.
+
+        Each field is located by its label; the amount is read from the words whose centers lie
+        in the field area, given relative to the top-left corner of the label in points.
+
+        Args:
+            page                  (fitz.Page): The page.
+            templates (Dict[str, Dict]): Field templates, see `EXTRACT_CONFIG['TEMPLATES']`.
+
+        Returns:
+            Optional[Tuple[str, Dict[str, int]]]: (template name, amount of each field found), or None if no template matches.
+    """
+    name = match_template(page, templates)
+
+    if name is None:
+        return None
+
+    words = page.get_text('words')  # (x0, y0, x1, y1, text, block, line, word)
+    fields = {}
+
+    for field, spec in templates[name]['FIELDS'].items():
+        labels = find_hit_rects(page, spec['LABEL'])
+
+        if not labels:
+            continue
+
+        dx0, dy0, dx1, dy1 = spec['AREA']
+        label = labels[0]
+        area = fitz.Rect(label.x0 + dx0, label.y0 + dy0, label.x0 + dx1, label.y0 + dy1)
+        inside = [word for word in words if area.contains(fitz.Point((word[0] + word[2]) / 2, (word[1] + word[3]) / 2))]
+        amount = parse_digits(''.join(word[4] for word in sorted(inside, key=lambda word: (round(word[1]), word[0]))))
+
+        if amount is not None:
+            fields[field] = amount
+
+    return name, fields
+
+def extract_file(filename: str, templates: Optional[Dict[str, Dict]] = None) -> List[Tuple[int, str, Dict[str, int]]]:
+    """
+        Extract the fields of every page of a PDF that matches a template.
+
+        Args:
+            filename                           (str): Path of the PDF file.
+            templates (Optional[Dict[str, Dict]], optional): Field templates. Defaults to `EXTRACT_CONFIG['TEMPLATES']`.
+
+        Returns:
+            List[Tuple[int, str, Dict[str, int]]]: (zero-based page index, template name, fields) of each matching page.
+    """
+    templates = templates or EXTRACT_CONFIG['TEMPLATES']
+    records = []
+
+    with fitz.open(filename) as document:
+        for page in document:
+            result = extract_page(page, templates)
+
+            if result is not None:
+                records.append((page.number, *result))
+
+    return records
+
+def calculate_fields(fields: Dict[str, int], year: Optional[int] = None) -> Optional[Tuple[int, int]]:
+    """
+        Calculate yearly salary and income amount from extracted fields.
+
+        The yearly payment (`YEARLY_SALARY`, 支払金額) already includes bonuses;
+        otherwise the yearly salary is the monthly salary times 12 plus the bonuses.
+
+        Args:
+            fields          (Dict[str, int]): Extracted amounts.
+            year (Optional[int], optional): Tax year. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+        Returns:
+            Optional[Tuple[int, int]]: (yearly salary, income amount), or None if no salary field was extracted.
+    """
+    if 'YEARLY_SALARY' in fields:
+        return calculate_income([fields['YEARLY_SALARY']], year=year)
+
+    if 'MONTHLY_SALARY' in fields:
+        return calculate_income(fields['MONTHLY_SALARY'], fields.get('BONUS1', 0), fields.get('BONUS2', 0), year)
+
+    return None
+
+def _extract_file_safely(filename: str) -> Tuple[str, List[Tuple[int, str, Dict[str, int]]], Optional[str]]:
+    """
+        Worker process entry point: extract a file and report errors instead of raising them.
+
+        Args:
+            filename (str): Path of the PDF file.
+
+        Returns:
+            Tuple[str, List[Tuple[int, str, Dict[str, int]]], Optional[str]]: (file name, records, error message or None).
+    """
+    try:
+        return filename, extract_file(filename), None
+    except Exception as e:
+        return filename, [], str(e)
+
+def extract_files(filenames: List[str], workers: Optional[int] = None) -> Iterator[Tuple[str, List[Tuple[int, str, Dict[str, int]]], Optional[str]]]:
+    """
+        Extract many PDF files in parallel on a process pool, one file per task.
+
+        Args:
+            filenames         (List[str]): Paths of the PDF files.
+            workers (Optional[int], optional): Number of processes. Defaults to the number of CPUs.
+
+        Yields:
+            Tuple[str, List[Tuple[int, str, Dict[str, int]]], Optional[str]]: (file name, records, error message or None), in input order.
+    """
+    if len(filenames) <= 1 or workers == 1:
+        yield from map(_extract_file_safely, filenames)     # not worth starting processes
+
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_extract_file_safely, filenames, chunksize=max(1, len(filenames) // ((workers or os.cpu_count() or 1) * 4)))
+
+def list_pdf_files(directory: str) -> List[str]:
+    """
+        List the PDF files in a directory and its subdirectories.
+
+        Args:
+            directory (str): The directory.
+
+        Returns:
+            List[str]: Sorted paths of the PDF files.
+    """
+    return sorted(os.path.join(root, name) for root, _, names in os.walk(directory) for name in names if name.lower().endswith('.pdf'))
+
+def process_directory(directory: str, output_file: TextIO, workers: Optional[int] = None, year: Optional[int] = None) -> int:
+    """
+        Extract every withholding slip in a directory and write the amounts and results as CSV.
+
+        Args:
+            directory                  (str): Directory of the PDF files.
+            output_file             (TextIO): Output CSV.
+            workers (Optional[int], optional): Number of processes. Defaults to the number of CPUs.
+            year    (Optional[int], optional): Tax year. Defaults to `RULES_CONFIG['DEFAULT_YEAR']`.
+
+        Returns:
+            int: The number of extracted slips.
+    """
+    field_columns = EXTRACT_CONFIG['FIELD_COLUMNS']
+    writer = csv.writer(output_file, lineterminator='\n')
+    writer.writerow([EXTRACT_CONFIG['FILE_COLUMN'], EXTRACT_CONFIG['PAGE_COLUMN'], EXTRACT_CONFIG['TEMPLATE_COLUMN'], *field_columns.values(),
+                     BATCH_CONFIG['TOTAL_YEARLY_SALARY_COLUMN'], BATCH_CONFIG['INCOME_AMOUNT_COLUMN']])
+
+    count = 0
+
+    for filename, records, error in extract_files(list_pdf_files(directory), workers):
+        if error is not None:
+            print(f'Error: {filename}: {error}', file=sys.stderr)
+
+            continue
+
+        for page_index, template, fields in records:
+            results = calculate_fields(fields, year) or ('', '')
+            writer.writerow([os.path.relpath(filename, directory), page_index + 1, template, *(fields.get(field, '') for field in field_columns), *results])
+            count += 1
+
+    return count
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+        Command line entry point for the bulk extraction.
+
+        Usage:
+            python extract.py slips/ -o output.csv [--year 2024] [--workers 8]
+
+        Args:
+            argv (Optional[List[str]], optional): Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(prog='extract', description='源泉徴収票の PDF から支払金額を読み取り、給与所得金額を一括計算します')
+    parser.add_argument('directory', help='PDF ファイルのディレクトリ')
+    parser.add_argument('-o', '--output', default='-', help='出力 CSV ファイル (省略時は標準出力)')
+    parser.add_argument('--year', type=int, default=RULES_CONFIG['DEFAULT_YEAR'], help='年分')
+    parser.add_argument('--workers', type=int, default=EXTRACT_CONFIG['WORKERS'] or None, help='並列に処理するプロセス数 (省略時は CPU 数)')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        print(f'Error: {args.directory}', file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        with (sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding=BATCH_CONFIG['ENCODING'])) as output_file:
+            process_directory(args.directory, output_file, args.workers, args.year)
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+import hashlib
+import os
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from config import UI_CONFIG
+
+class RenderCache:
+    """
+        In-memory LRU cache of rendered PDF pages with a memory budget.
+
+        Entries are keyed by (document, page index, zoom level) and carry their size in bytes.
+        When the total size exceeds the budget, the least recently used entries are evicted.
+        The cache is not thread-safe; it must only be used from the Tk main thread.
+
+        Attributes:
+            max_bytes     (int): Memory budget in bytes.
+            current_bytes (int): Total size of the cached entries in bytes.
+    """
+    def __init__(self, max_bytes: int) -> None:
+        """
+            Initialize an empty cache.
+
+            Args:
+                max_bytes (int): Memory budget in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: OrderedDict = OrderedDict()     # key -> (value, size)
+
+    @staticmethod
+    def make_key(document: Hashable, page_index: int, zoom: float) -> Tuple[Hashable, int, float]:
+        """
+            Build a cache key.
+
+            The zoom level is rounded because repeated multiplications by `ZOOM_FACTOR` leave floating point noise.
+
+            Args:
+                document (Hashable): Identifier of the document (e.g. its file name).
+                page_index    (int): Zero-based page index.
+                zoom        (float): Zoom level.
+
+            Returns:
+                Tuple[Hashable, int, float]: The cache key.
+        """
+        return (document, page_index, round(zoom, 4))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+            Return a cached entry and mark it as most recently used.
+
+            Args:
+                key (Hashable): The cache key.
+
+            Returns:
+                Optional[Any]: The cached value, or None if it is not cached.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """
+            Store an entry and evict least recently used entries to stay within the budget.
+
+            Values larger than the whole budget are not cached.
+
+            Args:
+                key (Hashable): The cache key.
+                value    (Any): The value to cache.
+                size     (int): Size of the value in bytes.
+        """
+        self.discard(key)
+
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+
+    def discard(self, key: Hashable) -> None:
+        """
+            Remove an entry if it is cached.
+
+            Args:
+                key (Hashable): The cache key.
+        """
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+            Remove every entry whose key matches the predicate.
+
+            Args:
+                predicate (Callable[[Hashable], bool]): Returns True for keys to remove.
+        """
+        for key in [key for key in self._entries if predicate(key)]:
+            self.discard(key)
+
+    def clear(self) -> None:
+        """
+            Remove all entries.
+        """
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+def default_cache_directory(name: str = 'render_cache') -> str:
+    """
+        Return a per-user cache directory, e.g. for the on-disk render cache.
+
+        Args:
+            name (str, optional): Name of the cache. Defaults to 'render_cache'.
+
+        Returns:
+            str: `%LOCALAPPDATA%` on Windows, `$XDG_CACHE_HOME` or `~/.cache` elsewhere, plus the application and cache names.
+    """
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+
+    return os.path.join(base, UI_CONFIG['APP_TITLE'], name)
+
+def ppm_size(data: bytes) -> Tuple[int, int]:
+    """
+        Read the image size from a binary PPM header (`P6 <width> <height> 255`).
+
+        Args:
+            data (bytes): PPM data.
+
+        Returns:
+            Tuple[int, int]: (width, height).
+    """
+    _, width, height = data[:32].split(maxsplit=3)[:3]
+
+    return int(width), int(height)
+
+class DiskRenderCache:
+    """
+        Persistent render cache shared across sessions.
+
+        Rendered pages are stored as zlib-compressed PPM files named after the SHA-256 hash of the
+        PDF contents plus page index and zoom level, so a changed file never hits stale renders.
+        The total size is capped; least recently used files (by modification time, refreshed on
+        every hit) are deleted first.
+        Files are written to a temporary name and renamed atomically, so concurrent readers and
+        other application instances never see partial files. Writes run on a background thread.
+
+        Attributes:
+            directory (str): Cache directory.
+            max_bytes (int): Size cap in bytes.
+    """
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        """
+            Initialize the cache. The directory is created and scanned lazily.
+
+            Args:
+                directory (str): Cache directory.
+                max_bytes (int): Size cap in bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None     # scanned on first write
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='DiskRenderCache')
+
+    def file_hash(self, filename: str) -> str:
+        """
+            Return the SHA-256 hash of a file's contents.
+
+            The hash is remembered per (path, size, modification time), so unchanged files are read only once per session.
+
+            Args:
+                filename (str): Path of the file.
+
+            Returns:
+                str: Hexadecimal digest.
+        """
+        stat = os.stat(filename)
+        signature = (os.path.abspath(filename), stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            digest = self._hashes.get(signature)
+
+        if digest is None:
+            sha256 = hashlib.sha256()
+
+            with open(filename, 'rb') as f:
+                while chunk := f.read(1024 * 1024):
+                    sha256.update(chunk)
+
+            digest = sha256.hexdigest()
+
+            with self._lock:
+                self._hashes[signature] = digest
+
+        return digest
+
+    def path_for(self, key: Hashable) -> str:
+        """
+            Return the file path of a cache key.
+
+            Args:
+                key (Hashable): Render cache key whose first element is the content hash.
+
+            Returns:
+                str: Path of the cache file.
+        """
+        name = '-'.join(str(part) for part in key)
+
+        return os.path.join(self.directory, key[0][:2], f'{name}.ppm.z')
+
+    def get(self, key: Hashable) -> Optional[Tuple[int, int, bytes]]:
+        """
+            Read a cached render and mark it as recently used.
+
+            Missing, partially evicted or corrupted files are treated as misses.
+
+            Args:
+                key (Hashable): Render cache key.
+
+            Returns:
+                Optional[Tuple[int, int, bytes]]: (width, height, PPM data), or None if not cached.
+        """
+        path = self.path_for(key)
+
+        try:
+            with open(path, 'rb') as f:
+                data = zlib.decompress(f.read())
+
+            os.utime(path)      # refresh the LRU order
+
+            return (*ppm_size(data), data)
+        except (OSError, zlib.error, ValueError):
+            return None
+
+    def put(self, key: Hashable, image: Tuple[int, int, bytes]) -> None:
+        """
+            Store a render in background.
+
+            Args:
+                key                     (Hashable): Render cache key.
+                image (Tuple[int, int, bytes]): (width, height, PPM data).
+        """
+        self._writer.submit(self._write, self.path_for(key), image[2])
+
+    def _write(self, path: str, data: bytes) -> None:
+        """
+            Compress and atomically write a cache file, then enforce the size cap.
+
+            Args:
+                path  (str): Path of the cache file.
+                data (bytes): PPM data.
+        """
+        temporary = None
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            compressed = zlib.compress(data, 1)
+
+            with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix='.tmp', delete=False) as f:
+                temporary = f.name
+                f.write(compressed)
+
+            try:
+                replaced = os.path.getsize(path)    # an existing entry is overwritten, e.g. by another instance
+            except OSError:
+                replaced = 0
+
+            os.replace(temporary, path)
+        except OSError:
+            # the cache is best effort; rendering still works without it
+            if temporary is not None:
+                try:
+                    os.remove(temporary)
+                except OSError:
+                    pass
+
+            return
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += len(compressed) - replaced
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        """
+            List the cache files.
+
+            Returns:
+                List[Tuple[str, int, float]]: (path, size, modification time) of every cache file.
+        """
+        entries = []
+
+        for directory, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.ppm.z'):
+                    path = os.path.join(directory, name)
+
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue    # deleted by another instance
+
+                    entries.append((path, stat.st_size, stat.st_mtime))
+
+        return entries
+
+    def _evict(self) -> None:
+        """
+            Delete least recently used files until the cache is below 90 % of the cap.
+        """
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+
+        for path, size, _ in entries:
+            if total <= self.max_bytes * 0.9:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+            total -= size
+
+        self._total_bytes = total
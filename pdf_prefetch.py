@@ -0,0 +1,192 @@
+import queue
+import threading
+import tkinter as tk
+from typing import Callable, Hashable, List, Optional, Tuple
+
+import fitz
+
+from config import UI_CONFIG
+from pdf_cache import DiskRenderCache, RenderCache
+from pdf_render import render_ppm
+
+class PagePrefetcher:
+    """
+        Render neighbouring PDF pages on a worker thread.
+
+        The worker opens its own `fitz` document handle, so it never shares MuPDF objects with the main thread.
+        Pages found in the on-disk render cache are read from there instead of being rendered.
+        Rendered pages are returned as PPM bytes and handed to `on_rendered` on the Tk main thread
+        by polling a result queue with `root.after`.
+        Every `schedule` or `request` call supersedes the previous one; queued jobs of older calls are dropped.
+
+        Attributes:
+            root                                      (tk.Tk): The main application window.
+            on_rendered (Callable[[Hashable, int, int, bytes], None]): Called with (cache key, width, height, PPM data).
+            disk_cache               (Optional[DiskRenderCache]): Persistent render cache.
+    """
+    def __init__(self, root: tk.Tk, on_rendered: Callable[[Hashable, int, int, bytes], None], disk_cache: Optional[DiskRenderCache] = None) -> None:
+        """
+            Start the worker thread.
+
+            Args:
+                root                                      (tk.Tk): The main application window.
+                on_rendered (Callable[[Hashable, int, int, bytes], None]): Receives finished renders on the main thread.
+                disk_cache     (Optional[DiskRenderCache], optional): Persistent render cache. Defaults to None.
+        """
+        self.root = root
+        self.on_rendered = on_rendered
+        self.disk_cache = disk_cache
+
+        self._generation = 0
+        self._sequence = 0
+        self._pending = 0
+        self._polling = False
+        self._jobs: queue.PriorityQueue = queue.PriorityQueue()    # (priority, sequence, generation, filename, document key, page index, zoom)
+        self._results: queue.Queue = queue.Queue()                 # (key, width, height, PPM data)
+
+        self._thread = threading.Thread(target=self._run, name='PagePrefetcher', daemon=True)
+        self._thread.start()
+
+    @property
+    def idle(self) -> bool:
+        """
+            Return True when no queued or running job is left.
+        """
+        return self._pending == 0
+
+    def reset(self) -> None:
+        """
+            Drop all queued jobs, e.g. when the zoom level changes or another file is loaded.
+        """
+        self._generation += 1
+
+    def schedule(self, filename: str, document_key: str, page_index: int, page_count: int, zoom: float, skip: Callable[[Hashable], bool]) -> None:
+        """
+            Queue the neighbours of the current page for rendering.
+
+            Pages at distance 1 are rendered first, pages at distance 2 when the worker is otherwise idle.
+
+            Args:
+                filename                      (str): Path of the displayed PDF file.
+                document_key                  (str): Content hash of the file, used in cache keys.
+                page_index                    (int): Zero-based index of the displayed page.
+                page_count                    (int): Number of pages of the document.
+                zoom                        (float): Current zoom level.
+                skip (Callable[[Hashable], bool]): Returns True for cache keys that do not need rendering.
+        """
+        self.reset()
+
+        for distance in range(1, UI_CONFIG['PREFETCH_DISTANCE'] + 1):
+            for neighbour in (page_index + distance, page_index - distance):
+                if 0 <= neighbour < page_count and not skip(RenderCache.make_key(document_key, neighbour, zoom)):
+                    self._sequence += 1
+                    self._pending += 1
+                    self._jobs.put((distance, self._sequence, self._generation, filename, document_key, neighbour, zoom))
+
+        if self._pending and not self._polling:
+            self._polling = True
+            self.root.after(UI_CONFIG['PREFETCH_POLL_MS'], self._poll)
+
+    def request(self, filename: str, document_key: str, pages: List[Tuple[int, float]], skip: Callable[[Hashable], bool]) -> None:
+        """
+            Queue explicit pages for rendering, in the given order.
+
+            Like `schedule`, this supersedes the previous call.
+
+            Args:
+                filename                         (str): Path of the PDF file.
+                document_key                     (str): Content hash of the file, used in cache keys.
+                pages     (List[Tuple[int, float]]): (page index, zoom level) of each page to render.
+                skip    (Callable[[Hashable], bool]): Returns True for cache keys that do not need rendering.
+        """
+        self.reset()
+
+        for priority, (page_index, zoom) in enumerate(pages):
+            if not skip(RenderCache.make_key(document_key, page_index, zoom)):
+                self._sequence += 1
+                self._pending += 1
+                self._jobs.put((priority, self._sequence, self._generation, filename, document_key, page_index, zoom))
+
+        if self._pending and not self._polling:
+            self._polling = True
+            self.root.after(UI_CONFIG['PREFETCH_POLL_MS'], self._poll)
+
+    def close(self) -> None:
+        """
+            Stop the worker thread after its current job.
+        """
+        self.reset()
+        self._sequence += 1
+        self._jobs.put((0, self._sequence, None, None, None, None, None))
+
+    def _run(self) -> None:
+        """
+            Worker thread loop: render queued pages with a private document handle.
+        """
+        document: Optional[fitz.Document] = None
+        opened_key: Optional[str] = None
+
+        while True:
+            _, _, generation, filename, document_key, page_index, zoom = self._jobs.get()
+
+            if generation is None:
+                break
+
+            result = None
+
+            if generation == self._generation:
+                key = RenderCache.make_key(document_key, page_index, zoom)
+                image = self.disk_cache.get(key) if self.disk_cache else None
+
+                try:
+                    if image is None:
+                        if document is None or document.name != filename or opened_key != document_key:
+                            if document is not None:
+                                document.close()
+                                document = None
+
+                            # the file is opened by name; skip it if it was replaced since it was hashed
+                            if self.disk_cache and self.disk_cache.file_hash(filename) != document_key:
+                                raise ValueError(filename)
+
+                            document = fitz.open(filename)
+                            opened_key = document_key
+
+                        image = render_ppm(document[page_index], zoom, section_prefix='prefetch.')
+
+                        if self.disk_cache:
+                            self.disk_cache.put(key, image)
+
+                    result = (key, *image)
+                except Exception:
+                    # the file may have been moved, deleted or replaced; the page is rendered on demand instead
+                    if document is not None:
+                        document.close()
+
+                    document = None
+
+            self._results.put(result)
+
+        if document is not None:
+            document.close()
+
+    def _poll(self) -> None:
+        """
+            Hand finished renders to `on_rendered` on the main thread.
+        """
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+
+            self._pending -= 1
+
+            if result is not None:
+                self.on_rendered(*result)
+
+        if self._pending > 0:
+            self.root.after(UI_CONFIG['PREFETCH_POLL_MS'], self._poll)
+        else:
+            self._polling = False
+
@@ -0,0 +1,43 @@
+from typing import Optional, Tuple
+
+import fitz
+
+from profiling import PROFILER
+
+def render_ppm(page: fitz.Page, zoom: float, clip: Optional[fitz.Rect] = None, section_prefix: str = '') -> Tuple[int, int, bytes]:
+    """
+        Render a PDF page (or part of it) as binary PPM data.
+
+        Tk photo images read PPM data directly, so no PIL conversion is needed on the way to the canvas.
+        The result holds no MuPDF objects and can be passed between threads.
+        Rasterization and PPM conversion are timed separately by the profiler.
+
+        Args:
+            page                (fitz.Page): The page to render.
+            zoom                    (float): Zoom level.
+            clip (Optional[fitz.Rect], optional): Region to render in page coordinates. Defaults to the whole page.
+            section_prefix    (str, optional): Prefix of the profiler sections, e.g. 'prefetch.' for background renders,
+                                               so they are not mixed with the renders the user waits for. Defaults to ''.
+
+        Returns:
+            Tuple[int, int, bytes]: (width, height, PPM data).
+    """
+    with PROFILER.section(f'{section_prefix}render.get_pixmap'):
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip)
+
+    with PROFILER.section(f'{section_prefix}render.convert'):
+        return pix.width, pix.height, pix.tobytes('ppm')
+
+def ppm_from_rgb(width: int, height: int, samples: bytes) -> bytes:
+    """
+        Wrap raw RGB pixels (e.g. from PIL) in a PPM header.
+
+        Args:
+            width     (int): Image width in pixels.
+            height    (int): Image height in pixels.
+            samples (bytes): RGB pixel data.
+
+        Returns:
+            bytes: PPM data.
+    """
+    return b'P6\n%d %d\n255\n' % (width, height) + samples
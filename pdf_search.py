@@ -0,0 +1,361 @@
+import json
+import os
+import queue
+import re
+import tempfile
+import threading
+import unicodedata
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import UI_CONFIG
+
+# NOTE: fitz is imported on the worker thread only, so that this module stays cheap to import
+
+INDEX_VERSION = 1
+
+def normalize_text(text: str) -> str:
+    """
+        Normalize text for indexing and searching.
+
+        Full-width alphanumerics are folded to half-width (NFKC), case is ignored and whitespace
+        is removed, since MuPDF inserts spaces and line breaks between Japanese characters.
+
+        Args:
+            text (str): Page text or query.
+
+        Returns:
+            str: Normalized text.
+    """
+    return re.sub(r'\s+', '', unicodedata.normalize('NFKC', text).casefold())
+
+def ngrams(text: str, n: int) -> set:
+    """
+        Split normalized text into its distinct n-grams.
+
+        Args:
+            text (str): Normalized text.
+            n    (int): Length of the n-grams.
+
+        Returns:
+            set: The distinct n-grams.
+    """
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+def find_hit_rects(page, query: str) -> list:
+    """
+        Locate the hits of a query on a page for highlighting.
+
+        Matches with the same normalization as the index, so hits found by `SearchIndex.search`
+        are located even where MuPDF puts spaces between characters.
+
+        Args:
+            page (fitz.Page): The page.
+            query     (str): Search text.
+
+        Returns:
+            List[fitz.Rect]: Bounding box of every hit, in page coordinates.
+    """
+    import fitz
+
+    query = normalize_text(query)
+
+    if not query:
+        return []
+
+    chars, boxes = [], []
+
+    for block in page.get_text('rawdict')['blocks']:
+        for line in block.get('lines', []):
+            for span in line['spans']:
+                for char in span['chars']:
+                    for c in normalize_text(char['c']):    # NFKC may expand a character
+                        chars.append(c)
+                        boxes.append(char['bbox'])
+
+    text = ''.join(chars)
+    rects = []
+    start = text.find(query)
+
+    while start != -1:
+        rect = fitz.Rect(boxes[start])
+
+        for box in boxes[start + 1:start + len(query)]:
+            rect |= box
+
+        rects.append(rect)
+        start = text.find(query, start + len(query))
+
+    return rects
+
+class SearchIndex:
+    """
+        Inverted n-gram index over the page texts of one PDF.
+
+        Japanese text has no word boundaries, so pages are indexed by overlapping character n-grams
+        (`UI_CONFIG['SEARCH_NGRAM']`). A query is answered by intersecting the posting lists of its
+        n-grams and confirming the candidates with a substring search in the normalized page text.
+        Pages are added while the index is being built, and searches see the pages indexed so far.
+
+        Attributes:
+            page_count (int): Number of pages of the document.
+            n          (int): Length of the n-grams.
+            pages (List[str]): Normalized text of every indexed page.
+    """
+    def __init__(self, page_count: int, n: int = UI_CONFIG['SEARCH_NGRAM']) -> None:
+        """
+            Initialize an empty index.
+
+            Args:
+                page_count    (int): Number of pages of the document.
+                n (int, optional): Length of the n-grams. Defaults to `UI_CONFIG['SEARCH_NGRAM']`.
+        """
+        self.page_count = page_count
+        self.n = n
+        self.pages: List[str] = []
+        self._postings: Dict[str, List[int]] = {}   # n-gram -> indexes of the pages containing it, ascending
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        """
+            Return True once every page is indexed.
+        """
+        return len(self.pages) == self.page_count
+
+    def add_page(self, text: str) -> None:
+        """
+            Index the text of the next page.
+
+            Args:
+                text (str): Text extracted from the page.
+        """
+        text = normalize_text(text)
+
+        with self._lock:
+            page_index = len(self.pages)
+            self.pages.append(text)
+
+            for gram in ngrams(text, self.n):
+                self._postings.setdefault(gram, []).append(page_index)
+
+    def search(self, query: str) -> List[Tuple[int, int]]:
+        """
+            Find the pages containing a query.
+
+            Args:
+                query (str): Search text.
+
+            Returns:
+                List[Tuple[int, int]]: (page index, number of hits) of every matching page, in page order.
+        """
+        query = normalize_text(query)
+
+        if not query:
+            return []
+
+        with self._lock:
+            if len(query) < self.n:
+                candidates = range(len(self.pages))     # too short for the index; scan the page texts
+            else:
+                postings = sorted((self._postings.get(gram, []) for gram in ngrams(query, self.n)), key=len)
+                candidates = set(postings[0])
+
+                for posting in postings[1:]:
+                    if not candidates:
+                        break
+
+                    candidates.intersection_update(posting)
+
+                candidates = sorted(candidates)
+
+            results = []
+
+            for page_index in candidates:
+                count = self.pages[page_index].count(query)
+
+                if count:
+                    results.append((page_index, count))
+
+        return results
+
+    def save(self, path: str) -> None:
+        """
+            Write the complete index atomically as zlib-compressed JSON.
+
+            Args:
+                path (str): Output file.
+        """
+        with self._lock:
+            data = json.dumps({'version': INDEX_VERSION, 'n': self.n, 'pages': self.pages, 'postings': self._postings}, ensure_ascii=False)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix='.tmp', delete=False) as f:
+            f.write(zlib.compress(data.encode('utf-8'), 1))
+
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['SearchIndex']:
+        """
+            Read an index written by `save`.
+
+            Args:
+                path (str): Index file.
+
+            Returns:
+                Optional[SearchIndex]: The index, or None if the file is missing, corrupted or of another format.
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        except (OSError, zlib.error, ValueError):
+            return None
+
+        if data.get('version') != INDEX_VERSION or data.get('n') != UI_CONFIG['SEARCH_NGRAM']:
+            return None
+
+        index = cls(len(data['pages']), data['n'])
+        index.pages = data['pages']
+        index._postings = data['postings']
+
+        return index
+
+class SearchIndexer:
+    """
+        Build search indexes of PDF files on a worker thread and keep them per file hash.
+
+        Indexes are saved under `directory` named after the SHA-256 hash of the PDF contents,
+        so a file is only indexed once, even across sessions. While a file is being indexed,
+        its partial index can already be searched. If indexing fails, the partial index is
+        dropped and the file is reported as failed until it is queued again.
+
+        Attributes:
+            directory                            (str): Directory of the saved indexes.
+            file_hash (Optional[Callable[[str], str]]): Content hash of a file, checked before indexing it.
+    """
+    def __init__(self, directory: str, file_hash: Optional[Callable[[str], str]] = None) -> None:
+        """
+            Start the worker thread.
+
+            Args:
+                directory                                      (str): Directory of the saved indexes.
+                file_hash (Optional[Callable[[str], str]], optional): Content hash of a file (e.g. `DiskRenderCache.file_hash`).
+                                                                      A file whose hash no longer matches its queued key was
+                                                                      replaced and is not indexed. Defaults to None (not checked).
+        """
+        self.directory = directory
+        self.file_hash = file_hash
+
+        self._indexes: Dict[str, SearchIndex] = {}
+        self._queued = set()
+        self._failed = set()
+        self._jobs: queue.Queue = queue.Queue()     # (filename, document key)
+        self._thread = threading.Thread(target=self._run, name='SearchIndexer', daemon=True)
+        self._thread.start()
+
+    def build(self, filename: str, document_key: str) -> None:
+        """
+            Queue a file for indexing unless its index is already loaded or queued.
+
+            Args:
+                filename     (str): Path of the PDF file.
+                document_key (str): Content hash of the file.
+        """
+        if document_key not in self._indexes and document_key not in self._queued:
+            self._failed.discard(document_key)
+            self._queued.add(document_key)
+            self._jobs.put((filename, document_key))
+
+    def get(self, document_key: str) -> Optional[SearchIndex]:
+        """
+            Return the (possibly partial) index of a file.
+
+            Args:
+                document_key (str): Content hash of the file.
+
+            Returns:
+                Optional[SearchIndex]: The index, or None if the worker has not started on the file.
+        """
+        return self._indexes.get(document_key)
+
+    def is_complete(self, document_key: str) -> bool:
+        """
+            Return True if the index of a file is complete.
+
+            Args:
+                document_key (str): Content hash of the file.
+
+            Returns:
+                bool: True once every page of the file is indexed.
+        """
+        index = self._indexes.get(document_key)
+
+        return index is not None and index.complete
+
+    def is_failed(self, document_key: str) -> bool:
+        """
+            Return True if a file could not be indexed, e.g. because it was moved or is damaged.
+
+            Args:
+                document_key (str): Content hash of the file.
+
+            Returns:
+                bool: True if the last attempt to index the file failed.
+        """
+        return document_key in self._failed
+
+    def path_for(self, document_key: str) -> str:
+        """
+            Return the path of the saved index of a file.
+
+            Args:
+                document_key (str): Content hash of the file.
+
+            Returns:
+                str: Path of the index file.
+        """
+        return os.path.join(self.directory, f'{document_key}.json.z')
+
+    def _run(self) -> None:
+        """
+            Worker thread loop: load saved indexes or extract the page texts and index them.
+        """
+        import fitz
+
+        while True:
+            filename, document_key = self._jobs.get()
+            path = self.path_for(document_key)
+            index = SearchIndex.load(path)
+
+            if index is not None:
+                self._indexes[document_key] = index
+                self._queued.discard(document_key)
+
+                continue
+
+            try:
+                # the file is opened by name; do not index new contents under the old hash
+                if self.file_hash is not None and self.file_hash(filename) != document_key:
+                    raise ValueError(filename)
+
+                with fitz.open(filename) as document:
+                    index = SearchIndex(len(document))
+                    self._indexes[document_key] = index
+                    self._queued.discard(document_key)
+
+                    for page in document:
+                        index.add_page(page.get_text())
+            except Exception:
+                # the file may have been moved, deleted, replaced or damaged; it stays unsearchable until queued again
+                self._indexes.pop(document_key, None)
+                self._failed.add(document_key)
+                self._queued.discard(document_key)
+
+                continue
+
+            try:
+                index.save(path)
+            except OSError:
+                pass        # saving is best effort; the index is rebuilt next session
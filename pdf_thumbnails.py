@@ -0,0 +1,304 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from config import UI_CONFIG
+from pdf_cache import DiskRenderCache, RenderCache
+
+class ThumbnailSidebar:
+    """
+        Virtualized strip of page thumbnails for fast page navigation.
+
+        Only the rows in view have canvas items; rows scrolled out of view are hidden and their
+        items reused. Thumbnails are low-resolution renders produced on a `PagePrefetcher` worker
+        thread and stored in the shared render caches, so they are rendered once per document.
+        Clicking a thumbnail calls `on_select` with its page index.
+
+        Attributes:
+            frame                      (ttk.Frame): Frame holding the canvas and its scrollbar.
+            canvas                     (tk.Canvas): Canvas the thumbnails are drawn on.
+            render_cache             (RenderCache): Shared in-memory render cache.
+            disk_cache           (DiskRenderCache): Shared on-disk render cache.
+            on_select (Callable[[int], None]): Called with the page index of a clicked thumbnail.
+            current_page                     (int): Highlighted page index.
+    """
+    def __init__(self, parent: tk.Widget, render_cache: RenderCache, disk_cache: DiskRenderCache, on_select: Callable[[int], None]) -> None:
+        """
+            Create the sidebar widgets. The worker thread is started with the first document.
+
+            Args:
+                parent                   (tk.Widget): Parent widget.
+                render_cache           (RenderCache): Shared in-memory render cache.
+                disk_cache         (DiskRenderCache): Shared on-disk render cache.
+                on_select (Callable[[int], None]): Called with the page index of a clicked thumbnail.
+        """
+        self.render_cache = render_cache
+        self.disk_cache = disk_cache
+        self.on_select = on_select
+        self.current_page = 0
+
+        self.width = UI_CONFIG['THUMBNAIL_WIDTH']
+        self.height = UI_CONFIG['THUMBNAIL_HEIGHT']
+        self.padding = UI_CONFIG['THUMBNAIL_PADDING']
+        self.row_height = self.height + self.padding * 2 + 16    # thumbnail and page number
+
+        self.frame = ttk.Frame(parent)
+        self.canvas = tk.Canvas(self.frame, width=self.width + self.padding * 2, background='gray', highlightthickness=0, yscrollincrement=UI_CONFIG['SCROLL_STEP'])
+        self.canvas.pack(side=tk.LEFT, fill=tk.Y, expand=True)
+
+        scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.scroll)
+        scrollbar.pack(side=tk.LEFT, fill=tk.Y)
+        self.canvas.config(yscrollcommand=scrollbar.set)
+
+        self.canvas.bind('<Configure>', lambda event: self.schedule_update())
+        self.canvas.bind('<Button-1>', self.handle_click)
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.canvas.bind(sequence, self.handle_mouse_wheel)
+
+        self.highlight = self.canvas.create_rectangle(0, 0, 0, 0, outline='royal blue', width=3, state=tk.HIDDEN)
+
+        self._document = None
+        self._document_key: Optional[str] = None
+        self._zooms: Dict[int, float] = {}         # page index -> thumbnail zoom level
+        self._rows: Dict[int, Tuple[int, int, int, tk.PhotoImage]] = {}    # page index -> (placeholder, image, label, photo)
+        self._drawn: Dict[int, bool] = {}           # page index -> True once the thumbnail is shown
+        self._spare_rows: List[Tuple[int, int, int, tk.PhotoImage]] = []
+        self._update_pending = False
+        self._worker = None
+
+    def show_document(self, document, document_key: Optional[str]) -> None:
+        """
+            Show the thumbnails of another document.
+
+            Args:
+                document (Optional[fitz.Document]): The document, or None to empty the sidebar.
+                document_key       (Optional[str]): Content hash of the document, used in cache keys.
+        """
+        if document is not None and self._worker is None:
+            from pdf_prefetch import PagePrefetcher
+
+            self._worker = PagePrefetcher(self.canvas.winfo_toplevel(), self.on_thumbnail_rendered, self.disk_cache)
+
+        if self._worker is not None:
+            self._worker.reset()
+
+        self.release_rows()
+        self._document = document
+        self._document_key = document_key
+        self._zooms = {}
+        self.current_page = 0
+
+        page_count = len(document) if document is not None else 0
+        self.canvas.config(scrollregion=(0, 0, self.width + self.padding * 2, page_count * self.row_height))
+        self.canvas.yview_moveto(0)
+        self.canvas.itemconfigure(self.highlight, state=tk.HIDDEN)
+        self.schedule_update()
+
+    def set_current_page(self, page_index: int) -> None:
+        """
+            Highlight the displayed page and scroll its thumbnail into view.
+
+            Args:
+                page_index (int): Zero-based index of the displayed page.
+        """
+        if self._document is None:
+            return
+
+        self.current_page = page_index
+        top = page_index * self.row_height
+        self.canvas.coords(self.highlight, 2, top + 2, self.width + self.padding * 2 - 2, top + self.row_height - 2)
+        self.canvas.itemconfigure(self.highlight, state=tk.NORMAL)
+        self.canvas.tag_raise(self.highlight)
+
+        view_top = self.canvas.canvasy(0)
+        view_bottom = view_top + self.canvas.winfo_height()
+
+        if top < view_top or top + self.row_height > view_bottom:
+            self.canvas.yview_moveto(top / max(1, len(self._document) * self.row_height))
+            self.schedule_update()
+
+    def thumbnail_zoom(self, page_index: int) -> float:
+        """
+            Return the zoom level fitting a page into the thumbnail box.
+
+            Args:
+                page_index (int): Zero-based page index.
+
+            Returns:
+                float: Zoom level.
+        """
+        zoom = self._zooms.get(page_index)
+
+        if zoom is None:
+            rect = self._document[page_index].rect
+            zoom = min(self.width / rect.width, self.height / rect.height)
+            self._zooms[page_index] = zoom
+
+        return zoom
+
+    def release_rows(self) -> None:
+        """
+            Hide all rows and keep their canvas items and photo images for reuse.
+        """
+        for page_index in list(self._rows):
+            self.release_row(page_index)
+
+    def release_row(self, page_index: int) -> None:
+        """
+            Hide a row and keep its canvas items and photo image for reuse.
+
+            Args:
+                page_index (int): Zero-based page index of the row.
+        """
+        row = self._rows.pop(page_index)
+        self._drawn.pop(page_index, None)
+
+        for item in row[:3]:
+            self.canvas.itemconfigure(item, state=tk.HIDDEN)
+
+        self._spare_rows.append(row)
+
+    def schedule_update(self) -> None:
+        """
+            Update the visible rows once the pending events have been processed.
+        """
+        if not self._update_pending:
+            self._update_pending = True
+            self.canvas.after_idle(self.update_visible_rows)
+
+    def update_visible_rows(self) -> None:
+        """
+            Lay out the rows in view and request the thumbnails that are not cached.
+
+            Cached thumbnails are shown immediately; the others get a placeholder until
+            the worker thread has rendered them.
+        """
+        self._update_pending = False
+
+        if self._document is None:
+            return
+
+        page_count = len(self._document)
+        first = max(0, int(self.canvas.canvasy(0)) // self.row_height)
+        last = min(page_count - 1, int(self.canvas.canvasy(self.canvas.winfo_height())) // self.row_height)
+        visible = range(first, last + 1)
+
+        for page_index in [page_index for page_index in self._rows if page_index not in visible]:
+            self.release_row(page_index)
+
+        missing = []
+
+        for page_index in visible:
+            if page_index not in self._rows:
+                self.place_row(page_index)
+
+            if not self._drawn.get(page_index):
+                key = RenderCache.make_key(self._document_key, page_index, self.thumbnail_zoom(page_index))
+                image = self.render_cache.get(key)
+
+                if image is None:
+                    missing.append((page_index, key[2]))
+                else:
+                    self.draw_thumbnail(page_index, *image)
+
+        self._worker.request(self._document.name, self._document_key, missing, self.render_cache.__contains__)
+
+    def place_row(self, page_index: int) -> None:
+        """
+            Place the canvas items of a row, with a placeholder instead of the thumbnail.
+
+            Args:
+                page_index (int): Zero-based page index of the row.
+        """
+        if self._spare_rows:
+            placeholder, image, label, photo = self._spare_rows.pop()
+        else:
+            photo = tk.PhotoImage()
+            placeholder = self.canvas.create_rectangle(0, 0, 0, 0, fill='light gray', outline='')
+            image = self.canvas.create_image(0, 0, anchor=tk.N, image=photo)
+            label = self.canvas.create_text(0, 0, anchor=tk.N, fill='white')
+
+        top = page_index * self.row_height + self.padding
+        center = self.padding + self.width // 2
+        self.canvas.coords(placeholder, self.padding, top, self.padding + self.width, top + self.height)
+        self.canvas.coords(label, center, top + self.height + 2)
+        self.canvas.itemconfigure(label, text=str(page_index + 1), state=tk.NORMAL)
+        self.canvas.itemconfigure(placeholder, state=tk.NORMAL)
+        self.canvas.itemconfigure(image, state=tk.HIDDEN)
+
+        self._rows[page_index] = (placeholder, image, label, photo)
+
+    def draw_thumbnail(self, page_index: int, width: int, height: int, data: bytes) -> None:
+        """
+            Show a rendered thumbnail in its row, replacing the placeholder.
+
+            Args:
+                page_index (int): Zero-based page index of the row.
+                width      (int): Thumbnail width in pixels.
+                height     (int): Thumbnail height in pixels.
+                data     (bytes): PPM data.
+        """
+        placeholder, image, _, photo = self._rows[page_index]
+        top = page_index * self.row_height + self.padding + (self.height - height) // 2
+
+        photo.configure(width=width, height=height, data=data, format='ppm')
+        self.canvas.coords(image, self.padding + self.width // 2, top)
+        self.canvas.itemconfigure(image, state=tk.NORMAL)
+        self.canvas.itemconfigure(placeholder, state=tk.HIDDEN)
+        self._drawn[page_index] = True
+
+    def on_thumbnail_rendered(self, key: Hashable, width: int, height: int, data: bytes) -> None:
+        """
+            Store a thumbnail rendered in background and show it if its row is in view.
+
+            Thumbnails of another document are discarded.
+
+            Args:
+                key (Hashable): Cache key of the thumbnail.
+                width    (int): Thumbnail width in pixels.
+                height   (int): Thumbnail height in pixels.
+                data   (bytes): PPM data.
+        """
+        if key[0] != self._document_key:
+            return
+
+        self.render_cache.put(key, (width, height, data), len(data))
+        page_index = key[1]
+
+        if page_index in self._rows and not self._drawn.get(page_index):
+            self.draw_thumbnail(page_index, width, height, data)
+
+    def scroll(self, *args) -> None:
+        """
+            Scroll the sidebar and lay out the rows that come into view.
+
+            Args:
+                *args: Arguments for `Canvas.yview` (e.g. 'scroll', 1, 'units').
+        """
+        self.canvas.yview(*args)
+        self.schedule_update()
+
+    def handle_mouse_wheel(self, event: tk.Event) -> None:
+        """
+            Scroll the sidebar with the mouse wheel.
+
+            Args:
+                event (tk.Event): Mouse wheel event (`<MouseWheel>` or `<Button-4>`/`<Button-5>` on Linux)
+        """
+        self.scroll('scroll', -1 if event.num == 4 or event.delta > 0 else 1, 'units')
+
+    def handle_click(self, event: tk.Event) -> None:
+        """
+            Jump to the page of the clicked thumbnail.
+
+            Args:
+                event (tk.Event): Mouse click event.
+        """
+        if self._document is None:
+            return
+
+        page_index = int(self.canvas.canvasy(event.y)) // self.row_height
+
+        if 0 <= page_index < len(self._document):
+            self.on_select(page_index)
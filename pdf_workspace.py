@@ -0,0 +1,188 @@
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+class WorkspaceDocument:
+    """
+        A PDF file in the workspace and its view state.
+
+        The document itself is not held here; it is opened through `DocumentPool`,
+        so closed documents keep their page and zoom level.
+
+        Attributes:
+            filename (str): Absolute path of the PDF file.
+            key      (str): Content hash of the file, used in render cache keys.
+            page     (int): Zero-based index of the displayed page.
+            zoom   (float): Zoom level.
+            page_sizes (Optional[List[Tuple[float, float]]]): Width and height of every page in points, read on first use.
+    """
+    def __init__(self, filename: str, key: str) -> None:
+        """
+            Initialize the view state of a newly added document.
+
+            Args:
+                filename (str): Path of the PDF file.
+                key      (str): Content hash of the file.
+        """
+        self.filename = os.path.abspath(filename)
+        self.key = key
+        self.page = 0
+        self.zoom = 1.0
+        self.page_sizes: Optional[List[Tuple[float, float]]] = None
+
+    def get_page_sizes(self, document) -> List[Tuple[float, float]]:
+        """
+            Return the page sizes, reading them from the document on first use.
+
+            Args:
+                document (fitz.Document): The open document of this file.
+
+            Returns:
+                List[Tuple[float, float]]: Width and height of every page in points.
+        """
+        if self.page_sizes is None:
+            self.page_sizes = [(page.rect.width, page.rect.height) for page in document]
+
+        return self.page_sizes
+
+    def rekey(self, key: str) -> None:
+        """
+            Adopt the content hash of a file that was replaced on disk, so its pages are cached under the new contents.
+
+            Args:
+                key (str): Content hash of the new file contents.
+        """
+        self.key = key
+        self.page_sizes = None
+
+    @property
+    def title(self) -> str:
+        """
+            Return the file name shown in the document list.
+
+            Returns:
+                str: Base name of the file.
+        """
+        return os.path.basename(self.filename)
+
+class DocumentPool:
+    """
+        Bounded LRU pool of open PDF documents.
+
+        Documents are opened on first access and kept open, so switching between them does not
+        reopen the file. When more than `max_open` documents are open, the least recently used
+        ones are closed; they are reopened transparently on their next access.
+        The active (displayed) document is never closed by the pool.
+        The pool is not thread-safe; it must only be used from the Tk main thread.
+
+        Attributes:
+            max_open          (int): Maximum number of open documents.
+            active (Optional[str]): Absolute path of the displayed document.
+    """
+    def __init__(self, max_open: int) -> None:
+        """
+            Initialize an empty pool.
+
+            Args:
+                max_open (int): Maximum number of open documents (at least 1).
+        """
+        self.max_open = max(1, max_open)
+        self.active: Optional[str] = None
+        self._documents: OrderedDict = OrderedDict()   # absolute path -> fitz.Document
+
+    def get(self, filename: str, activate: bool = False):
+        """
+            Return the open document of a file, opening it if necessary.
+
+            Args:
+                filename           (str): Path of the PDF file.
+                activate (bool, optional): Make it the active document. Defaults to False.
+
+            Returns:
+                fitz.Document: The open document.
+
+            Raises:
+                FileNotFoundError: If the file does not exist.
+                PermissionError: If the file cannot be read.
+        """
+        filename = os.path.abspath(filename)
+        document = self._documents.get(filename)
+
+        if document is None:
+            import fitz
+
+            if not os.path.exists(filename):
+                raise FileNotFoundError(filename)   # fitz raises its own error type for missing files
+
+            document = fitz.open(filename)
+            self._documents[filename] = document
+        else:
+            self._documents.move_to_end(filename)
+
+        if activate:
+            self.active = filename
+
+        # close the least recently used documents, except the requested and the active one
+        excess = len(self._documents) - self.max_open
+
+        if excess > 0:
+            for evicted in [name for name in self._documents if name not in (filename, self.active)][:excess]:
+                self._documents.pop(evicted).close()
+
+        return document
+
+    def close(self, filename: str) -> None:
+        """
+            Close a document if it is open.
+
+            Args:
+                filename (str): Path of the PDF file.
+        """
+        filename = os.path.abspath(filename)
+        document = self._documents.pop(filename, None)
+
+        if filename == self.active:
+            self.active = None
+
+        if document is not None:
+            document.close()
+
+    def close_all(self) -> None:
+        """
+            Close all open documents.
+        """
+        for document in self._documents.values():
+            document.close()
+
+        self._documents.clear()
+        self.active = None
+
+    def open_files(self) -> List[str]:
+        """
+            List the files whose documents are open, least recently used first.
+
+            Returns:
+                List[str]: Absolute paths.
+        """
+        return list(self._documents)
+
+    def __contains__(self, filename: str) -> bool:
+        return os.path.abspath(filename) in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+def find_document(documents: List[WorkspaceDocument], filename: str) -> Optional[int]:
+    """
+        Find a file in the workspace.
+
+        Args:
+            documents (List[WorkspaceDocument]): Documents of the workspace.
+            filename                       (str): Path of the PDF file.
+
+        Returns:
+            Optional[int]: Index of the document, or None if the file is not in the workspace.
+    """
+    filename = os.path.abspath(filename)
+
+    return next((index for index, document in enumerate(documents) if document.filename == filename), None)
@@ -0,0 +1,291 @@
+import re
+import time
+import tkinter as tk
+from tkinter import messagebox, ttk
+from typing import Callable, List
+
+from config import *
+from income import available_years, get_income_table, income_sweep
+
+class PlanningWindow:
+    """
+        Window for payroll planning: the yearly salary yielding an income amount, and the income
+        amounts over a grid of yearly salaries and bonuses.
+
+        The inverse is exact (`IncomeTable.salary_ranges`); the grid is computed in one vectorized
+        call (`income_sweep`) and shown as a table of evenly spaced rows and as a chart with one
+        line per bonus amount, so large grids stay responsive.
+
+        Attributes:
+            window                   (tk.Toplevel): The window.
+            format_amount (Callable[[int], str]): Formats an amount with thousands separators.
+            year_var                (tk.StringVar): Selected tax year.
+            sweep                          (Tuple): (salaries, bonuses, incomes) of the last grid, or None.
+    """
+    def __init__(self, root: tk.Tk, format_amount: Callable[[int], str]) -> None:
+        """
+            Create the window and its widgets.
+
+            Args:
+                root                         (tk.Tk): The main application window.
+                format_amount (Callable[[int], str]): Formats an amount with thousands separators.
+        """
+        self.format_amount = format_amount
+        self.sweep = None
+
+        self.window = tk.Toplevel(root)
+        self.window.title(UI_CONFIG['PLANNING_TITLE'])
+
+        frame = ttk.Frame(self.window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_rowconfigure(3, weight=1)
+
+        vcmd = (self.window.register(lambda text: re.fullmatch(r'[\d, \s]*', text) is not None), '%P')
+
+        # tax year
+        year_frame = ttk.Frame(frame)
+        year_frame.grid(row=0, column=0, sticky=tk.W, pady=(0, 5))
+
+        ttk.Label(year_frame, text=LABEL_TEXTS['YEAR']).pack(side=tk.LEFT)
+        self.year_var = tk.StringVar(value=str(RULES_CONFIG['DEFAULT_YEAR']))
+        years = [str(year) for year in range(available_years()[0], RULES_CONFIG['DEFAULT_YEAR'] + 2)]
+        ttk.Combobox(year_frame, textvariable=self.year_var, values=years, width=6, state='readonly').pack(side=tk.LEFT, padx=5)
+
+        # inverse: income amount -> yearly salary
+        inverse_frame = ttk.LabelFrame(frame, text=UI_CONFIG['INVERSE_TITLE'], padding=5)
+        inverse_frame.grid(row=1, column=0, sticky=(tk.W, tk.E), pady=5)
+
+        ttk.Label(inverse_frame, text=LABEL_TEXTS['TARGET_INCOME']).grid(row=0, column=0, sticky=tk.W)
+        self.income_var = tk.StringVar()
+        income_entry = ttk.Entry(inverse_frame, textvariable=self.income_var, validate='key', validatecommand=vcmd)
+        income_entry.grid(row=0, column=1, padx=5)
+        income_entry.bind('<Return>', lambda event: self.solve())
+        ttk.Button(inverse_frame, text=BUTTON_TEXTS['SOLVE'], command=self.solve).grid(row=0, column=2, padx=5)
+
+        self.inverse_label = ttk.Label(inverse_frame, text='', justify=tk.LEFT)
+        self.inverse_label.grid(row=1, column=0, columnspan=3, sticky=tk.W, pady=(5, 0))
+
+        # sweep: yearly salary x bonus grid
+        sweep_frame = ttk.LabelFrame(frame, text=UI_CONFIG['SWEEP_TITLE'], padding=5)
+        sweep_frame.grid(row=2, column=0, sticky=(tk.W, tk.E), pady=5)
+
+        self.range_vars = {}
+
+        for row, name in enumerate(('SALARY', 'BONUS')):
+            ttk.Label(sweep_frame, text=LABEL_TEXTS[f'SWEEP_{name}']).grid(row=row, column=0, sticky=tk.W)
+
+            for column, (part, default) in enumerate(zip(('START', 'STOP', 'STEP'), UI_CONFIG[f'SWEEP_{name}_RANGE'])):
+                ttk.Label(sweep_frame, text=LABEL_TEXTS[f'SWEEP_{part}']).grid(row=row, column=column * 2 + 1, padx=(5, 0))
+                var = self.range_vars[name, part] = tk.StringVar(value=f'{default:,}')
+                ttk.Entry(sweep_frame, textvariable=var, width=12, validate='key', validatecommand=vcmd).grid(row=row, column=column * 2 + 2, pady=2)
+
+        ttk.Button(sweep_frame, text=BUTTON_TEXTS['SWEEP'], command=self.run_sweep).grid(row=0, column=7, rowspan=2, padx=5)
+        self.sweep_status = ttk.Label(sweep_frame, text='')
+        self.sweep_status.grid(row=2, column=0, columnspan=8, sticky=tk.W, pady=(5, 0))
+
+        # results as table and chart
+        notebook = ttk.Notebook(frame)
+        notebook.grid(row=3, column=0, sticky=(tk.N, tk.S, tk.W, tk.E))
+
+        table_frame = ttk.Frame(notebook)
+        table_frame.grid_rowconfigure(0, weight=1)
+        table_frame.grid_columnconfigure(0, weight=1)
+        self.table = ttk.Treeview(table_frame, show='headings', height=15)
+        self.table.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.W, tk.E))
+        table_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.table.yview)
+        table_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.table.config(yscrollcommand=table_scrollbar.set)
+        notebook.add(table_frame, text=UI_CONFIG['SWEEP_TABLE_TITLE'])
+
+        self.chart = tk.Canvas(notebook, background='white', width=640, height=360)
+        self.chart.bind('<Configure>', lambda event: self.draw_chart())
+        notebook.add(self.chart, text=UI_CONFIG['SWEEP_CHART_TITLE'])
+
+    def read_amount(self, var: tk.StringVar) -> int:
+        """
+            Convert an entry text into an amount, ignoring commas and spaces.
+
+            Args:
+                var (tk.StringVar): Variable of the entry.
+
+            Returns:
+                int: The amount.
+
+            Raises:
+                ValueError: If the text has no digits.
+        """
+        return int(re.sub(r'[^\d]', '', var.get()))
+
+    def solve(self) -> None:
+        """
+            Show the yearly salaries yielding the entered income amount.
+
+            If no salary yields the amount exactly (it falls between two steps), the lowest
+            salary exceeding it is shown instead.
+        """
+        try:
+            income = self.read_amount(self.income_var)
+        except ValueError:
+            messagebox.showerror('Error', ERROR_MESSAGES['INVALID_INPUT'], parent=self.window)
+
+            return
+
+        table = get_income_table(int(self.year_var.get()))
+        ranges = table.salary_ranges(income)
+
+        if ranges:
+            lines = [f'{self.format_amount(low)} 円' if low == high else
+                     f'{self.format_amount(low)} 円 〜 ' + (f'{self.format_amount(high)} 円' if high is not None else '') for low, high in ranges]
+        else:
+            salary = table.min_salary(income)
+            lines = [LABEL_TEXTS['NO_EXACT_SALARY']]
+
+            if salary is not None:
+                lines.append(f'{self.format_amount(salary)} 円 (給与所得金額 {self.format_amount(table.income(salary))} 円)')
+
+        self.inverse_label['text'] = '\n'.join(lines)
+
+    def read_range(self, name: str) -> List[int]:
+        """
+            Read a start / stop / step range of the sweep inputs.
+
+            Args:
+                name (str): 'SALARY' or 'BONUS'.
+
+            Returns:
+                List[int]: (start, stop, step), stop inclusive.
+
+            Raises:
+                ValueError: If an input is empty, the step is zero, the range is empty or above `BATCH_CONFIG['MAX_AMOUNT']`.
+        """
+        start, stop, step = (self.read_amount(self.range_vars[name, part]) for part in ('START', 'STOP', 'STEP'))
+
+        if step <= 0 or stop < start or stop > BATCH_CONFIG['MAX_AMOUNT']:
+            raise ValueError(name)
+
+        return [start, stop, step]
+
+    def run_sweep(self) -> None:
+        """
+            Calculate the income amounts over the salary and bonus grid and show them.
+        """
+        import numpy as np
+
+        try:
+            salary_range = self.read_range('SALARY')
+            bonus_range = self.read_range('BONUS')
+        except ValueError:
+            messagebox.showerror('Error', ERROR_MESSAGES['INVALID_SWEEP_RANGE'], parent=self.window)
+
+            return
+
+        # check the grid size before allocating anything
+        salary_count = (salary_range[1] - salary_range[0]) // salary_range[2] + 1
+        bonus_count = (bonus_range[1] - bonus_range[0]) // bonus_range[2] + 1
+
+        if bonus_count > UI_CONFIG['SWEEP_MAX_BONUSES'] or salary_count * bonus_count > UI_CONFIG['SWEEP_MAX_POINTS']:
+            messagebox.showerror('Error', ERROR_MESSAGES['SWEEP_TOO_LARGE'], parent=self.window)
+
+            return
+
+        salaries = np.arange(salary_range[0], salary_range[1] + 1, salary_range[2], dtype=np.int64)
+        bonuses = np.arange(bonus_range[0], bonus_range[1] + 1, bonus_range[2], dtype=np.int64)
+
+        start = time.perf_counter()
+        incomes = income_sweep(salaries, bonuses, int(self.year_var.get()))
+        elapsed = time.perf_counter() - start
+
+        self.sweep = salaries, bonuses, incomes
+        self.sweep_status['text'] = f'{len(salaries):,} × {len(bonuses):,} 点 ({elapsed * 1000:.1f} ms)'
+        self.fill_table()
+        self.draw_chart()
+
+    def sample_rows(self, count: int, limit: int) -> List[int]:
+        """
+            Choose evenly spaced row indexes, always including the first and the last row.
+
+            Args:
+                count (int): Number of rows.
+                limit (int): Maximum number of indexes.
+
+            Returns:
+                List[int]: Ascending row indexes.
+        """
+        if count <= limit:
+            return list(range(count))
+
+        return sorted({round(i * (count - 1) / (limit - 1)) for i in range(limit)})
+
+    def fill_table(self) -> None:
+        """
+            Show the grid as a table: one row per yearly salary, one column per bonus amount.
+
+            Large grids are thinned out to `UI_CONFIG['SWEEP_TABLE_ROWS']` evenly spaced rows.
+        """
+        salaries, bonuses, incomes = self.sweep
+        columns = ['salary', *(f'bonus{i}' for i in range(len(bonuses)))]
+
+        self.table.delete(*self.table.get_children())
+        self.table.config(columns=columns)
+        self.table.heading('salary', text=LABEL_TEXTS['SWEEP_SALARY'])
+        self.table.column('salary', anchor=tk.E, width=110)
+
+        for i, bonus in enumerate(bonuses.tolist()):
+            self.table.heading(f'bonus{i}', text=f'賞与 {self.format_amount(bonus)}')
+            self.table.column(f'bonus{i}', anchor=tk.E, width=100)
+
+        rows = self.sample_rows(len(salaries), UI_CONFIG['SWEEP_TABLE_ROWS'])
+
+        for row in rows:
+            self.table.insert('', tk.END, values=[self.format_amount(salaries[row].item()), *map(self.format_amount, incomes[row].tolist())])
+
+        if len(rows) < len(salaries):
+            self.sweep_status['text'] += f'  表は {len(rows):,} 行を抜粋'
+
+    def draw_chart(self) -> None:
+        """
+            Draw the grid as a chart: income amount over yearly salary, one line per bonus amount.
+
+            Each line has at most one point per pixel column.
+        """
+        self.chart.delete('all')
+
+        if self.sweep is None:
+            return
+
+        salaries, bonuses, incomes = self.sweep
+        width, height = self.chart.winfo_width(), self.chart.winfo_height()
+        left, top, right, bottom = 90, 20, width - 20, height - 40
+
+        if right <= left or bottom <= top:
+            return
+
+        x_min, x_max = salaries[0].item(), max(salaries[-1].item(), salaries[0].item() + 1)
+        y_min, y_max = incomes.min().item(), max(incomes.max().item(), incomes.min().item() + 1)
+
+        def x(value: int) -> float:
+            return left + (value - x_min) * (right - left) / (x_max - x_min)
+
+        def y(value: int) -> float:
+            return bottom - (value - y_min) * (bottom - top) / (y_max - y_min)
+
+        # axes with the ranges at the corners
+        self.chart.create_line(left, top, left, bottom, right, bottom)
+        self.chart.create_text(left - 5, top, text=self.format_amount(y_max), anchor=tk.E)
+        self.chart.create_text(left - 5, bottom, text=self.format_amount(y_min), anchor=tk.E)
+        self.chart.create_text(left, bottom + 5, text=self.format_amount(x_min), anchor=tk.N)
+        self.chart.create_text(right, bottom + 5, text=self.format_amount(x_max), anchor=tk.NE)
+        self.chart.create_text((left + right) / 2, bottom + 20, text=LABEL_TEXTS['SWEEP_SALARY'], anchor=tk.N)
+
+        rows = self.sample_rows(len(salaries), max(2, right - left))
+        colors = UI_CONFIG['SWEEP_COLORS']
+
+        for i, bonus in enumerate(bonuses.tolist()):
+            color = colors[i % len(colors)]
+            points = [coordinate for row in rows for coordinate in (x(salaries[row].item()), y(incomes[row, i].item()))]
+
+            if len(points) >= 4:
+                self.chart.create_line(*points, fill=color)
+
+            self.chart.create_text(left + 10, top + 14 * i, text=f'賞与 {self.format_amount(bonus)}', fill=color, anchor=tk.NW)
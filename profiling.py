@@ -0,0 +1,247 @@
+import csv
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+from config import UI_CONFIG
+
+# NOTE: this module must not import tkinter so that headless modules can be instrumented
+
+# upper bounds of the histogram buckets in milliseconds (1-2-5 series); slower samples go to the last bucket
+BUCKET_BOUNDS_MS: List[float] = [0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf')]
+
+_NULL_SECTION = nullcontext()
+
+class RollingHistogram:
+    """
+        Timings of the most recent samples of one operation.
+
+        The last `window` samples are kept in a ring buffer; the bucket counts are updated
+        incrementally as samples enter and leave the window, so recording is O(log buckets).
+
+        Attributes:
+            samples (deque): Durations of the samples in the window, in seconds.
+            counts (List[int]): Number of samples in the window per bucket of `BUCKET_BOUNDS_MS`.
+            total_count  (int): Number of samples recorded since the start, including those that left the window.
+    """
+    def __init__(self, window: int) -> None:
+        """
+            Initialize an empty histogram.
+
+            Args:
+                window (int): Number of recent samples kept.
+        """
+        self.samples = deque(maxlen=window)
+        self.counts = [0] * len(BUCKET_BOUNDS_MS)
+        self.total_count = 0
+
+    def add(self, seconds: float) -> None:
+        """
+            Record a sample, dropping the oldest one if the window is full.
+
+            Args:
+                seconds (float): Duration of the sample.
+        """
+        if len(self.samples) == self.samples.maxlen:
+            self.counts[bisect_left(BUCKET_BOUNDS_MS, self.samples[0] * 1000)] -= 1
+
+        self.samples.append(seconds)
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, seconds * 1000)] += 1
+        self.total_count += 1
+
+    def summary(self) -> Dict[str, float]:
+        """
+            Summarize the samples in the window.
+
+            Returns:
+                Dict[str, float]: Count, mean, 50th/90th/99th percentile and maximum (in milliseconds) of the window.
+        """
+        samples = sorted(self.samples)
+        count = len(samples)
+
+        if not count:
+            return {'count': 0, 'total_count': self.total_count, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p90_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+
+        def percentile(p: float) -> float:
+            return samples[min(count - 1, int(p * count))] * 1000
+
+        return {'count': count, 'total_count': self.total_count, 'mean_ms': sum(samples) / count * 1000,
+                'p50_ms': percentile(0.5), 'p90_ms': percentile(0.9), 'p99_ms': percentile(0.99), 'max_ms': samples[-1] * 1000}
+
+class _Section:
+    """
+        Context manager recording the time spent in its block.
+    """
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: 'Profiler', name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+class Profiler:
+    """
+        Collect timings of named operations in rolling histograms.
+
+        Disabled, `section` returns a shared no-op context manager and `profiled` functions only
+        check `enabled` before calling through, so the hooks can stay in the hot paths.
+        Samples may be recorded from any thread.
+
+        Attributes:
+            enabled (bool): True while timings are recorded.
+            window   (int): Number of recent samples kept per operation.
+            histograms (Dict[str, RollingHistogram]): Histogram of each operation, by name.
+    """
+    def __init__(self, window: int = UI_CONFIG['PROFILE_WINDOW'], enabled: bool = False) -> None:
+        """
+            Initialize a profiler without samples.
+
+            Args:
+                window  (int, optional): Number of recent samples kept per operation. Defaults to `UI_CONFIG['PROFILE_WINDOW']`.
+                enabled (bool, optional): Record timings from the start. Defaults to False.
+        """
+        self.enabled = enabled
+        self.window = window
+        self.histograms: Dict[str, RollingHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+            Add a sample to the histogram of an operation.
+
+            Args:
+                name       (str): Name of the operation.
+                seconds (float): Duration of the operation.
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.window)
+
+            histogram.add(seconds)
+
+    def section(self, name: str):
+        """
+            Time a block of code.
+
+            Usage:
+                with PROFILER.section('display_page.blit'):
+                    ...
+
+            Args:
+                name (str): Name of the operation.
+
+            Returns:
+                A context manager recording the time spent in the block, or a no-op one while disabled.
+        """
+        return _Section(self, name) if self.enabled else _NULL_SECTION
+
+    def clear(self) -> None:
+        """
+            Discard all samples.
+        """
+        with self._lock:
+            self.histograms.clear()
+
+    def summaries(self) -> Dict[str, Dict[str, float]]:
+        """
+            Summarize every operation, see `RollingHistogram.summary`.
+
+            Returns:
+                Dict[str, Dict[str, float]]: Summary of each operation, sorted by name.
+        """
+        with self._lock:
+            return {name: self.histograms[name].summary() for name in sorted(self.histograms)}
+
+    def export_json(self, path: str) -> None:
+        """
+            Write the summaries and bucket counts of every operation as JSON.
+
+            Args:
+                path (str): Output file.
+        """
+        summaries = self.summaries()
+
+        with self._lock:
+            for name, summary in summaries.items():
+                summary['buckets'] = [[bound if bound != float('inf') else None, count] for bound, count in zip(BUCKET_BOUNDS_MS, self.histograms[name].counts)]
+
+        meta = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'window': self.window, 'bucket_unit': 'ms'}
+
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta, 'operations': summaries}, f, ensure_ascii=False, indent=2)
+
+    def export_csv(self, path: str) -> None:
+        """
+            Write the summaries and bucket counts of every operation as CSV, one row per operation.
+
+            Args:
+                path (str): Output file.
+        """
+        summaries = self.summaries()
+        columns = ['count', 'total_count', 'mean_ms', 'p50_ms', 'p90_ms', 'p99_ms', 'max_ms']
+        buckets = [f'le_{bound:g}ms' if bound != float('inf') else 'gt_5000ms' for bound in BUCKET_BOUNDS_MS]
+
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['name', *columns, *buckets])
+
+            with self._lock:
+                for name, summary in summaries.items():
+                    writer.writerow([name, *(round(summary[column], 3) for column in columns), *self.histograms[name].counts])
+
+    def export(self, path: str) -> None:
+        """
+            Write the timings as CSV if the file name ends with `.csv`, otherwise as JSON.
+
+            Args:
+                path (str): Output file.
+        """
+        if path.lower().endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+# the profiler shared by the application; enabled from the start if the environment variable is set
+PROFILER = Profiler(enabled=bool(os.environ.get(UI_CONFIG['PROFILE_ENV'])))
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+        Decorator recording the duration of every call of a function in `PROFILER`.
+
+        Args:
+            name (Optional[str], optional): Name of the operation. Defaults to the function name.
+
+        Returns:
+            Callable[[Callable], Callable]: The decorator.
+    """
+    def decorator(function: Callable) -> Callable:
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+
+            start = time.perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                PROFILER.record(label, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,450 @@
+import csv
+import re
+import tkinter as tk
+from tkinter import filedialog, messagebox, ttk
+from typing import Callable, List, Optional, Tuple
+
+from config import *
+from income import calculate_income
+
+class RosterWindow:
+    """
+        Virtualized grid of an employee roster loaded from CSV, with per-row results and column totals.
+
+        The CSV has the same columns as for `batch.py` (`1月`-`12月` or `月額給与`, `賞与1`, `賞与2`,
+        optionally `年分` and `氏名`). Only the rows in view have canvas items: a fixed pool of text
+        items is refilled as the view scrolls, so scrolling costs the same for 100 or 100,000 rows.
+        Editing an amount recalculates only that row through `calculate_income`, and the column
+        totals are updated by the difference instead of being summed again.
+
+        Attributes:
+            window                   (tk.Toplevel): The window.
+            format_amount (Callable[[int], str]): Formats an amount with thousands separators.
+            header                       (List[str]): Header row of the loaded CSV.
+            rows                   (List[List[str]]): Data rows of the loaded CSV; edited amounts are written back on save.
+            amounts                (List[List[int]]): Salary and bonus amounts of each row, in the order of `amount_indexes`.
+            years            (List[Optional[int]]): Tax year of each row, or None for the default year.
+            results          (List[Tuple[int, int]]): (yearly salary, income amount) of each row.
+            totals                       (List[int]): Total of each amount column followed by the two result columns.
+            top                                (int): Index of the first row in view.
+    """
+    def __init__(self, root: tk.Tk, format_amount: Callable[[int], str]) -> None:
+        """
+            Create the window and its widgets.
+
+            Args:
+                root                         (tk.Tk): The main application window.
+                format_amount (Callable[[int], str]): Formats an amount with thousands separators.
+        """
+        self.format_amount = format_amount
+        self.row_height = UI_CONFIG['ROSTER_ROW_HEIGHT']
+
+        self.header: List[str] = []
+        self.rows: List[List[str]] = []
+        self.amounts: List[List[int]] = []
+        self.years: List[Optional[int]] = []
+        self.results: List[Tuple[int, int]] = []
+        self.totals: List[int] = []
+        self.amount_indexes: List[int] = []     # CSV column of each amount
+        self.salary_count = 0
+        self.single = True
+        self.name_index: Optional[int] = None
+        self.top = 0
+
+        self.window = tk.Toplevel(root)
+        self.window.title(UI_CONFIG['ROSTER_TITLE'])
+
+        toolbar = ttk.Frame(self.window, padding=5)
+        toolbar.pack(side=tk.TOP, fill=tk.X)
+        ttk.Button(toolbar, text=BUTTON_TEXTS['LOAD_ROSTER'], command=self.open_file).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text=BUTTON_TEXTS['SAVE_ROSTER'], command=self.save_file).pack(side=tk.LEFT, padx=5)
+        self.status = ttk.Label(toolbar, text='')
+        self.status.pack(side=tk.LEFT, padx=10)
+
+        # header, rows and totals scroll together horizontally; rows are virtualized vertically
+        grid = ttk.Frame(self.window)
+        grid.pack(fill=tk.BOTH, expand=True)
+        grid.grid_rowconfigure(1, weight=1)
+        grid.grid_columnconfigure(0, weight=1)
+
+        self.header_canvas = tk.Canvas(grid, height=self.row_height, background='gray90', highlightthickness=0)
+        self.header_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E))
+        self.body_canvas = tk.Canvas(grid, width=900, height=self.row_height * 25, background='white', highlightthickness=0)
+        self.body_canvas.grid(row=1, column=0, sticky=(tk.N, tk.S, tk.W, tk.E))
+        self.footer_canvas = tk.Canvas(grid, height=self.row_height, background='gray90', highlightthickness=0)
+        self.footer_canvas.grid(row=2, column=0, sticky=(tk.W, tk.E))
+
+        self.y_scrollbar = ttk.Scrollbar(grid, orient=tk.VERTICAL, command=self.scroll)
+        self.y_scrollbar.grid(row=1, column=1, sticky=(tk.N, tk.S))
+        x_scrollbar = ttk.Scrollbar(grid, orient=tk.HORIZONTAL, command=self.scroll_x)
+        x_scrollbar.grid(row=3, column=0, sticky=(tk.W, tk.E))
+        self.body_canvas.config(xscrollcommand=x_scrollbar.set)
+
+        self.body_canvas.bind('<Configure>', lambda event: self.layout_slots())
+        self.body_canvas.bind('<Double-Button-1>', self.begin_edit)
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.body_canvas.bind(sequence, self.handle_mouse_wheel)
+
+        self.slots: List[List[int]] = []     # text items of each visible row; item 0 is the row background
+        self.footer_items: List[int] = []
+        self.editor = None                   # (entry, canvas window item, row, amount index) while a cell is edited
+
+    @property
+    def titles(self) -> List[str]:
+        """
+            Return the column titles: number, name (if any), amounts and results.
+        """
+        names = [LABEL_TEXTS['ROSTER_NUMBER']] + ([self.header[self.name_index]] if self.name_index is not None else [])
+
+        return names + [self.header[index] for index in self.amount_indexes] + [BATCH_CONFIG['TOTAL_YEARLY_SALARY_COLUMN'], BATCH_CONFIG['INCOME_AMOUNT_COLUMN']]
+
+    @property
+    def first_amount_column(self) -> int:
+        """
+            Return the display column of the first amount.
+        """
+        return 1 if self.name_index is None else 2
+
+    def column_x(self, column: int) -> int:
+        """
+            Return the left edge of a display column in pixels.
+
+            Args:
+                column (int): Display column index.
+
+            Returns:
+                int: x coordinate.
+        """
+        return column * UI_CONFIG['ROSTER_COLUMN_WIDTH']
+
+    def open_file(self) -> None:
+        """
+            Ask for a roster CSV and load it.
+        """
+        path = filedialog.askopenfilename(parent=self.window, filetypes=[('CSV', '*.csv')])
+
+        if path:
+            self.load(path)
+
+    def load(self, path: str) -> None:
+        """
+            Load a roster CSV and calculate every row.
+
+            The displayed roster is replaced only if every row could be read and calculated.
+
+            Args:
+                path (str): Path of the CSV file.
+        """
+        from batch import read_amounts, resolve_columns
+
+        self.cancel_edit()
+
+        try:
+            with open(path, newline='', encoding=BATCH_CONFIG['ENCODING']) as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                rows = list(reader)
+
+            salary_indexes, single, bonus_indexes, year_index = resolve_columns(header)
+            amounts = read_amounts(rows, salary_indexes + bonus_indexes)
+            years = [year for year, in read_amounts(rows, [year_index])] if year_index is not None else [None] * len(rows)
+            results = []
+
+            for line, (row_amounts, year) in enumerate(zip(amounts, years), 2):
+                try:
+                    results.append(self.calculate_amounts(row_amounts, year, len(salary_indexes), single))
+                except ValueError as e:
+                    raise ValueError(f'{e} ({line} 行目)') from None     # a year without rules
+        except (OSError, ValueError) as e:
+            messagebox.showerror('Error', str(e) if isinstance(e, ValueError) else ERROR_MESSAGES['ROSTER_FILE_ERROR'], parent=self.window)
+
+            return
+
+        self.header, self.rows, self.amounts, self.years, self.results = header, rows, amounts, years, results
+        self.amount_indexes = salary_indexes + bonus_indexes
+        self.salary_count = len(salary_indexes)
+        self.single = single
+        self.name_index = header.index(UI_CONFIG['ROSTER_NAME_COLUMN']) if UI_CONFIG['ROSTER_NAME_COLUMN'] in header else None
+
+        self.totals = [sum(column) for column in zip(*self.amounts)] + [sum(column) for column in zip(*self.results)] if self.rows else []
+        self.status['text'] = f'{len(self.rows):,} 人'
+        self.top = 0
+        self.draw_header()
+        self.layout_slots()
+
+    def calculate_row(self, row: int) -> Tuple[int, int]:
+        """
+            Calculate one row of the loaded roster through `calculate_income`.
+
+            Args:
+                row (int): Row index.
+
+            Returns:
+                Tuple[int, int]: (yearly salary, income amount).
+        """
+        return self.calculate_amounts(self.amounts[row], self.years[row], self.salary_count, self.single)
+
+    @staticmethod
+    def calculate_amounts(amounts: List[int], year: Optional[int], salary_count: int, single: bool) -> Tuple[int, int]:
+        """
+            Calculate the amounts of one row through `calculate_income`.
+
+            Args:
+                amounts (List[int]): Salary and bonus amounts of the row.
+                year (Optional[int]): Tax year, or None for the default year.
+                salary_count   (int): Number of salary amounts before the bonuses.
+                single        (bool): True if the only salary amount is a monthly salary paid 12 times.
+
+            Returns:
+                Tuple[int, int]: (yearly salary, income amount).
+
+            Raises:
+                ValueError: If no rules cover the year.
+        """
+        monthly = amounts[0] if single else amounts[:salary_count]
+
+        return calculate_income(monthly, sum(amounts[salary_count:]), year=year)
+
+    def draw_header(self) -> None:
+        """
+            Draw the column titles and set the scrollable width of the grid.
+        """
+        self.header_canvas.delete('all')
+        self.footer_canvas.delete('all')
+        self.body_canvas.delete('all')
+        self.slots = []
+        self.footer_items = []
+
+        width = UI_CONFIG['ROSTER_COLUMN_WIDTH']
+        titles = self.titles
+        total_width = self.column_x(len(titles))
+
+        for column, title in enumerate(titles):
+            self.header_canvas.create_text(self.column_x(column) + width - 6, self.row_height // 2, text=title, anchor=tk.E)
+            footer = LABEL_TEXTS['ROSTER_TOTAL'] if column == 0 else ''
+            self.footer_items.append(self.footer_canvas.create_text(self.column_x(column) + width - 6, self.row_height // 2, text=footer, anchor=tk.E))
+
+        for canvas in (self.header_canvas, self.body_canvas, self.footer_canvas):
+            canvas.config(scrollregion=(0, 0, total_width, self.row_height))
+
+        self.draw_totals()
+
+    def layout_slots(self) -> None:
+        """
+            Create or remove row slots so that they fill the visible height, then refill them.
+        """
+        if not self.header:
+            return
+
+        count = self.body_canvas.winfo_height() // self.row_height + 1
+        width = UI_CONFIG['ROSTER_COLUMN_WIDTH']
+        total_width = self.column_x(len(self.titles))
+
+        while len(self.slots) < count:
+            y = len(self.slots) * self.row_height
+            background = self.body_canvas.create_rectangle(0, y, total_width, y + self.row_height, outline='', fill='white' if len(self.slots) % 2 == 0 else 'gray96')
+            items = [self.body_canvas.create_text(self.column_x(column) + width - 6, y + self.row_height // 2, anchor=tk.E) for column in range(len(self.titles))]
+            self.slots.append([background] + items)
+
+        while len(self.slots) > count:
+            self.body_canvas.delete(*self.slots.pop())
+
+        self.body_canvas.config(scrollregion=(0, 0, total_width, count * self.row_height))
+        self.set_top(self.top)
+
+    def row_texts(self, row: int) -> List[str]:
+        """
+            Format the cells of a row.
+
+            Args:
+                row (int): Row index.
+
+            Returns:
+                List[str]: Text of each display column.
+        """
+        cells = self.rows[row]
+        texts = [str(row + 1)] + ([cells[self.name_index] if self.name_index < len(cells) else ''] if self.name_index is not None else [])
+
+        return texts + [self.format_amount(amount) for amount in self.amounts[row]] + [self.format_amount(value) for value in self.results[row]]
+
+    def draw_slot(self, slot: int) -> None:
+        """
+            Show the row at a slot, or empty it below the last row.
+
+            Args:
+                slot (int): Index of the slot from the top of the view.
+        """
+        row = self.top + slot
+        texts = self.row_texts(row) if row < len(self.rows) else [''] * (len(self.slots[slot]) - 1)
+
+        for item, text in zip(self.slots[slot][1:], texts):
+            self.body_canvas.itemconfigure(item, text=text)
+
+    def set_top(self, top: int) -> None:
+        """
+            Scroll so that a row is at the top of the view and refill the slots.
+
+            Args:
+                top (int): Index of the first row to show.
+        """
+        self.commit_edit()
+
+        visible = max(1, len(self.slots) - 1)
+        self.top = max(0, min(top, len(self.rows) - visible))
+
+        for slot in range(len(self.slots)):
+            self.draw_slot(slot)
+
+        if self.rows:
+            self.y_scrollbar.set(self.top / len(self.rows), min(1.0, (self.top + visible) / len(self.rows)))
+        else:
+            self.y_scrollbar.set(0, 1)
+
+    def scroll(self, *args) -> None:
+        """
+            Scroll the rows from the vertical scrollbar.
+
+            Args:
+                *args: Scrollbar command: ('moveto', fraction) or ('scroll', number, 'units' | 'pages').
+        """
+        if args[0] == 'moveto':
+            self.set_top(int(float(args[1]) * len(self.rows)))
+        elif args[0] == 'scroll':
+            step = max(1, len(self.slots) - 2) if args[2] == 'pages' else 1
+            self.set_top(self.top + int(args[1]) * step)
+
+    def scroll_x(self, *args) -> None:
+        """
+            Scroll the header, rows and totals together horizontally.
+
+            Args:
+                *args: Scrollbar command, passed to `xview`.
+        """
+        self.commit_edit()
+
+        for canvas in (self.header_canvas, self.body_canvas, self.footer_canvas):
+            canvas.xview(*args)
+
+    def handle_mouse_wheel(self, event: tk.Event) -> None:
+        """
+            Scroll three rows per wheel step.
+
+            Args:
+                event (tk.Event): Mouse wheel event.
+        """
+        direction = -1 if event.num == 4 or event.delta > 0 else 1
+        self.set_top(self.top + direction * 3)
+
+    def draw_totals(self) -> None:
+        """
+            Show the column totals in the footer.
+        """
+        first = self.first_amount_column
+
+        for item, total in zip(self.footer_items[first:], self.totals):
+            self.footer_canvas.itemconfigure(item, text=self.format_amount(total))
+
+    def begin_edit(self, event: tk.Event) -> None:
+        """
+            Open an editor over the double-clicked amount cell.
+
+            Args:
+                event (tk.Event): Mouse event.
+        """
+        self.commit_edit()
+
+        slot = int(event.y) // self.row_height
+        column = int(self.body_canvas.canvasx(event.x)) // UI_CONFIG['ROSTER_COLUMN_WIDTH']
+        index = column - self.first_amount_column
+        row = self.top + slot
+
+        if row >= len(self.rows) or not 0 <= index < len(self.amount_indexes):
+            return      # not an amount cell
+
+        var = tk.StringVar(value=str(self.amounts[row][index]))
+        vcmd = (self.window.register(lambda text: re.fullmatch(r'[\d, \s]*', text) is not None), '%P')
+        entry = ttk.Entry(self.body_canvas, textvariable=var, justify=tk.RIGHT, validate='key', validatecommand=vcmd)
+        entry.var = var
+        item = self.body_canvas.create_window(self.column_x(column), slot * self.row_height, window=entry, anchor=tk.NW,
+                                              width=UI_CONFIG['ROSTER_COLUMN_WIDTH'], height=self.row_height)
+        entry.bind('<Return>', lambda event: self.commit_edit())
+        entry.bind('<Escape>', lambda event: self.cancel_edit())
+        entry.bind('<FocusOut>', lambda event: self.commit_edit())
+        entry.focus_set()
+        entry.select_range(0, tk.END)
+
+        self.editor = entry, item, row, index
+
+    def commit_edit(self) -> None:
+        """
+            Apply the value of the open editor, if any, and close it.
+        """
+        if self.editor is None:
+            return
+
+        entry, _, row, index = self.editor
+        value = int(re.sub(r'[^\d]', '', entry.var.get()) or 0)
+        self.cancel_edit()
+        self.set_amount(row, index, value)
+
+    def cancel_edit(self) -> None:
+        """
+            Close the open editor, if any, without applying its value.
+        """
+        if self.editor is None:
+            return
+
+        entry, item, _, _ = self.editor
+        self.editor = None      # before destroying, which fires <FocusOut>
+        self.body_canvas.delete(item)
+        entry.destroy()
+
+    def set_amount(self, row: int, index: int, value: int) -> None:
+        """
+            Change an amount, recalculate its row and update the totals by the differences.
+
+            Args:
+                row   (int): Row index.
+                index (int): Amount index, see `amount_indexes`.
+                value (int): New amount.
+        """
+        old = self.amounts[row][index]
+
+        if value == old:
+            return
+
+        self.amounts[row][index] = value
+        self.rows[row][self.amount_indexes[index]] = str(value)
+        self.totals[index] += value - old
+
+        old_results = self.results[row]
+        self.results[row] = self.calculate_row(row)
+
+        for offset, (old_value, new_value) in enumerate(zip(old_results, self.results[row])):
+            self.totals[len(self.amount_indexes) + offset] += new_value - old_value
+
+        if 0 <= row - self.top < len(self.slots):
+            self.draw_slot(row - self.top)
+
+        self.draw_totals()
+
+    def save_file(self) -> None:
+        """
+            Save the roster with the edited amounts and the results as CSV.
+        """
+        if not self.rows:
+            return
+
+        path = filedialog.asksaveasfilename(parent=self.window, defaultextension='.csv', filetypes=[('CSV', '*.csv')])
+
+        if not path:
+            return
+
+        try:
+            with open(path, 'w', newline='', encoding=BATCH_CONFIG['ENCODING']) as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(self.header + [BATCH_CONFIG['TOTAL_YEARLY_SALARY_COLUMN'], BATCH_CONFIG['INCOME_AMOUNT_COLUMN']])
+                writer.writerows(row + [str(total), str(income)] for row, (total, income) in zip(self.rows, self.results))
+        except OSError:
+            messagebox.showerror('Error', ERROR_MESSAGES['ROSTER_FILE_ERROR'], parent=self.window)
@@ -0,0 +1,405 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import *
+from income import get_income_table
+from profiling import Profiler
+
+# NOTE: this module must not import tkinter, fitz or PIL so that it can run on headless servers
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large'}
+
+class RequestError(Exception):
+    """
+        Error answered with an HTTP error status and a JSON error message.
+
+        Attributes:
+            status (int): HTTP status code.
+    """
+    def __init__(self, status: int, message: str) -> None:
+        """
+            Args:
+                status  (int): HTTP status code.
+                message (str): Error message for the client.
+        """
+        super().__init__(message)
+        self.status = status
+
+def parse_amount(value: object, name: str, limit: int = BATCH_CONFIG['MAX_AMOUNT']) -> int:
+    """
+        Validate an amount of a request.
+
+        Args:
+            value         (object): Decoded JSON value.
+            name             (str): Field name, for the error message.
+            limit (int, optional): Largest valid value. Defaults to `BATCH_CONFIG['MAX_AMOUNT']`.
+
+        Returns:
+            int: The amount.
+
+        Raises:
+            RequestError: If the value is not an integer from 0 to `limit`.
+    """
+    if type(value) is not int or not 0 <= value <= limit:
+        raise RequestError(400, f'{ERROR_MESSAGES["INVALID_REQUEST_FIELD"]} ({name})')
+
+    return value
+
+def parse_item(item: object) -> Tuple[int, Optional[int]]:
+    """
+        Validate one request item with the same arguments as `income.calculate_income`.
+
+        Args:
+            item (object): Decoded JSON object with `monthly_salaries` (amount or list of up to 12 amounts)
+                           and optional `bonus1`, `bonus2` and `year`.
+
+        Returns:
+            Tuple[int, Optional[int]]: (yearly salary, tax year or None for the default year).
+
+        Raises:
+            RequestError: If a field is missing or invalid.
+    """
+    if not isinstance(item, dict) or 'monthly_salaries' not in item:
+        raise RequestError(400, f'{ERROR_MESSAGES["INVALID_REQUEST_FIELD"]} (monthly_salaries)')
+
+    monthly_salaries = item['monthly_salaries']
+
+    if isinstance(monthly_salaries, list) and len(monthly_salaries) <= 12:
+        yearly_salary = sum(parse_amount(salary, 'monthly_salaries') for salary in monthly_salaries)
+    else:
+        yearly_salary = parse_amount(monthly_salaries, 'monthly_salaries') * 12
+
+    yearly_salary += parse_amount(item.get('bonus1', 0), 'bonus1') + parse_amount(item.get('bonus2', 0), 'bonus2')
+    year = item.get('year')
+
+    if year is not None and parse_amount(year, 'year', SERVER_CONFIG['MAX_YEAR']) == 0:
+        raise RequestError(400, f'{ERROR_MESSAGES["INVALID_REQUEST_FIELD"]} (year)')
+
+    return yearly_salary, year
+
+def calculate_item(item: object) -> Dict[str, int]:
+    """
+        Calculate one request item, see `parse_item`.
+
+        Args:
+            item (object): Decoded JSON object.
+
+        Returns:
+            Dict[str, int]: `yearly_salary` and `income` (income amount after deduction).
+
+        Raises:
+            RequestError: If a field is missing or invalid, or no rules cover the year.
+    """
+    yearly_salary, year = parse_item(item)
+
+    try:
+        table = get_income_table(year)      # compiled once per rule file, shared by all requests
+    except ValueError as e:
+        raise RequestError(400, str(e)) from None
+
+    return {'yearly_salary': yearly_salary, 'income': table.income(yearly_salary)}
+
+def calculate_items(items: List[object]) -> List[Dict[str, int]]:
+    """
+        Calculate many request items: validate them all, then look up the income amounts of each tax year at once.
+
+        Args:
+            items (List[object]): Decoded JSON objects, see `parse_item`.
+
+        Returns:
+            List[Dict[str, int]]: `yearly_salary` and `income` of each item, in order.
+
+        Raises:
+            RequestError: If an item is invalid (the message names its index), or no rules cover a year.
+    """
+    yearly_salaries = np.empty(len(items), dtype=np.int64)
+    years: Dict[Optional[int], List[int]] = {}
+
+    for index, item in enumerate(items):
+        try:
+            yearly_salaries[index], year = parse_item(item)
+        except RequestError as e:
+            raise RequestError(e.status, f'items[{index}]: {e}') from None
+
+        years.setdefault(year, []).append(index)
+
+    incomes = np.empty(len(items), dtype=np.int64)
+
+    for year, indexes in years.items():
+        try:
+            table = get_income_table(year)
+        except ValueError as e:
+            raise RequestError(400, f'items[{indexes[0]}]: {e}') from None
+
+        incomes[indexes] = table.income_array(yearly_salaries[indexes])
+
+    return [{'yearly_salary': yearly_salary, 'income': income} for yearly_salary, income in zip(yearly_salaries.tolist(), incomes.tolist())]
+
+class IncomeServer:
+    """
+        HTTP/1.1 JSON service for the employment income calculation on asyncio.
+
+        Endpoints:
+            POST /income        One calculation: `{"monthly_salaries": 300000, "bonus1": 0, "bonus2": 0, "year": 2024}`.
+            POST /income/batch  Many calculations: `{"items": [...]}` -> `{"results": [...]}`, in order.
+            GET  /metrics       Request counts and latency percentiles per endpoint.
+
+        Connections are kept alive and pipelined requests are answered in order, without
+        waiting for the client to read each response. The rule tables are compiled once per
+        tax year and shared by all requests.
+
+        Attributes:
+            metrics     (Profiler): Latency histograms per endpoint, from request parsed to response queued.
+            calculations     (int): Number of calculated items since the start.
+            started        (float): Start time (`time.time()`).
+    """
+    def __init__(self) -> None:
+        """
+            Initialize the metrics.
+        """
+        self.metrics = Profiler(window=SERVER_CONFIG['METRICS_WINDOW'], enabled=True)
+        self.calculations = 0
+        self.started = time.time()
+        self.routes = {'/income': self.handle_income, '/income/batch': self.handle_batch, '/metrics': self.handle_metrics}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+            Answer the requests of one connection until the client closes it.
+
+            Args:
+                reader (asyncio.StreamReader): Incoming data.
+                writer (asyncio.StreamWriter): Outgoing data.
+        """
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.LimitOverrunError:
+                    break       # header too large
+                except asyncio.IncompleteReadError:
+                    break       # closed by the client
+
+                start = time.perf_counter()
+                keep_alive = True
+
+                try:
+                    method, path, version, headers = self.parse_head(head)
+                    length = int(headers.get('content-length', 0))
+
+                    if length > SERVER_CONFIG['MAX_BODY_BYTES']:
+                        keep_alive = False      # the body is not read, so the connection cannot be reused
+                        raise RequestError(413, ERROR_MESSAGES['REQUEST_TOO_LARGE'])
+
+                    body = await reader.readexactly(length) if length else b''
+                    keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                    status, result = await self.dispatch(method, path.split('?', 1)[0], body)
+                except RequestError as e:
+                    path = 'error'
+                    status, result = e.status, {'error': str(e)}
+                except ValueError:
+                    path, keep_alive = 'error', False
+                    status, result = 400, {'error': ERROR_MESSAGES['INVALID_REQUEST']}
+
+                self.write_response(writer, status, result, keep_alive)
+                self.metrics.record(path if path in self.routes else 'error', time.perf_counter() - start)
+
+                # responses to pipelined requests are buffered; wait for the socket only when it backs up
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def parse_head(self, head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        """
+            Parse the request line and headers.
+
+            Args:
+                head (bytes): Request line and headers, including the empty line.
+
+            Returns:
+                Tuple[str, str, str, Dict[str, str]]: (method, path, HTTP version, headers with lower-case names).
+
+            Raises:
+                ValueError: If the request is malformed.
+        """
+        lines = head.decode('latin-1').split('\r\n')
+        method, path, version = lines[0].split(' ')
+        headers = {}
+
+        for line in lines[1:]:
+            if line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        return method, path, version, headers
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> Tuple[int, object]:
+        """
+            Call the handler of an endpoint.
+
+            Batch requests are decoded and calculated on a worker thread, so that a large batch
+            does not hold up the other connections.
+
+            Args:
+                method (str): HTTP method.
+                path   (str): Request path without query.
+                body (bytes): Request body.
+
+            Returns:
+                Tuple[int, object]: (HTTP status, JSON result).
+
+            Raises:
+                RequestError: If the endpoint does not exist or the request is invalid.
+        """
+        handler = self.routes.get(path)
+
+        if handler is None:
+            raise RequestError(404, ERROR_MESSAGES['UNKNOWN_ENDPOINT'])
+
+        if method != ('GET' if path == '/metrics' else 'POST'):
+            raise RequestError(405, ERROR_MESSAGES['INVALID_METHOD'])
+
+        if path == '/metrics':
+            return 200, handler()
+
+        if path == '/income/batch':
+            return 200, await asyncio.get_running_loop().run_in_executor(None, self.decode_and_handle, handler, body)
+
+        return 200, self.decode_and_handle(handler, body)
+
+    def decode_and_handle(self, handler, body: bytes) -> object:
+        """
+            Decode a JSON request body and call a handler with it.
+
+            Args:
+                handler (Callable[[object], object]): Handler of the endpoint.
+                body                         (bytes): Request body.
+
+            Returns:
+                object: JSON result.
+
+            Raises:
+                RequestError: If the body is not valid JSON or the request is invalid.
+        """
+        try:
+            request = json.loads(body)
+        except (ValueError, RecursionError):     # RecursionError: too deeply nested
+            raise RequestError(400, ERROR_MESSAGES['INVALID_REQUEST']) from None
+
+        return handler(request)
+
+    def handle_income(self, request: object) -> Dict[str, int]:
+        """
+            POST /income: calculate one item.
+
+            Args:
+                request (object): Decoded JSON body, see `calculate_item`.
+
+            Returns:
+                Dict[str, int]: `yearly_salary` and `income`.
+        """
+        result = calculate_item(request)
+        self.calculations += 1
+
+        return result
+
+    def handle_batch(self, request: object) -> Dict[str, List[Dict[str, int]]]:
+        """
+            POST /income/batch: calculate many items; one invalid item fails the whole batch.
+
+            Args:
+                request (object): Decoded JSON body `{"items": [...]}`.
+
+            Returns:
+                Dict[str, List[Dict[str, int]]]: `results`, one per item in order.
+        """
+        items = request.get('items') if isinstance(request, dict) else None
+
+        if not isinstance(items, list):
+            raise RequestError(400, f'{ERROR_MESSAGES["INVALID_REQUEST_FIELD"]} (items)')
+
+        if len(items) > SERVER_CONFIG['MAX_BATCH']:
+            raise RequestError(413, ERROR_MESSAGES['REQUEST_TOO_LARGE'])
+
+        results = calculate_items(items)
+        self.calculations += len(results)
+
+        return {'results': results}
+
+    def handle_metrics(self) -> Dict[str, object]:
+        """
+            GET /metrics: request counts and latency percentiles of the recent requests per endpoint.
+
+            Returns:
+                Dict[str, object]: Uptime, number of calculations and a latency summary per endpoint (see `RollingHistogram.summary`).
+        """
+        return {'uptime_s': round(time.time() - self.started, 3), 'calculations': self.calculations, 'endpoints': self.metrics.summaries()}
+
+    def write_response(self, writer: asyncio.StreamWriter, status: int, result: object, keep_alive: bool) -> None:
+        """
+            Queue a JSON response.
+
+            Args:
+                writer (asyncio.StreamWriter): Outgoing data.
+                status                  (int): HTTP status code.
+                result               (object): JSON result.
+                keep_alive             (bool): Keep the connection open for further requests.
+        """
+        body = json.dumps(result, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        head = (f'HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json; charset=utf-8\r\n'
+                f'Content-Length: {len(body)}\r\nConnection: {"keep-alive" if keep_alive else "close"}\r\n\r\n')
+
+        writer.write(head.encode('latin-1') + body)
+
+    async def serve(self, host: str, port: int) -> None:
+        """
+            Listen for connections until cancelled.
+
+            Args:
+                host (str): Address to listen on.
+                port (int): Port to listen on.
+        """
+        get_income_table()      # compile the default rules before the first request
+
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=SERVER_CONFIG['MAX_HEADER_BYTES'])
+
+        print(f'serving on http://{host}:{port}', file=sys.stderr)
+
+        async with server:
+            await server.serve_forever()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+        Command line entry point for the HTTP/JSON service.
+
+        Usage:
+            python server.py [--host 127.0.0.1] [--port 8080]
+
+        Args:
+            argv (Optional[List[str]], optional): Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(prog='serve', description='給与所得金額の計算を HTTP/JSON で提供します')
+    parser.add_argument('--host', default=SERVER_CONFIG['HOST'], help='待ち受けるアドレス')
+    parser.add_argument('--port', type=int, default=SERVER_CONFIG['PORT'], help='待ち受けるポート')
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(IncomeServer().serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f'Error: {e}', file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
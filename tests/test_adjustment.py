@@ -0,0 +1,131 @@
+import io
+
+import numpy as np
+import pytest
+
+from adjustment import INPUT_COLUMNS, YearEndAdjustment, process_csv
+from config import ADJUSTMENT_CONFIG, BATCH_CONFIG
+
+def random_inputs(rng: np.random.Generator, size: int) -> dict:
+    """
+        Make random input columns of a workforce.
+    """
+    return {
+        'yearly_salary': rng.integers(0, 15_000_000, size),
+        'withheld_tax': rng.integers(0, 600_000, size),
+        'social_insurance': rng.integers(0, 2_000_000, size),
+        'other_deductions': rng.integers(0, 500_000, size),
+        'dependents': rng.integers(0, 3, size),
+        'specific_dependents': rng.integers(0, 2, size),
+        'elderly_dependents': rng.integers(0, 2, size),
+        'housing_loan_credit': rng.integers(0, 200_000, size) * rng.integers(0, 2, size)
+    }
+
+def test_hand_calculation() -> None:
+    """
+        One employee in 2024 (2020 rules): 給与所得金額 3,560,000, 所得控除 1,230,000, 課税所得 2,330,000,
+        所得税 135,500, 年税額 138,300 (incl. reconstruction tax), 過不足額 11,700.
+    """
+    adjustment = YearEndAdjustment({'yearly_salary': [5_000_000], 'withheld_tax': [150_000], 'social_insurance': [750_000]}, 2024)
+    row = adjustment.row(0)
+
+    assert (row['income'], row['basic_deduction'], row['total_deduction']) == (3_560_000, 480_000, 1_230_000)
+    assert (row['taxable_income'], row['computed_tax'], row['annual_tax'], row['settlement']) == (2_330_000, 135_500, 138_300, 11_700)
+
+def test_incremental_compute_matches_full_compute() -> None:
+    """
+        After random changes, the incrementally updated columns equal a computation from scratch.
+    """
+    rng = np.random.default_rng(0)
+    size = 2_000
+    adjustment = YearEndAdjustment(random_inputs(rng, size), 2024)
+    adjustment.compute()
+
+    for _ in range(20):
+        changes = random_inputs(rng, size)
+
+        for column in rng.choice(INPUT_COLUMNS, 3, replace=False):
+            rows = rng.choice(size, 50, replace=False)
+            adjustment.set_values(rows, column, changes[column][rows])
+
+        columns = adjustment.compute()
+        expected = YearEndAdjustment({column: columns[column] for column in INPUT_COLUMNS}, 2024).compute()
+
+        for name, values in expected.items():
+            assert np.array_equal(columns[name], values), name
+
+def test_early_cutoff() -> None:
+    """
+        Only changed rows are recomputed, and unchanged outputs stop the propagation.
+    """
+    adjustment = YearEndAdjustment({'yearly_salary': [5_000_000, 6_000_000, 7_000_000]}, 2024)
+    adjustment.compute()
+
+    assert adjustment.recomputed == {'income': 3, 'deductions': 3, 'tax': 3, 'settlement': 3}
+
+    adjustment.set_value(1, 'yearly_salary', 6_000_000)     # unchanged value
+    adjustment.compute()
+
+    assert adjustment.recomputed == {'income': 0, 'deductions': 0, 'tax': 0, 'settlement': 0}
+
+    adjustment.set_value(0, 'yearly_salary', 5_001_000)     # same 4,000-yen step: the income amount does not change
+    adjustment.compute()
+
+    assert adjustment.recomputed == {'income': 1, 'deductions': 0, 'tax': 0, 'settlement': 0}
+
+    adjustment.set_value(0, 'withheld_tax', 100_000)
+    adjustment.compute()
+
+    assert adjustment.recomputed == {'income': 0, 'deductions': 0, 'tax': 0, 'settlement': 1}
+
+def test_mostly_dirty_stage_is_recomputed_whole() -> None:
+    """
+        A change to most rows recomputes the whole stage, still propagating only the changed outputs.
+    """
+    rng = np.random.default_rng(1)
+    size = 1_000
+    inputs = random_inputs(rng, size)
+    adjustment = YearEndAdjustment(inputs, 2024)
+    adjustment.compute()
+
+    adjustment.set_values(np.arange(size), 'withheld_tax', inputs['withheld_tax'] + 1)
+    columns = adjustment.compute()
+
+    assert adjustment.recomputed == {'income': 0, 'deductions': 0, 'tax': 0, 'settlement': size}
+    assert np.array_equal(columns['settlement'], columns['withheld_tax'] - columns['annual_tax'])
+
+    adjustment.set_values(np.arange(size), 'yearly_salary', inputs['yearly_salary'] + 4_000)
+    columns = adjustment.compute()
+    expected = YearEndAdjustment({column: columns[column] for column in INPUT_COLUMNS}, 2024).compute()
+
+    assert adjustment.recomputed['income'] == size
+
+    for name, values in expected.items():
+        assert np.array_equal(columns[name], values), name
+
+@pytest.mark.parametrize('inputs', [{'yearly_salary': [-300_000]}, {'yearly_salary': [5_000_000], 'dependents': [-2]},
+                                    {'yearly_salary': [10 ** 30]}, {'yearly_salary': [BATCH_CONFIG['MAX_AMOUNT'] + 1]},
+                                    {'yearly_salary': [0], 'elderly_dependents': [ADJUSTMENT_CONFIG['MAX_DEPENDENTS'] + 1]}])
+def test_rejects_out_of_range_inputs(inputs: dict) -> None:
+    """
+        Negative values, values above the limits and values beyond int64 are rejected, at creation and by `set_values`.
+    """
+    with pytest.raises(ValueError):
+        YearEndAdjustment(inputs)
+
+    adjustment = YearEndAdjustment({'yearly_salary': [0]})
+    name, values = next((name, values) for name, values in inputs.items() if name != 'yearly_salary' or len(inputs) == 1)
+
+    with pytest.raises(ValueError):
+        adjustment.set_values([0], name, values)
+
+@pytest.mark.parametrize('cells', ['-300000,0', '5000000,-2', '99999999999999999999999,0', '5000000,100'])
+def test_process_csv_rejects(cells: str) -> None:
+    """
+        An invalid or out-of-range CSV value stops the calculation with `CSV_INVALID_VALUE` and the line number.
+    """
+    columns = ADJUSTMENT_CONFIG['INPUT_COLUMNS']
+    text = f'{columns["yearly_salary"]},{columns["dependents"]}\n5000000,0\n{cells}\n'
+
+    with pytest.raises(ValueError, match='3 行目'):
+        process_csv(io.StringIO(text), io.StringIO())
@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+from batch import parse_amount, process_csv, read_amounts
+from config import BATCH_CONFIG, ERROR_MESSAGES
+
+def test_parse_amount() -> None:
+    """
+        Plain digits, thousands separators and empty cells are accepted.
+    """
+    assert parse_amount('250000') == 250_000
+    assert parse_amount('250,000') == 250_000
+    assert parse_amount(' 1 000 ') == 1_000
+    assert parse_amount('') == 0
+
+@pytest.mark.parametrize('text', ['-100000', '+5', '1_000', '1.5', 'abc', str(BATCH_CONFIG['MAX_AMOUNT'] + 1), '9' * 20])
+def test_parse_amount_rejects(text: str) -> None:
+    """
+        Signs, other separators, letters and amounts above `BATCH_CONFIG['MAX_AMOUNT']` are rejected.
+    """
+    with pytest.raises(ValueError):
+        parse_amount(text)
+
+def test_read_amounts() -> None:
+    """
+        The given columns are read in order; invalid cells and short rows name the CSV line.
+    """
+    assert read_amounts([['a', '100', '2,000'], ['b', '0', '']], [2, 1]) == [[2_000, 100], [0, 0]]
+
+    for rows in ([['a', '100'], ['b', '-1']], [['a', '100'], ['b']], [['a', '100'], ['b', '9' * 20]]):
+        with pytest.raises(ValueError, match='3 行目'):
+            read_amounts(rows, [1])
+
+@pytest.fixture(params=['numpy', 'python'])
+def calculation_path(request, monkeypatch) -> None:
+    """
+        Run a test with the NumPy path and with the pure Python fallback.
+    """
+    if request.param == 'python':
+        monkeypatch.setattr('batch.np', None)
+
+def run(text: str, **kwargs) -> str:
+    """
+        Run `process_csv` on a CSV text and return the output text.
+    """
+    output = io.StringIO()
+    process_csv(io.StringIO(text), output, **kwargs)
+
+    return output.getvalue()
+
+def test_process_csv(calculation_path) -> None:
+    """
+        The result columns are appended to every row, across chunks and with per-row years.
+    """
+    text = '氏名,月額給与,賞与1,賞与2,年分\nA,300000,500000,0,2024\nB,"250,000",0,0,2024\nC,0,0,0,2024\n'
+    lines = run(text, chunk_size=2).splitlines()
+
+    assert lines[0] == f'氏名,月額給与,賞与1,賞与2,年分,{BATCH_CONFIG["TOTAL_YEARLY_SALARY_COLUMN"]},{BATCH_CONFIG["INCOME_AMOUNT_COLUMN"]}'
+    assert lines[1:] == ['A,300000,500000,0,2024,4100000,2840000', 'B,"250,000",0,0,2024,3000000,2020000', 'C,0,0,0,2024,0,0']
+
+@pytest.mark.parametrize('cell', ['-100000', '99999999999999999999', '1_000'])
+def test_process_csv_rejects(calculation_path, cell: str) -> None:
+    """
+        An invalid amount stops the calculation with `CSV_INVALID_VALUE` and the line number.
+    """
+    text = f'月額給与,賞与1,賞与2\n300000,0,0\n{cell},0,0\n'
+
+    with pytest.raises(ValueError, match=f'{ERROR_MESSAGES["CSV_INVALID_VALUE"]} \\(3 行目\\)'):
+        run(text)
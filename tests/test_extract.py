@@ -0,0 +1,45 @@
+import fitz
+import pytest
+
+from config import EXTRACT_CONFIG
+from extract import extract_page, match_template, parse_digits
+
+def make_page(lines: list) -> fitz.Page:
+    """
+        Make a one-page PDF with a line of text per (x, y, text).
+    """
+    document = fitz.open()
+    page = document.new_page()
+
+    for x, y, text in lines:
+        page.insert_text((x, y), text, fontname='japan', fontsize=10)
+
+    return page
+
+@pytest.mark.parametrize('text, expected', [('1,234,567', 1_234_567), ('１，２３４ 円', 1_234), ('¥ 300 000', 300_000),
+                                            ('内 0', 0), ('円', None), ('', None)])
+def test_parse_digits(text: str, expected) -> None:
+    """
+        Separators, units, spaces and full-width digits are ignored.
+    """
+    assert parse_digits(text) == expected
+
+def test_match_template() -> None:
+    """
+        The first template whose marker appears on the page is chosen, regardless of spacing and width.
+    """
+    templates = {'slip': {'MATCH': '源泉徴収票'}, 'payslip': {'MATCH': 'ＰＡＹ ＳＬＩＰ'}}
+
+    assert match_template(make_page([(72, 72, '令和6年分 給与所得の 源 泉 徴 収 票')]), templates) == 'slip'
+    assert match_template(make_page([(72, 72, 'Pay slip / 源泉徴収票')]), templates) == 'slip'
+    assert match_template(make_page([(72, 72, 'payslip 2024')]), templates) == 'payslip'
+    assert match_template(make_page([(72, 72, '給与明細書')]), templates) is None
+
+def test_extract_page() -> None:
+    """
+        The amount is read from the area below the label of the default slip template.
+    """
+    page = make_page([(72, 72, '給与所得の源泉徴収票'), (100, 120, '支払金額'), (105, 140, '5,000,000 円'), (300, 140, '123,456')])
+
+    assert extract_page(page, EXTRACT_CONFIG['TEMPLATES']) == ('源泉徴収票', {'YEARLY_SALARY': 5_000_000})
+    assert extract_page(make_page([(72, 72, '支払金額 100')]), EXTRACT_CONFIG['TEMPLATES']) is None
@@ -0,0 +1,57 @@
+from bench import check_income_parity
+from config import RULES_CONFIG
+from income import get_income_table
+
+def test_income_parity() -> None:
+    """
+        The compiled table of the default year agrees with the `INCOME_RULES` lambdas for every yen.
+    """
+    table = get_income_table(RULES_CONFIG['DEFAULT_YEAR'])
+
+    assert check_income_parity() == table.thresholds[-1] + 10_001
+
+def brute_force_ranges(order, sorted_incomes, income: int) -> list:
+    """
+        Find the salaries yielding `income` in a table of every salary, as (lowest, highest) ranges.
+    """
+    import numpy as np
+
+    salaries = np.sort(order[np.searchsorted(sorted_incomes, income):np.searchsorted(sorted_incomes, income, side='right')])
+    breaks = np.flatnonzero(np.diff(salaries) != 1)
+    starts = [salaries[0]] + [salaries[index + 1] for index in breaks] if len(salaries) else []
+    ends = [salaries[index] for index in breaks] + [salaries[-1]] if len(salaries) else []
+
+    return [(int(low), int(high)) for low, high in zip(starts, ends)]
+
+def test_salary_ranges_and_min_salary() -> None:
+    """
+        `salary_ranges` and `min_salary` agree with a brute-force scan of every salary, for every rule file.
+    """
+    import numpy as np
+
+    from income import available_years
+
+    rng = np.random.default_rng(0)
+
+    for year in available_years():
+        table = get_income_table(year)
+        limit = table.thresholds[-1] + 100_000
+        incomes = table.income_array(np.arange(limit + 1))
+        order = np.argsort(incomes, kind='stable')
+        sorted_incomes = incomes[order]
+        running_max = np.maximum.accumulate(incomes)
+
+        # amounts around the segment boundaries, random amounts and amounts between two steps
+        boundaries = [int(incomes[salary]) + delta for salary in [0] + [threshold + 1 for threshold in table.thresholds] for delta in (-1, 0, 1)]
+        targets = boundaries + rng.integers(0, int(incomes[table.thresholds[-1]]), 500).tolist()
+
+        for income in targets:
+            ranges = table.salary_ranges(income)
+            expected = brute_force_ranges(order, sorted_incomes, income)
+
+            assert [(low, limit if high is None else min(high, limit)) for low, high in ranges] == expected, (year, income)
+
+            salary = table.min_salary(income)
+            index = int(np.searchsorted(running_max, income))
+
+            assert salary == (index if index <= limit else None), (year, income)
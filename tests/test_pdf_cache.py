@@ -0,0 +1,132 @@
+import os
+import zlib
+
+from pdf_cache import DiskRenderCache, RenderCache
+
+def test_render_cache_budget_and_lru_order() -> None:
+    """
+        Least recently used entries are evicted to stay within the budget; `get` refreshes an entry.
+    """
+    cache = RenderCache(300)
+
+    for page_index in range(3):
+        cache.put(RenderCache.make_key('doc', page_index, 1.0), f'page {page_index}', 100)
+
+    assert cache.get(RenderCache.make_key('doc', 0, 1.0)) == 'page 0'
+
+    cache.put(RenderCache.make_key('doc', 3, 1.0), 'page 3', 150)
+
+    assert [key[1] for key in cache._entries] == [0, 3]     # pages 1 and 2 were the least recently used
+    assert cache.current_bytes == 250
+
+    cache.put(RenderCache.make_key('doc', 4, 1.0), 'page 4', 301)     # larger than the whole budget
+
+    assert RenderCache.make_key('doc', 4, 1.0) not in cache
+    assert len(cache) == 2
+
+def test_render_cache_key_rounds_zoom() -> None:
+    """
+        Zoom levels reached by repeated multiplications share one key.
+    """
+    cache = RenderCache(100)
+    cache.put(RenderCache.make_key('doc', 0, 1.2 * 1.2), 'page', 10)
+
+    assert cache.get(RenderCache.make_key('doc', 0, 1.44)) == 'page'
+
+    cache.invalidate(lambda key: key[0] == 'doc')
+
+    assert len(cache) == 0 and cache.current_bytes == 0
+
+def make_image(seed: int) -> tuple:
+    """
+        Make a 16 x 16 PPM image whose pixels depend on the seed.
+    """
+    pixels = bytes((seed * 7919 + i * i * 104729) % 251 for i in range(16 * 16 * 3))
+
+    return (16, 16, b'P6\n16 16\n255\n' + pixels)
+
+def flush(cache: DiskRenderCache) -> None:
+    """
+        Wait for the background writes of a disk cache.
+    """
+    cache._writer.submit(lambda: None).result()
+
+def test_disk_cache_round_trip(tmp_path) -> None:
+    """
+        A stored render is read back; unknown keys and corrupted files are misses.
+    """
+    cache = DiskRenderCache(str(tmp_path), 10 ** 6)
+    key = RenderCache.make_key('ab' * 32, 0, 1.0)
+    cache.put(key, make_image(0))
+    flush(cache)
+
+    assert cache.get(key) == make_image(0)
+    assert cache.get(RenderCache.make_key('ab' * 32, 1, 1.0)) is None
+
+    with open(cache.path_for(key), 'wb') as f:
+        f.write(b'not zlib')
+
+    assert cache.get(key) is None
+
+def test_disk_cache_eviction(tmp_path) -> None:
+    """
+        Least recently used files are deleted once the cap is exceeded; reading a file refreshes it.
+    """
+    keys = [RenderCache.make_key('cd' * 32, page_index, 1.0) for page_index in range(4)]
+    size = len(zlib.compress(make_image(0)[2], 1))
+    cache = DiskRenderCache(str(tmp_path), int(size * 3.5))
+
+    for page_index in range(3):
+        cache.put(keys[page_index], make_image(page_index))
+
+    flush(cache)
+
+    for page_index in range(3):
+        os.utime(cache.path_for(keys[page_index]), (1_000_000 + page_index,) * 2)
+
+    assert cache.get(keys[0]) is not None       # now the most recently used
+
+    cache.put(keys[3], make_image(3))
+    flush(cache)
+
+    assert [os.path.exists(cache.path_for(key)) for key in keys] == [True, False, True, True]
+    assert cache._total_bytes == sum(os.path.getsize(cache.path_for(key)) for key in keys if os.path.exists(cache.path_for(key)))
+
+def test_disk_cache_overwrite_is_counted_once(tmp_path) -> None:
+    """
+        Writing an existing entry again replaces its size, and no temporary files are left behind.
+    """
+    cache = DiskRenderCache(str(tmp_path), 10 ** 6)
+    key = RenderCache.make_key('ef' * 32, 0, 1.0)
+
+    for _ in range(3):
+        cache.put(key, make_image(0))
+
+    flush(cache)
+
+    assert cache._total_bytes == os.path.getsize(cache.path_for(key))
+    assert os.listdir(os.path.dirname(cache.path_for(key))) == [os.path.basename(cache.path_for(key))]
+
+def test_file_hash_follows_contents(tmp_path) -> None:
+    """
+        A replaced file gets a new hash, so renders cached under the old contents are not hit.
+    """
+    cache = DiskRenderCache(str(tmp_path / 'cache'), 10 ** 6)
+    filename = str(tmp_path / 'slip.pdf')
+
+    with open(filename, 'wb') as f:
+        f.write(b'%PDF old')
+
+    old = cache.file_hash(filename)
+    cache.put(RenderCache.make_key(old, 0, 1.0), make_image(0))
+    flush(cache)
+
+    with open(filename, 'wb') as f:
+        f.write(b'%PDF new contents')
+
+    os.utime(filename, ns=(os.stat(filename).st_atime_ns, os.stat(filename).st_mtime_ns + 10 ** 9))
+    new = cache.file_hash(filename)
+
+    assert new != old and cache.file_hash(filename) == new
+    assert cache.get(RenderCache.make_key(new, 0, 1.0)) is None
+    assert cache.get(RenderCache.make_key(old, 0, 1.0)) == make_image(0)
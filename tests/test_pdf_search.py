@@ -0,0 +1,138 @@
+import os
+import time
+
+import pytest
+
+from pdf_search import SearchIndex, SearchIndexer, normalize_text
+
+def make_index(texts: list) -> SearchIndex:
+    """
+        Index page texts in order.
+    """
+    index = SearchIndex(len(texts), 2)
+
+    for text in texts:
+        index.add_page(text)
+
+    return index
+
+def test_normalize_text() -> None:
+    """
+        Full-width characters are folded, case is ignored and whitespace is removed.
+    """
+    assert normalize_text('ＡＢＣ　源泉 徴収\n票') == 'abc源泉徴収票'
+
+def test_search() -> None:
+    """
+        Pages are found by their normalized text, with the number of hits, in page order.
+    """
+    index = make_index(['給与所得の源泉徴収票', '源 泉 徴 収 票 と 源泉徴収票', '賞与の明細', 'ＰＤＦ'])
+
+    assert index.complete
+    assert index.search('源泉徴収票') == [(0, 1), (1, 2)]
+    assert index.search('源泉 徴収') == [(0, 1), (1, 2)]
+    assert index.search('pdf') == [(3, 1)]
+    assert index.search('与') == [(0, 1), (2, 1)]     # shorter than the n-grams
+    assert index.search('存在しない') == []
+    assert index.search('  ') == []
+
+def test_partial_index() -> None:
+    """
+        A partial index answers for the pages indexed so far.
+    """
+    index = SearchIndex(3, 2)
+    index.add_page('源泉徴収票')
+
+    assert not index.complete
+    assert index.search('徴収') == [(0, 1)]
+
+def test_save_and_load(tmp_path) -> None:
+    """
+        A saved index is loaded with the same results; corrupted files are treated as missing.
+    """
+    index = make_index(['給与所得の源泉徴収票', '賞与の明細'])
+    path = os.path.join(tmp_path, 'index', 'key.json.z')
+    index.save(path)
+    loaded = SearchIndex.load(path)
+
+    assert loaded is not None and loaded.complete
+    assert loaded.search('明細') == index.search('明細') == [(1, 1)]
+
+    with open(path, 'wb') as f:
+        f.write(b'broken')
+
+    assert SearchIndex.load(path) is None
+    assert SearchIndex.load(os.path.join(tmp_path, 'missing.json.z')) is None
+
+def make_pdf(path: str, texts: list) -> None:
+    """
+        Write a PDF with one page per text.
+    """
+    fitz = pytest.importorskip('fitz')
+    document = fitz.open()
+
+    for text in texts:
+        document.new_page().insert_text((72, 72), text)
+
+    document.save(path + '.tmp')
+    os.replace(path + '.tmp', path)
+
+def wait_for(condition, timeout: float = 10) -> None:
+    """
+        Wait until the worker thread makes a condition true.
+    """
+    deadline = time.monotonic() + timeout
+
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+def test_indexer_failure(tmp_path, monkeypatch) -> None:
+    """
+        If text extraction fails partway, the partial index is dropped, the file is reported as failed and can be queued again.
+    """
+    fitz = pytest.importorskip('fitz')
+    filename = os.path.join(tmp_path, 'a.pdf')
+    make_pdf(filename, ['page one', 'page two', 'page three'])
+    get_text = fitz.Page.get_text
+    calls = []
+
+    def failing_get_text(page, *args, **kwargs):
+        calls.append(page.number)
+
+        if len(calls) == 2:
+            raise RuntimeError('damaged page')
+
+        return get_text(page, *args, **kwargs)
+
+    monkeypatch.setattr(fitz.Page, 'get_text', failing_get_text)
+    indexer = SearchIndexer(os.path.join(tmp_path, 'index'))
+    indexer.build(filename, 'key')
+    wait_for(lambda: indexer.is_failed('key'))
+
+    assert indexer.get('key') is None and not indexer.is_complete('key')
+
+    indexer.build(filename, 'key')
+    wait_for(lambda: indexer.is_complete('key'))
+
+    assert not indexer.is_failed('key')
+    assert indexer.get('key').search('page two') == [(1, 1)]
+
+def test_indexer_skips_replaced_file(tmp_path) -> None:
+    """
+        A file replaced since it was hashed is not indexed (or saved) under the old hash.
+    """
+    filename = os.path.join(tmp_path, 'a.pdf')
+    make_pdf(filename, ['old text'])
+    hashes = {'current': 'new'}
+    indexer = SearchIndexer(os.path.join(tmp_path, 'index'), lambda path: hashes['current'])
+    indexer.build(filename, 'old')
+    wait_for(lambda: indexer.is_failed('old'))
+
+    assert indexer.get('old') is None
+    assert not os.path.exists(indexer.path_for('old'))
+
+    indexer.build(filename, 'new')
+    wait_for(lambda: indexer.is_complete('new'))
+
+    assert indexer.get('new').search('old text') == [(0, 1)]
@@ -0,0 +1,160 @@
+import asyncio
+import json
+from typing import List, Tuple
+
+import pytest
+
+from config import BATCH_CONFIG, SERVER_CONFIG
+from income import calculate_income
+from server import IncomeServer
+
+def request(method: str, path: str, body: bytes = b'', headers: str = '') -> bytes:
+    """
+        Encode an HTTP/1.1 request.
+    """
+    return f'{method} {path} HTTP/1.1\r\nHost: test\r\n{headers}Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body
+
+def post(path: str, payload: object, headers: str = '') -> bytes:
+    """
+        Encode a JSON POST request.
+    """
+    return request('POST', path, json.dumps(payload).encode('utf-8'), headers)
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, dict, object]:
+    """
+        Read one response: (status, headers with lower-case names, decoded JSON body).
+    """
+    lines = (await reader.readuntil(b'\r\n\r\n')).decode('latin-1').split('\r\n')
+    headers = dict((name.strip().lower(), value.strip()) for name, value in (line.split(':', 1) for line in lines[1:] if line))
+    body = await reader.readexactly(int(headers['content-length']))
+
+    return int(lines[0].split(' ')[1]), headers, json.loads(body)
+
+def exchange(data: bytes, count: int) -> Tuple[List[Tuple[int, dict, object]], bool]:
+    """
+        Send raw data on one connection to a fresh server and read `count` responses.
+
+        Returns:
+            Tuple: (responses, True if the server closed the connection afterwards).
+    """
+    async def run():
+        server = await asyncio.start_server(IncomeServer().handle_connection, '127.0.0.1', 0, limit=SERVER_CONFIG['MAX_HEADER_BYTES'])
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(data)
+            await writer.drain()
+            responses = [await asyncio.wait_for(read_response(reader), 10) for _ in range(count)]
+
+            try:
+                closed = await asyncio.wait_for(reader.read(1), 0.2) == b''
+            except asyncio.TimeoutError:
+                closed = False      # still open
+
+            writer.close()
+
+            return responses, closed
+
+    return asyncio.run(run())
+
+def test_income() -> None:
+    """
+        POST /income calculates like `calculate_income`.
+    """
+    [(status, _, result)], _ = exchange(post('/income', {'monthly_salaries': 300_000, 'bonus1': 500_000, 'year': 2024}, 'Connection: close\r\n'), 1)
+
+    assert status == 200
+    assert (result['yearly_salary'], result['income']) == calculate_income(300_000, 500_000, year=2024)
+
+def test_batch() -> None:
+    """
+        POST /income/batch answers every item in order, with monthly lists and mixed years.
+    """
+    items = [{'monthly_salaries': [250_000] * 12, 'bonus2': 100_000}, {'monthly_salaries': 0}, {'monthly_salaries': 500_000, 'year': 2020}]
+    [(status, _, result)], _ = exchange(post('/income/batch', {'items': items}, 'Connection: close\r\n'), 1)
+
+    assert status == 200
+    assert [(row['yearly_salary'], row['income']) for row in result['results']] == [
+        calculate_income([250_000] * 12, 0, 100_000), calculate_income(0), calculate_income(500_000, year=2020)]
+
+def test_pipelining_and_keep_alive() -> None:
+    """
+        Pipelined requests on one connection are answered in order and the connection stays open.
+    """
+    salaries = [100_000, 200_000, 300_000, 400_000]
+    data = b''.join(post('/income', {'monthly_salaries': salary}) for salary in salaries) + request('GET', '/metrics')
+    responses, closed = exchange(data, len(salaries) + 1)
+
+    assert [result['yearly_salary'] for _, _, result in responses[:-1]] == [salary * 12 for salary in salaries]
+    assert all(headers['connection'] == 'keep-alive' for _, headers, _ in responses)
+    assert responses[-1][2]['endpoints']['/income']['total_count'] == len(salaries)
+    assert not closed
+
+def test_connection_close() -> None:
+    """
+        `Connection: close` is honoured after the response.
+    """
+    [(status, headers, _)], closed = exchange(post('/income', {'monthly_salaries': 1}, 'Connection: close\r\n'), 1)
+
+    assert (status, headers['connection'], closed) == (200, 'close', True)
+
+@pytest.mark.parametrize('data, status', [
+    (request('POST', '/income', b'{not json'), 400),
+    (post('/income', {'bonus1': 1}), 400),
+    (post('/income', {'monthly_salaries': '300000'}), 400),
+    (post('/income', {'monthly_salaries': 300_000, 'year': 1900}), 400),
+    (post('/income/batch', {'items': [{'monthly_salaries': 1}, {'monthly_salaries': None}]}), 400),
+    (post('/income/batch', {'items': {}}), 400),
+    (post('/income/batch', {'items': [{'monthly_salaries': 1}] * (SERVER_CONFIG['MAX_BATCH'] + 1)}), 413),
+    (request('GET', '/income'), 405),
+    (request('POST', '/unknown', b'{}'), 404),
+], ids=['invalid json', 'missing field', 'string amount', 'year without rules', 'invalid batch item', 'items not a list',
+        'batch too large', 'wrong method', 'unknown endpoint'])
+def test_errors(data: bytes, status: int) -> None:
+    """
+        Invalid requests are answered with an error status and message, and the connection stays usable.
+    """
+    responses, _ = exchange(data + post('/income', {'monthly_salaries': 1}), 2)
+
+    assert responses[0][0] == status and 'error' in responses[0][2]
+    assert responses[1][0] == 200
+
+def test_body_too_large() -> None:
+    """
+        A body above `MAX_BODY_BYTES` is refused with 413 without reading it, and the connection is closed.
+    """
+    head = f'POST /income HTTP/1.1\r\nContent-Length: {SERVER_CONFIG["MAX_BODY_BYTES"] + 1}\r\n\r\n'.encode('latin-1')
+    [(status, headers, _)], closed = exchange(head, 1)
+
+    assert (status, headers['connection'], closed) == (413, 'close', True)
+
+def test_malformed_request_line() -> None:
+    """
+        A malformed request line is answered with 400 and the connection is closed.
+    """
+    [(status, _, _)], closed = exchange(b'GARBAGE\r\n\r\n', 1)
+
+    assert (status, closed) == (400, True)
+
+@pytest.mark.parametrize('payload', [
+    {'monthly_salaries': 300_000, 'year': 10 ** 30},
+    {'monthly_salaries': -300_000},
+    {'monthly_salaries': BATCH_CONFIG['MAX_AMOUNT'] + 1},
+    {'monthly_salaries': [1] * 13},
+], ids=['year too large', 'negative amount', 'amount too large', 'more than 12 months'])
+def test_out_of_range_fields(payload: dict) -> None:
+    """
+        Years above `MAX_YEAR`, negative or too large amounts and more than 12 months are rejected.
+    """
+    [(status, _, _)], _ = exchange(post('/income', payload, 'Connection: close\r\n'), 1)
+
+    assert status == 400
+
+def test_deeply_nested_body() -> None:
+    """
+        A body nested too deeply for the JSON decoder is answered with 400 instead of dropping the connection.
+    """
+    [(status, _, _)], _ = exchange(request('POST', '/income', b'[' * 100_000 + b']' * 100_000, 'Connection: close\r\n'), 1)
+
+    assert status == 400
@@ -10,7 +10,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[(tkinterdnd2_path, 'tkinterdnd2')],
+    datas=[(tkinterdnd2_path, 'tkinterdnd2'), ('rules', 'rules')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},